@@ -1,6 +1,35 @@
 # Game constants
 TEXTURE_SIZE = 256
 
+# Number of quantized light levels; textures are pre-lit once per band (quality setting)
+LIGHT_BANDS = 16
+
+# Bytes of derived texture data (arrays, pre-lit copies) kept before least recently used entries are evicted
+ASSET_CACHE_BUDGET = 64 * 1024 * 1024
+
+# Decoded, pre-scaled textures are kept here as .npy files between runs (None disables the cache)
+TEXTURE_CACHE_DIR = ".cache/textures"
+
+# Level a new game starts on unless --level names another
+DEFAULT_LEVEL = "data/maps/level_1.json"
+
+# Levels with at most this many cells to stand on have their visible sets baked when loaded;
+# larger ones compute them as the party reaches each cell
+PVS_BAKE_LIMIT = 1024
+
+# Save games: directory, file names and how many turns pass between autosaves
+SAVE_DIR = "saves"
+AUTOSAVE_FILE = "autosave.sav"
+QUICKSAVE_FILE = "quicksave.sav"
+AUTOSAVE_INTERVAL = 10
+
+# Wall texture drawn for each tile id; tiles not listed here are empty space
+TILE_TEXTURES = {
+    1: "dungeon_wall",
+    2: "dungeon_door_closed",
+    3: "dungeon_door_open",
+}
+
 # Screen dimensions
 SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
\ No newline at end of file
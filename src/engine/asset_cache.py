@@ -0,0 +1,79 @@
+"""
+Byte-budgeted LRU cache for derived asset data.
+"""
+
+from collections import OrderedDict
+
+import pygame
+import numpy as np
+
+def get_asset_size(asset):
+    """Approximate number of bytes held by a Surface or array."""
+    if isinstance(asset, np.ndarray):
+        return asset.nbytes
+    if isinstance(asset, pygame.Surface):
+        return asset.get_pitch() * asset.get_height()
+    return 0
+
+class AssetCache:
+    """Holds data that can be rebuilt on demand (arrays, pre-lit or scaled copies).
+
+    Entries are evicted least recently used first once the total size goes
+    over budget_bytes, so callers must be ready to rebuild anything they get
+    a miss for.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.entries = OrderedDict()  # key -> (value, size, category)
+        self.total_bytes = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Get a cached value and mark it as recently used, or None on a miss."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, category, size=None):
+        """Store a value under a category, evicting old entries if over budget."""
+        self.discard(key)
+        if size is None:
+            size = get_asset_size(value)
+        self.entries[key] = (value, size, category)
+        self.total_bytes += size
+        self.evict()
+        return value
+
+    def discard(self, key):
+        """Remove an entry if present."""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[1]
+
+    def evict(self):
+        """Drop least recently used entries until within budget, always keeping the newest."""
+        while self.total_bytes > self.budget_bytes and len(self.entries) > 1:
+            _, (_, size, _) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def set_budget(self, budget_bytes):
+        """Change the budget, evicting immediately if it shrank."""
+        self.budget_bytes = budget_bytes
+        self.evict()
+
+    def clear(self):
+        """Drop every entry."""
+        self.entries.clear()
+        self.total_bytes = 0
+
+    def get_usage(self):
+        """Return {category: (count, bytes)} for the cached entries."""
+        usage = {}
+        for _, size, category in self.entries.values():
+            count, total = usage.get(category, (0, 0))
+            usage[category] = (count + 1, total + size)
+        return usage
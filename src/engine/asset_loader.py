@@ -0,0 +1,59 @@
+"""
+Background asset decoding on a thread pool.
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+class AssetLoader:
+    """Runs decode jobs on worker threads and hands the results back on the main thread.
+
+    Decoding (file read, PNG decode, scaling, array copies) happens on the
+    workers; anything touching the display, like convert_alpha, must be done
+    in the on_ready callbacks, which only run from poll().
+    """
+
+    def __init__(self, max_workers=None):
+        if max_workers is None:
+            max_workers = min(8, os.cpu_count() or 2)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset_loader")
+        self.completed = queue.Queue()
+        self.pending = 0
+
+    def submit(self, decode, path, on_ready, on_error=None):
+        """Run decode(path) on a worker; poll() later calls on_ready(result), or on_error(exception) if it failed."""
+        self.pending += 1
+        future = self.executor.submit(decode, path)
+        future.add_done_callback(lambda f: self.completed.put((f, path, on_ready, on_error)))
+
+    def poll(self, block=False):
+        """Call on_ready for every finished job. Returns the number of jobs handled."""
+        handled = 0
+        while self.pending:
+            try:
+                future, path, on_ready, on_error = self.completed.get(block=block)
+            except queue.Empty:
+                break
+            self.pending -= 1
+            handled += 1
+            try:
+                result = future.result()
+            except (pygame.error, OSError, ValueError) as e:
+                print(f"Failed to load asset: {path} - {e}")
+                if on_error:
+                    on_error(e)
+                continue
+            on_ready(result)
+        return handled
+
+    def wait(self):
+        """Block until every submitted job has been handled."""
+        while self.pending:
+            self.poll(block=True)
+
+    def shutdown(self):
+        """Stop the worker threads, dropping jobs that have not started."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
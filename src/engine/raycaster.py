@@ -13,7 +13,7 @@ class Raycaster:
     def __init__(self, screen_width, screen_height, game_map, texture_manager=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.floor_buffer = np.zeros((screen_height, screen_width, 3), dtype=np.uint8)
+        self.floor_buffer = None  # (height, width, 3) frame for screens without 32-bit pixels, made on first use
         self.game_map = game_map
         self.map_data = game_map.tiles
         self.transparent_tiles = {3} # Tile IDs that the raycaster can see through
@@ -32,10 +32,16 @@ class Raycaster:
         # It is calculated based on the screen width and the field of view.
         # This replaces the arbitrary `wall_height` scaling factor.
         self.projection_plane_dist = (self.screen_width / 2) / math.tan(self.fov / 2)
+        self.max_distance = 20  # Rays and sprites are not drawn beyond this many cells
         
         # Texture size
         self.tex_width = TEXTURE_SIZE
         self.tex_height = TEXTURE_SIZE
+
+        # Light band of every cell, rebuilt when the map's light map is replaced
+        self.light_map_source = None
+        self.light_band_rows = None
+        self.padded_light_bands = None  # One-cell border of ambient light for off-map lookups
         
         # Create default textures if no texture manager provided
         if not self.texture_manager:
@@ -52,8 +58,22 @@ class Raycaster:
         """Set the party's viewing angle"""
         self.party_angle = angle
     
+    def update_light_bands(self):
+        """Quantize the map's light levels to the texture manager's light bands."""
+        key = (self.game_map.light_map, self.texture_manager.light_bands)
+        if self.light_map_source is not None and self.light_map_source[0] is key[0] and self.light_map_source[1] == key[1]:
+            return
+        self.light_map_source = key
+        bands = self.texture_manager.light_bands - 1
+        levels = np.clip(np.array(self.game_map.light_map, dtype=np.float32), 0.0, 1.0)
+        band_map = np.rint(levels * bands).astype(np.intp)
+        self.light_band_rows = band_map.tolist()
+        self.padded_light_bands = np.pad(band_map, 1, constant_values=self.texture_manager.get_light_band(self.game_map.ambient_light))
+
     def cast_rays(self, screen):
         """Cast rays and render the 3D view"""
+        self.update_light_bands()
+
         # Render floor and ceiling first
         self.render_floor_and_ceiling(screen)
         
@@ -89,15 +109,8 @@ class Raycaster:
                 # Calculate wall height based on the distance to the projection plane.
                 wall_height = max(1, (self.projection_plane_dist / corrected_dist)) if corrected_dist > 0 else self.screen_height
 
-                # Determine texture based on wall type
-                if wall_type == 1:
-                    texture = self.texture_manager.get_texture("dungeon_wall")
-                elif wall_type == 2:
-                    texture = self.texture_manager.get_texture("dungeon_door_closed")
-                elif wall_type == 3:
-                    texture = self.texture_manager.get_texture("dungeon_door_open")
-                else:
-                    texture = None
+                # Determine texture based on wall type, pre-lit at the cell's light band
+                texture = self.texture_manager.get_lit_tile_texture(wall_type, self.light_band_rows[map_y][map_x])
 
                 if texture:
                     wall_top = (self.screen_height - wall_height) // 2
@@ -115,14 +128,6 @@ class Raycaster:
 
                     # Blit the scaled texture column directly to preserve transparency
                     screen.blit(scaled_column, (x, wall_top))
-
-                    # Apply lighting by blitting a colored surface on top with a multiply blend
-                    light_level = self.game_map.light_map[map_y][map_x]
-                    if light_level < 1.0:
-                        light_color = (int(255 * light_level), int(255 * light_level), int(255 * light_level))
-                        light_surface = pygame.Surface((1, int(wall_height)), pygame.SRCALPHA)
-                        light_surface.fill(light_color)
-                        screen.blit(light_surface, (x, wall_top), special_flags=pygame.BLEND_MULT)
             
             z_buffer[x] = solid_wall_dist
         
@@ -130,9 +135,7 @@ class Raycaster:
         
     def render_floor_and_ceiling(self, screen):
         """Render textured floor and ceiling using numpy for performance."""
-        floor_texture_arr = self.texture_manager.get_texture_array("dungeon_floor")
-        ceil_texture_arr = self.texture_manager.get_texture_array("dungeon_ceil")
-
+        self.update_light_bands()
         # Pre-calculate angles
         angle_cos = math.cos(self.party_angle)
         angle_sin = math.sin(self.party_angle)
@@ -192,34 +195,37 @@ class Raycaster:
         tx_ceil = (self.tex_width * (full_tex_x_ceil - cell_x_ceil)).astype(int) & (self.tex_width - 1)
         ty_ceil = (self.tex_height * (full_tex_y_ceil - cell_y_ceil)).astype(int) & (self.tex_height - 1)
 
-        # Get colors from textures
-        floor_colors = floor_texture_arr[ty_floor, tx_floor]
-        ceil_colors = ceil_texture_arr[ty_ceil, tx_ceil]
-
-        # Apply lighting
-        light_map_arr = np.array(self.game_map.light_map)
-        
-        # Create masks for valid coordinates
-        floor_mask = (cell_x_floor >= 0) & (cell_x_floor < self.map_width) & (cell_y_floor >= 0) & (cell_y_floor < self.map_height)
-        ceil_mask = (cell_x_ceil >= 0) & (cell_x_ceil < self.map_width) & (cell_y_ceil >= 0) & (cell_y_ceil < self.map_height)
-
-        # Get light levels, using ambient light as a fallback
-        light_levels_floor = np.full(floor_mask.shape, self.game_map.ambient_light)
-        light_levels_ceil = np.full(ceil_mask.shape, self.game_map.ambient_light)
-        
-        light_levels_floor[floor_mask] = light_map_arr[cell_y_floor[floor_mask], cell_x_floor[floor_mask]]
-        light_levels_ceil[ceil_mask] = light_map_arr[cell_y_ceil[ceil_mask], cell_x_ceil[ceil_mask]]
-
-        # Apply lighting to colors
-        floor_colors = (floor_colors * light_levels_floor[:, :, np.newaxis]).astype(np.uint8)
-        ceil_colors = (ceil_colors * light_levels_ceil[:, :, np.newaxis]).astype(np.uint8)
-
-        # Fill the buffer
-        self.floor_buffer[self.screen_height // 2:, :, :] = floor_colors
-        self.floor_buffer[:self.screen_height // 2, :, :] = ceil_colors
-
-        # Blit the buffer to the screen, transposing the array to match screen dimensions
-        pygame.surfarray.blit_array(screen, self.floor_buffer.transpose(1, 0, 2))
+        # Light band of each pixel's cell; cells off the map use the padded ambient border
+        band_floor = self.padded_light_bands[np.clip(cell_y_floor, -1, self.map_height) + 1,
+                                             np.clip(cell_x_floor, -1, self.map_width) + 1]
+        band_ceil = self.padded_light_bands[np.clip(cell_y_ceil, -1, self.map_height) + 1,
+                                            np.clip(cell_x_ceil, -1, self.map_width) + 1]
+
+        # Index of every pixel's texel in the flattened lit texture arrays, in screen row order
+        texel_floor = (band_floor * self.tex_height + ty_floor) * self.tex_width + tx_floor
+        texel_ceil = (band_ceil * self.tex_height + ty_ceil) * self.tex_width + tx_ceil
+        half = self.screen_height // 2
+
+        if screen.get_bytesize() == 4:
+            # Gather already-lit pixels in the screen's own format straight into its memory.
+            # pixels2d is indexed (x, y), so its transpose walks the surface row by row.
+            floor_pixels = self.texture_manager.get_mapped_lit_texture_array("dungeon_floor", screen)
+            ceil_pixels = self.texture_manager.get_mapped_lit_texture_array("dungeon_ceil", screen)
+            rows = pygame.surfarray.pixels2d(screen).T
+            try:
+                np.take(floor_pixels, texel_floor, out=rows[half:self.screen_height, :self.screen_width], mode="clip")
+                np.take(ceil_pixels, texel_ceil, out=rows[:half, :self.screen_width], mode="clip")
+            finally:
+                del rows  # Unlocks the surface for the wall and sprite blits
+        else:
+            # Other pixel formats go through an RGB frame that blit_array converts
+            if self.floor_buffer is None:
+                self.floor_buffer = np.zeros((self.screen_height, self.screen_width, 3), dtype=np.uint8)
+            floor_colours = self.texture_manager.get_lit_texture_array("dungeon_floor").reshape(-1, 3)
+            ceil_colours = self.texture_manager.get_lit_texture_array("dungeon_ceil").reshape(-1, 3)
+            self.floor_buffer[half:] = floor_colours[texel_floor]
+            self.floor_buffer[:half] = ceil_colours[texel_ceil]
+            pygame.surfarray.blit_array(screen, self.floor_buffer.transpose(1, 0, 2))
     
     def cast_single_ray(self, ray_angle, party_x, party_y):
         """
@@ -243,7 +249,7 @@ class Raycaster:
             side_dist_y = (map_y + 1.0 - party_y) * delta_dist_y
 
         hits = []
-        max_dist = 20  # Maximum distance to cast rays
+        max_dist = self.max_distance
 
         while True:
             side = 0 if side_dist_x < side_dist_y else 1
@@ -282,60 +288,62 @@ class Raycaster:
 
     def render_sprites(self, screen, z_buffer):
         """Render sprites (enemies, items, etc.)"""
-        entities = [e for e in self.game_map.entities if not isinstance(e, Party)]
-        
-        entities.sort(key=lambda e: ((self.party_x - e.x)**2 + (self.party_y - e.y)**2), reverse=True)
-        
-        for entity in entities:
-            if entity.sprite and self.texture_manager.get_sprite(entity.sprite):
-                sprite = self.texture_manager.get_sprite(entity.sprite)
+        # Depth and camera-plane position of every sprite in range, far to near
+        store = self.game_map.entity_store
+        rows, dist2 = store.sprite_rows_within(self.party_x, self.party_y, self.max_distance, exclude=Party)
+        # Leave out sprites in cells that cannot be in view, e.g. behind walls
+        facing = self.party_angle / (math.pi / 2)
+        visibility = self.game_map.visibility
+        if visibility is not None and len(rows) and abs(facing - round(facing)) < 1e-6:
+            in_view = visibility.contains(int(self.party_x), int(self.party_y), round(facing) % 4,
+                                          store.cell_x[rows], store.cell_y[rows])
+            rows, dist2 = rows[in_view], dist2[in_view]
+        sprite_x = store.cell_x[rows] + 0.5 - self.party_x
+        sprite_y = store.cell_y[rows] + 0.5 - self.party_y
+        cos_a, sin_a = math.cos(self.party_angle), math.sin(self.party_angle)
+        depths = cos_a * sprite_x + sin_a * sprite_y
+        horizontal = -sin_a * sprite_x + cos_a * sprite_y
+        visible = np.flatnonzero(depths > 0.5)  # In front of the party, with a threshold to avoid clipping
+        order = visible[np.argsort(-dist2[visible], kind="stable")]
+
+        for index in order.tolist():
+            entity = store.objects[rows[index]]
+            sprite = self.texture_manager.get_sprite(entity.sprite)
+            if sprite:
+                depth = float(depths[index])
+                horizontal_pos = float(horizontal[index])
+                # Project sprite to screen
+                sprite_screen_x = int((self.screen_width / 2) * (1 + horizontal_pos / depth))
                 
-                sprite_x = (entity.x + 0.5) - self.party_x
-                sprite_y = (entity.y + 0.5) - self.party_y
+                # Calculate sprite height and width. Use projection_plane_dist for correct scaling.
+                sprite_height = abs(int(self.projection_plane_dist / depth))
+                # Maintain aspect ratio
+                aspect_ratio = sprite.get_width() / sprite.get_height() if sprite.get_height() > 0 else 1
+                sprite_width = int(sprite_height * aspect_ratio)
                 
-                # transform_x is depth, transform_y is horizontal position on camera plane
-                depth = math.cos(self.party_angle) * sprite_x + math.sin(self.party_angle) * sprite_y
-                horizontal_pos = -math.sin(self.party_angle) * sprite_x + math.cos(self.party_angle) * sprite_y
+                # Calculate drawing boundaries on screen
+                if getattr(entity, "render_on_floor", False):
+                    draw_start_y = self.screen_height // 2 + sprite_height // 2 - sprite_height
+                elif getattr(entity, "render_on_ceiling", False):
+                    draw_start_y = self.screen_height // 2 - sprite_height // 2
+                else:
+                    draw_start_y = self.screen_height // 2 - sprite_height // 2
                 
-                # Sprite is in front of party
-                if depth > 0.5: # Use a threshold to avoid clipping
-                    # Project sprite to screen
-                    sprite_screen_x = int((self.screen_width / 2) * (1 + horizontal_pos / depth))
-                    
-                    # Calculate sprite height and width. Use projection_plane_dist for correct scaling.
-                    sprite_height = abs(int(self.projection_plane_dist / depth))
-                    # Maintain aspect ratio
-                    aspect_ratio = sprite.get_width() / sprite.get_height() if sprite.get_height() > 0 else 1
-                    sprite_width = int(sprite_height * aspect_ratio)
-                    
-                    # Calculate drawing boundaries on screen
-                    if getattr(entity, "render_on_floor", False):
-                        draw_start_y = self.screen_height // 2 + sprite_height // 2 - sprite_height
-                    elif getattr(entity, "render_on_ceiling", False):
-                        draw_start_y = self.screen_height // 2 - sprite_height // 2
-                    else:
-                        draw_start_y = self.screen_height // 2 - sprite_height // 2
-                    
-                    draw_end_y = draw_start_y + sprite_height
-                    draw_start_x = sprite_screen_x - sprite_width // 2
-                    draw_end_x = sprite_screen_x + sprite_width // 2
-                    
-                    # Scale the entire sprite once
-                    scaled_sprite = pygame.transform.scale(sprite, (sprite_width, sprite_height))
-                    
-                    # Apply lighting
-                    light_level = self.game_map.light_map[int(entity.y)][int(entity.x)]
-                    light_color = (int(255 * light_level), int(255 * light_level), int(255 * light_level))
-                    
-                    lit_sprite = scaled_sprite.copy()
-                    lit_sprite.fill(light_color, special_flags=pygame.BLEND_MULT)
-
-                    # Draw the sprite column by column, but from the pre-scaled surface
-                    for stripe in range(draw_start_x, draw_end_x):
-                        # Check if stripe is on screen and in front of a wall
-                        if 0 <= stripe < self.screen_width and depth < z_buffer[stripe]:
-                            # Calculate texture x coordinate
-                            tex_x = stripe - draw_start_x
-                            
-                            # Draw the column from the scaled and lit sprite
-                            screen.blit(lit_sprite, (stripe, draw_start_y), (tex_x, 0, 1, sprite_height))
+                draw_end_y = draw_start_y + sprite_height
+                draw_start_x = sprite_screen_x - sprite_width // 2
+                draw_end_x = sprite_screen_x + sprite_width // 2
+                
+                # Scale the sprite, pre-lit at its cell's light band, once
+                band = self.light_band_rows[int(entity.y)][int(entity.x)]
+                lit_sprite = pygame.transform.scale(self.texture_manager.get_lit_surface(sprite, band),
+                                                    (sprite_width, sprite_height))
+
+                # Draw the sprite column by column, but from the pre-scaled surface
+                for stripe in range(draw_start_x, draw_end_x):
+                    # Check if stripe is on screen and in front of a wall
+                    if 0 <= stripe < self.screen_width and depth < z_buffer[stripe]:
+                        # Calculate texture x coordinate
+                        tex_x = stripe - draw_start_x
+                        
+                        # Draw the column from the scaled and lit sprite
+                        screen.blit(lit_sprite, (stripe, draw_start_y), (tex_x, 0, 1, sprite_height))
@@ -3,28 +3,57 @@ Texture manager for loading and managing textures.
 """
 
 import pygame
+import numpy as np
 import os
-from config.constants import TEXTURE_SIZE
+import glob
+import hashlib
+import tempfile
+from config.constants import TEXTURE_SIZE, TILE_TEXTURES, TEXTURE_CACHE_DIR, LIGHT_BANDS, ASSET_CACHE_BUDGET
+from engine.asset_loader import AssetLoader
+from engine.asset_cache import AssetCache, get_asset_size
 
 class TextureManager:
     """Manages loading and storing textures for the game."""
     
-    def __init__(self, assets_path="assets"):
+    def __init__(self, assets_path="assets", cache_dir=TEXTURE_CACHE_DIR, light_bands=LIGHT_BANDS,
+                 memory_budget=ASSET_CACHE_BUDGET):
         self.assets_path = assets_path
+        self.cache_dir = cache_dir
         self.textures = {}
         self.sprites = {}
-        self.texture_arrays = {}
         self.portraits = {}
 
+        # Data derived from the surfaces above (texture arrays, pre-lit copies) lives in a
+        # budgeted LRU cache and is rebuilt on demand after eviction
+        self.derived = AssetCache(memory_budget)
+
+        # Wall texture atlas: one (layers, TEXTURE_SIZE, TEXTURE_SIZE, 3) array,
+        # indexed through tile_layers[tile_id]; layer 0 is blank, for tiles without a texture
+        self.tile_textures = dict(TILE_TEXTURES)
+        self.tile_atlas = np.zeros((1, TEXTURE_SIZE, TEXTURE_SIZE, 3), dtype=np.uint8)
+        self.tile_layers = np.zeros(256, dtype=np.int16)
+        self.tile_surfaces = [None] * 256
+        self._atlas_dirty = False
+
+        # Background loading: assets get a placeholder until their decode finishes
+        self.loader = None
+        self.pending_assets = {}  # (kind, name) -> on_ready callbacks
+        self.asset_version = 0  # Increases whenever a placeholder is replaced
+        self._stores = {"texture": self.textures, "sprite": self.sprites, "portrait": self.portraits}
+        self._placeholder_texture = None
+        self._placeholder_image = None
+
+        # Pre-lit copies are cached with the surface they were made from, so they are
+        # rebuilt when a placeholder is replaced
+        self.light_bands = light_bands
+
     def load_portrait(self, name, file_path):
         """Load a portrait from a file."""
         if not os.path.exists(file_path):
             print(f"Portrait file not found: {file_path}")
             return None
         try:
-            portrait = pygame.image.load(file_path).convert_alpha()
-            self.portraits[name] = portrait
-            return portrait
+            return self.store_portrait(name, self.decode_image(file_path))
         except pygame.error as e:
             print(f"Failed to load portrait: {file_path} - {e}")
             return None
@@ -36,11 +65,7 @@ class TextureManager:
             return None
             
         try:
-            texture = pygame.image.load(file_path).convert_alpha()
-            texture = pygame.transform.scale(texture, (TEXTURE_SIZE, TEXTURE_SIZE))
-            self.textures[name] = texture
-            self.texture_arrays[name] = pygame.surfarray.array3d(texture)
-            return texture
+            return self.store_texture(name, self.decode_texture(file_path))
         except pygame.error as e:
             print(f"Failed to load texture: {file_path} - {e}")
             return None
@@ -51,20 +76,323 @@ class TextureManager:
             print(f"Sprite file not found: {file_path}")
             return None
         try:
-            sprite = pygame.image.load(file_path).convert_alpha()
-            self.sprites[name] = sprite
-            return sprite
+            return self.store_sprite(name, self.decode_image(file_path))
         except pygame.error as e:
             print(f"Failed to load sprite: {file_path} - {e}")
             return None
 
+    def decode_texture(self, file_path):
+        """Decode and scale a texture file, going through the on-disk cache. Safe to run on a worker thread."""
+        cache_path = self.get_cache_path(file_path)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                array = np.load(cache_path, mmap_mode="r")
+                if array.shape == (TEXTURE_SIZE, TEXTURE_SIZE, 3):
+                    return pygame.surfarray.make_surface(array), array
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable texture cache: {cache_path} - {e}")
+
+        texture = pygame.transform.scale(pygame.image.load(file_path), (TEXTURE_SIZE, TEXTURE_SIZE))
+        array = pygame.surfarray.array3d(texture)
+        if cache_path:
+            self.write_cache(cache_path, array)
+        return texture, array
+
+    def get_cache_path(self, file_path):
+        """Cache file for a texture, keyed by its path, mtime, size and TEXTURE_SIZE."""
+        if not self.cache_dir:
+            return None
+        stat = os.stat(file_path)
+        key = f"{os.path.abspath(file_path)}|{stat.st_mtime_ns}|{stat.st_size}|{TEXTURE_SIZE}"
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        return os.path.join(self.cache_dir, f"{stem}-{digest}.npy")
+
+    def write_cache(self, cache_path, array):
+        """Atomically store a decoded texture and drop stale entries for the same file."""
+        stem = os.path.basename(cache_path).rsplit("-", 1)[0]
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with tempfile.NamedTemporaryFile(dir=self.cache_dir, suffix=".tmp", delete=False) as f:
+                np.save(f, array)
+            os.replace(f.name, cache_path)
+            for stale in glob.glob(os.path.join(self.cache_dir, glob.escape(stem) + "-*.npy")):
+                if stale != cache_path:
+                    os.remove(stale)
+        except OSError as e:
+            print(f"Failed to write texture cache: {cache_path} - {e}")
+
+    def clear_cache(self):
+        """Delete every cached texture."""
+        if self.cache_dir:
+            for path in glob.glob(os.path.join(self.cache_dir, "*.npy")):
+                os.remove(path)
+
+    def decode_image(self, file_path):
+        """Decode an image file. Safe to run on a worker thread."""
+        return pygame.image.load(file_path)
+
+    def store_texture(self, name, decoded):
+        """Register a decoded texture and its array. Must run on the main thread."""
+        texture, array = decoded
+        texture = texture.convert_alpha()
+        self.textures[name] = texture
+        self.derived.put(("array", name), array, "texture_arrays")
+        return texture
+
+    def store_sprite(self, name, image):
+        """Register a decoded sprite. Must run on the main thread."""
+        sprite = image.convert_alpha()
+        self.sprites[name] = sprite
+        return sprite
+
+    def store_portrait(self, name, image):
+        """Register a decoded portrait. Must run on the main thread."""
+        portrait = image.convert_alpha()
+        self.portraits[name] = portrait
+        return portrait
+
+    def load_texture_async(self, name, file_path, on_ready=None):
+        """Load a texture in the background, returning a placeholder until it is ready."""
+        return self._load_async("texture", name, file_path, on_ready)
+
+    def load_sprite_async(self, name, file_path, on_ready=None):
+        """Load a sprite in the background, returning a placeholder until it is ready."""
+        return self._load_async("sprite", name, file_path, on_ready)
+
+    def load_portrait_async(self, name, file_path, on_ready=None):
+        """Load a portrait in the background, returning a placeholder until it is ready.
+
+        on_ready(surface) is called from poll_assets() once the real image is
+        registered; it is not called if the image fails to decode.
+        """
+        return self._load_async("portrait", name, file_path, on_ready)
+
+    def _load_async(self, kind, name, file_path, on_ready):
+        """Register a placeholder and queue the decode of an asset on the loader's workers."""
+        store = self._stores[kind]
+        key = (kind, name)
+        if key in self.pending_assets:
+            self.pending_assets[key].append(on_ready)
+            return store[name]
+        if name in store:
+            return store[name]
+        if not os.path.exists(file_path):
+            print(f"{kind.capitalize()} file not found: {file_path}")
+            return None
+
+        if kind == "texture":
+            self.textures[name], array = self.get_placeholder_texture()
+            self.derived.put(("array", name), array, "texture_arrays")
+            self._atlas_dirty = True
+        else:
+            store[name] = self.get_placeholder_image()
+        self.pending_assets[key] = [on_ready]
+
+        decode = self.decode_texture if kind == "texture" else self.decode_image
+        self.get_loader().submit(decode, file_path, lambda decoded: self._finish_async(kind, name, decoded),
+                                 lambda error: self._fail_async(kind, name))
+        return store[name]
+
+    def _finish_async(self, kind, name, decoded):
+        """Swap a placeholder for the decoded asset and notify whoever asked for it."""
+        if kind == "texture":
+            asset = self.store_texture(name, decoded)
+            self._atlas_dirty = True
+        elif kind == "sprite":
+            asset = self.store_sprite(name, decoded)
+        else:
+            asset = self.store_portrait(name, decoded)
+        self.asset_version += 1
+        for on_ready in self.pending_assets.pop((kind, name), []):
+            if on_ready:
+                on_ready(asset)
+
+    def _fail_async(self, kind, name):
+        """Drop the placeholder of an asset whose decode failed so the next request retries it.
+
+        Until then lookups miss, as after a failed synchronous load. Waiting
+        on_ready callbacks are dropped; their callers keep the placeholder
+        they were given.
+        """
+        self.pending_assets.pop((kind, name), None)
+        self._stores[kind].pop(name, None)
+        if kind == "texture":
+            self.derived.discard(("array", name))
+            self._atlas_dirty = True
+        self.asset_version += 1
+
+    def get_loader(self):
+        """Get the background asset loader, starting it on first use."""
+        if self.loader is None:
+            self.loader = AssetLoader()
+        return self.loader
+
+    def get_placeholder_texture(self):
+        """A flat grey texture and array shown while the real texture decodes."""
+        if self._placeholder_texture is None:
+            surface = pygame.Surface((TEXTURE_SIZE, TEXTURE_SIZE))
+            surface.fill((64, 64, 64))
+            self._placeholder_texture = (surface, pygame.surfarray.array3d(surface))
+        return self._placeholder_texture
+
+    def get_placeholder_image(self):
+        """A small transparent image shown while a sprite or portrait decodes."""
+        if self._placeholder_image is None:
+            self._placeholder_image = pygame.Surface((64, 64), pygame.SRCALPHA)
+        return self._placeholder_image
+
+    def poll_assets(self):
+        """Install any assets that finished decoding. Call once per frame on the main thread."""
+        if self.loader is not None and self.loader.pending:
+            self.loader.poll()
+        if self._atlas_dirty:
+            self.build_tile_atlas()
+
+    def wait_for_assets(self):
+        """Block until every background load has been installed."""
+        if self.loader is not None:
+            self.loader.wait()
+        self.poll_assets()
+
+    def shutdown(self):
+        """Stop the background loader's worker threads."""
+        if self.loader is not None:
+            self.loader.shutdown()
+            self.loader = None
+
     def get_texture(self, name):
         """Get a texture by name."""
         return self.textures.get(name)
 
     def get_texture_array(self, name):
         """Get a texture as a numpy array by name."""
-        return self.texture_arrays.get(name)
+        array = self.derived.get(("array", name))
+        if array is None and name in self.textures:
+            array = self.derived.put(("array", name), pygame.surfarray.array3d(self.textures[name]), "texture_arrays")
+        return array
+
+    def get_tile_texture(self, tile_id):
+        """Get the wall texture Surface for a tile id, or None if the tile has none."""
+        return self.tile_surfaces[tile_id]
+
+    def get_tile_layer(self, tile_id):
+        """Get the atlas layer for a tile id, or 0 (the blank layer) if the tile has none."""
+        return self.tile_layers[tile_id]
+
+    def sample_tile_atlas(self, tile_ids, tex_x, tex_y):
+        """Gather texels for arrays of tile ids and texture coordinates in one indexing operation.
+
+        Tiles without a texture read the blank layer, so they come back black.
+        """
+        return self.tile_atlas[self.tile_layers[tile_ids], tex_x, tex_y]
+
+    def register_tile_texture(self, tile_id, name):
+        """Map a tile id to a loaded texture and rebuild the atlas."""
+        self.tile_textures[tile_id] = name
+        self.build_tile_atlas()
+
+    def build_tile_atlas(self):
+        """Pack every tile texture into one contiguous array with a tile-id-to-layer table.
+
+        The atlas is for vectorized renderers; no renderer reads it yet. The
+        raycaster's wall pass still draws from the pre-lit Surfaces from
+        get_lit_tile_texture.
+        """
+        names = sorted({name for name in self.tile_textures.values() if name in self.textures})
+        layer_of = {name: layer for layer, name in enumerate(names, start=1)}
+        blank = np.zeros((TEXTURE_SIZE, TEXTURE_SIZE, 3), dtype=np.uint8)
+        self.tile_atlas = np.ascontiguousarray(np.stack([blank] + [self.get_texture_array(name) for name in names]))
+        self.tile_layers = np.zeros(256, dtype=np.int16)
+        self.tile_surfaces = [None] * 256
+        self._atlas_dirty = False
+        for tile_id, name in self.tile_textures.items():
+            if name in layer_of:
+                self.tile_layers[tile_id] = layer_of[name]
+                self.tile_surfaces[tile_id] = self.textures[name]
+
+    def set_light_bands(self, light_bands):
+        """Change the number of light bands, dropping every pre-lit copy."""
+        self.light_bands = max(2, light_bands)
+        self.derived.clear()
+
+    def get_light_band(self, light_level):
+        """Quantize a 0..1 light level to a band index."""
+        return int(round(min(1.0, max(0.0, light_level)) * (self.light_bands - 1)))
+
+    def get_band_levels(self):
+        """Light level of each band, darkest first."""
+        return np.linspace(0.0, 1.0, self.light_bands)
+
+    def get_lit_texture_array(self, name):
+        """Get a (bands, TEXTURE_SIZE, TEXTURE_SIZE, 3) uint8 array of a texture pre-lit at every band."""
+        texture = self.textures.get(name)
+        if texture is None:
+            return None
+        key = ("lit_array", name)
+        cached = self.derived.get(key)
+        if cached is None or cached[0] is not texture:
+            levels = self.get_band_levels()[:, np.newaxis, np.newaxis, np.newaxis]
+            lit = np.ascontiguousarray((self.get_texture_array(name)[np.newaxis] * levels).astype(np.uint8))
+            cached = self.derived.put(key, (texture, lit), "lit_texture_arrays", lit.nbytes)
+        return cached[1]
+
+    def get_mapped_lit_texture_array(self, name, surface):
+        """Get a texture's lit array as a flat array of 32-bit pixels in surface's pixel format.
+
+        Index it with (band * TEXTURE_SIZE + y) * TEXTURE_SIZE + x.
+        """
+        lit = self.get_lit_texture_array(name)
+        if lit is None:
+            return None
+        pixel_format = (surface.get_masks(), surface.get_shifts(), surface.get_losses())
+        key = ("mapped_lit_array", name, pixel_format)
+        cached = self.derived.get(key)
+        if cached is None or cached[0] is not lit:
+            masks, shifts, losses = pixel_format
+            channels = lit.reshape(-1, 3).astype(np.uint32)
+            mapped = np.full(len(channels), masks[3], dtype=np.uint32)  # Opaque where there is alpha
+            for channel in range(3):
+                mapped |= (channels[:, channel] >> losses[channel]) << shifts[channel]
+            cached = self.derived.put(key, (lit, mapped), "lit_texture_arrays", mapped.nbytes)
+        return cached[1]
+
+    def get_lit_surface(self, surface, band):
+        """Get a copy of a surface multiplied by a band's light level, keeping its alpha."""
+        key = ("lit_surface", id(surface), band)
+        cached = self.derived.get(key)
+        if cached is None or cached[0] is not surface:
+            lit = surface.copy()
+            level = int(255 * band / (self.light_bands - 1))
+            if level < 255:
+                lit.fill((level, level, level), special_flags=pygame.BLEND_MULT)
+            cached = self.derived.put(key, (surface, lit), "lit_surfaces", get_asset_size(lit))
+        return cached[1]
+
+    def get_lit_tile_texture(self, tile_id, band):
+        """Get the wall texture for a tile id pre-lit at a band, or None if the tile has none."""
+        texture = self.tile_surfaces[tile_id]
+        if texture is None:
+            return None
+        return self.get_lit_surface(texture, band)
+
+    def get_memory_report(self):
+        """Return {category: (count, bytes)} for every loaded and derived asset."""
+        report = {}
+        for category, store in (("textures", self.textures), ("sprites", self.sprites), ("portraits", self.portraits)):
+            report[category] = (len(store), sum(get_asset_size(surface) for surface in store.values()))
+        report["tile_atlas"] = (len(self.tile_atlas), self.tile_atlas.nbytes)
+        report.update(self.derived.get_usage())
+        return report
+
+    def format_memory_report(self):
+        """Memory report as printable lines, with the derived cache's budget."""
+        lines = []
+        for category, (count, size) in sorted(self.get_memory_report().items()):
+            lines.append(f"{category:<20} {count:5d} {size / 1048576:9.2f} MB")
+        lines.append(f"{'derived cache':<20} {len(self.derived.entries):5d} {self.derived.total_bytes / 1048576:9.2f} MB"
+                     f" of {self.derived.budget_bytes / 1048576:.0f} MB ({self.derived.evictions} evictions)")
+        return "\n".join(lines)
 
     def get_sprite(self, name):
         """Get a sprite by name."""
@@ -74,17 +402,31 @@ class TextureManager:
         """Get a portrait by name."""
         return self.portraits.get(name)
         
-    def create_default_textures(self):
-        """Create default textures for walls."""
+    def create_default_textures(self, background=False):
+        """Create default textures for walls.
+
+        With background=True the files are decoded on worker threads and
+        placeholders are used until poll_assets() installs them.
+        """
+        load_texture = self.load_texture_async if background else self.load_texture
+        load_sprite = self.load_sprite_async if background else self.load_sprite
+
         # Load textures
-        self.load_texture("dungeon_wall", os.path.join(self.assets_path, "textures", "dungeon_wall.png"))
-        self.load_texture("dungeon_floor", os.path.join(self.assets_path, "textures", "dungeon_floor.png"))
-        self.load_texture("dungeon_ceil", os.path.join(self.assets_path, "textures", "dungeon_ceil.png"))
-        self.load_texture("dungeon_door_closed", os.path.join(self.assets_path, "textures", "dungeon_door_closed.png"))
-        self.load_texture("dungeon_door_open", os.path.join(self.assets_path, "textures", "dungeon_door_open.png"))
+        load_texture("dungeon_wall", os.path.join(self.assets_path, "textures", "dungeon_wall.png"))
+        load_texture("dungeon_floor", os.path.join(self.assets_path, "textures", "dungeon_floor.png"))
+        load_texture("dungeon_ceil", os.path.join(self.assets_path, "textures", "dungeon_ceil.png"))
+        load_texture("dungeon_door_closed", os.path.join(self.assets_path, "textures", "dungeon_door_closed.png"))
+        load_texture("dungeon_door_open", os.path.join(self.assets_path, "textures", "dungeon_door_open.png"))
+        self.build_tile_atlas()
         
         # Load sprites
-        self.load_sprite("goblin", os.path.join(self.assets_path, "sprites", "goblin.png"))
-        self.load_sprite("slime", os.path.join(self.assets_path, "sprites", "slime.png"))
-        self.load_sprite("chest", os.path.join(self.assets_path, "sprites", "chest.png"))
-        self.load_sprite("item_pile", os.path.join(self.assets_path, "sprites", "item_pile.png"))
\ No newline at end of file
+        load_sprite("goblin", os.path.join(self.assets_path, "sprites", "goblin.png"))
+        load_sprite("slime", os.path.join(self.assets_path, "sprites", "slime.png"))
+        load_sprite("chest", os.path.join(self.assets_path, "sprites", "chest.png"))
+        load_sprite("item_pile", os.path.join(self.assets_path, "sprites", "item_pile.png"))
+
+    def get_sprite_path(self, sprite):
+        """Path of a sprite file, given its name with or without extension."""
+        if not os.path.splitext(sprite)[1]:
+            sprite += ".png"
+        return os.path.join(self.assets_path, "sprites", sprite)
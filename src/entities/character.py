@@ -3,12 +3,27 @@ Character class.
 """
 
 from entities.entity import Entity
+from entities.observable import Observable, ObservableProperty
 from entities.spell import Spell
-class Character(Entity):
-    """A character in the party."""
+class Character(Observable, Entity):
+    """A character in the party.
+
+    HP and MP are observable so the GUI only updates when they change.
+    """
+
+    __slots__ = ("_listeners", "_hp", "_max_hp", "_mp", "_max_mp", "name", "level", "xp", "xp_to_next_level",
+                 "attack", "defense", "equipped_weapon", "portrait", "spellbook")
+
+    symbol = ''
+    description = "A character in the party"
+
+    hp = ObservableProperty()
+    max_hp = ObservableProperty()
+    mp = ObservableProperty()
+    max_mp = ObservableProperty()
     
     def __init__(self, name, hp, mp, attack, defense, portrait=None):
-        super().__init__(0, 0, '', name, "A character in the party")
+        super().__init__(0, 0)
         self.name = name
         self.hp = hp
         self.max_hp = hp
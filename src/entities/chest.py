@@ -7,14 +7,21 @@ from entities.entity import Entity
 class Chest(Entity):
     """A chest that can contain items."""
 
+    __slots__ = ("items", "trapped", "locked", "opened")
+
+    symbol = 'C'
+    name = "Chest"
+    description = "A container that might hold treasure."
+    sprite = "chest"
+    render_on_floor = True
+
     def __init__(self, x, y, items=None, trapped=False, locked=False):
-        super().__init__(x, y, 'C', "Chest", "A container that might hold treasure.", sprite="chest")
+        super().__init__(x, y)
         self.items = items if items is not None else []
         self.trapped = trapped
         self.locked = locked
         self.opened = False
         self.blocks_movement = True
-        self.render_on_floor = True
 
     def interact(self, party):
         """Interact with the chest."""
@@ -4,12 +4,17 @@ class Door(Entity):
     """
     Represents a door that can be opened and closed.
     """
+    __slots__ = ("is_open",)
+
+    symbol = "D"
+    name = "Door"
+    texture_open = "dungeon_door_open"
+    texture_closed = "dungeon_door_closed"
+
     def __init__(self, x, y, is_open=False):
-        super().__init__(x, y, "D", "Door")
+        super().__init__(x, y)
         self.is_open = is_open
         self.blocks_movement = not self.is_open
-        self.texture_open = "dungeon_door_open"
-        self.texture_closed = "dungeon_door_closed"
 
     @property
     def texture(self):
@@ -21,7 +26,7 @@ class Door(Entity):
         if not self.is_open:
             self.is_open = True
             self.blocks_movement = False
-            game_map.tiles[int(self.y)][int(self.x)] = 3  # Set tile to open door
+            game_map.set_tile(int(self.x), int(self.y), 3)  # Set tile to open door
             # We might want to add a sound effect here later
 
     def close(self, game_map):
@@ -29,7 +34,7 @@ class Door(Entity):
         if self.is_open:
             self.is_open = False
             self.blocks_movement = True
-            game_map.tiles[int(self.y)][int(self.x)] = 2  # Set tile to door
+            game_map.set_tile(int(self.x), int(self.y), 2)  # Set tile to door
             # We might want to add a sound effect here later
 
     def interact(self, game_map):
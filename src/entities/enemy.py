@@ -6,16 +6,50 @@ from entities.entity import Entity
 from entities.ai import BasicAI
 
 class Enemy(Entity):
-    """Basic enemy entity."""
+    """Basic enemy entity.
+
+    Name, sprite and base stats come from a shared EnemyTemplate; an enemy
+    only stores its position, current HP and morale.
+    """
+
+    __slots__ = ("template", "hp", "morale")
+
+    symbol = 'E'
     
-    def __init__(self, x, y, name, hp, attack, defense, sprite=None, morale=100):
-        super().__init__(x, y, 'E', name, f"A {name} lurking in the dungeon", sprite=sprite)
-        self.hp = hp
-        self.max_hp = hp
-        self.attack = attack
-        self.defense = defense
-        self.morale = morale
-        self.ai = BasicAI(self)  # Attach the AI component
+    def __init__(self, x, y, template, hp=None, morale=None):
+        super().__init__(x, y)
+        self.template = template
+        self.hp = template.max_hp if hp is None else hp
+        self.morale = template.morale if morale is None else morale
+
+    @property
+    def name(self):
+        return self.template.name
+
+    @property
+    def description(self):
+        return self.template.description
+
+    @property
+    def sprite(self):
+        return self.template.sprite
+
+    @property
+    def max_hp(self):
+        return self.template.max_hp
+
+    @property
+    def attack(self):
+        return self.template.attack
+
+    @property
+    def defense(self):
+        return self.template.defense
+
+    @property
+    def ai(self):
+        """The AI component. It keeps no state, so one is made on use rather than stored per enemy."""
+        return BasicAI(self)
         
     def take_damage(self, amount):
         """Reduce enemy HP by amount."""
@@ -24,4 +58,4 @@ class Enemy(Entity):
         
     def is_alive(self):
         """Check if the enemy is still alive."""
-        return self.hp > 0
\ No newline at end of file
+        return self.hp > 0
@@ -6,12 +6,22 @@ from entities.entity import Entity
 
 class EnemyGroup(Entity):
     """A group of enemies on the map."""
-    
+
+    __slots__ = ("enemies",)
+
+    symbol = 'G'
+    name = "Enemy Group"
+    description = "A group of hostile creatures"
+
     def __init__(self, x, y, enemies):
-        sprite_name = enemies[0].sprite if enemies else None
-        super().__init__(x, y, 'G', "Enemy Group", "A group of hostile creatures", sprite=sprite_name)
+        super().__init__(x, y)
         self.enemies = enemies
 
+    @property
+    def sprite(self):
+        """The group is drawn with its first enemy's sprite."""
+        return self.enemies[0].sprite if self.enemies else None
+
     def is_alive(self):
         """Check if there are any living enemies in the group."""
         return any(enemy.is_alive() for enemy in self.enemies)
\ No newline at end of file
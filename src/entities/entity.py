@@ -3,17 +3,59 @@ Base entity class for all game objects.
 """
 
 class Entity:
-    """Base class for all entities in the game world."""
-    
-    def __init__(self, x, y, symbol, name, description="", sprite=None, light_source=None):
+    """Base class for all entities in the game world.
+
+    Entities use __slots__. Values shared by every instance of a class
+    (symbol, name, description, sprite, light source) are class attributes;
+    subclasses add slots for whatever varies per instance. While an entity
+    is on a map, position and blocking changes are written through to its
+    row in the map's EntityStore.
+    """
+
+    __slots__ = ("_x", "_y", "_blocks_movement", "_store", "_row")
+
+    symbol = "?"  # Character used to represent the entity on map
+    name = ""
+    description = ""
+    sprite = None
+    light_source = None
+
+    def __init__(self, x, y):
+        self._store = None  # EntityStore holding this entity's columns, if on a map
+        self._row = -1
         self.x = x
         self.y = y
-        self.symbol = symbol  # Character used to represent the entity on map
-        self.name = name
-        self.description = description
-        self.sprite = sprite
         self.blocks_movement = True  # By default, entities block movement
-        self.light_source = light_source
+
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+        if self._store is not None:
+            self._store.cell_x[self._row] = int(value)
+
+    @property
+    def y(self):
+        return self._y
+
+    @y.setter
+    def y(self, value):
+        self._y = value
+        if self._store is not None:
+            self._store.cell_y[self._row] = int(value)
+
+    @property
+    def blocks_movement(self):
+        return self._blocks_movement
+
+    @blocks_movement.setter
+    def blocks_movement(self, value):
+        self._blocks_movement = value
+        if self._store is not None:
+            self._store.blocks[self._row] = value
     
     def move(self, dx, dy, game_map):
         """Attempt to move the entity by dx, dy on the game map."""
@@ -33,4 +75,4 @@ class Entity:
         
     def is_alive(self):
         """Check if the entity is alive (by default, entities are always alive)."""
-        return True
\ No newline at end of file
+        return True
@@ -3,7 +3,13 @@ Item class for game items.
 """
 
 class Item:
-    """Base class for all items in the game."""
+    """Base class for all items in the game.
+
+    Items have no per-instance state, so identical items loaded from data
+    files are shared (see entities.templates) and must not be modified.
+    """
+
+    __slots__ = ("name", "description", "item_type")
     
     def __init__(self, name, description, item_type="misc"):
         self.name = name
@@ -7,11 +7,18 @@ from entities.entity import Entity
 class ItemPile(Entity):
     """A pile of items on the ground."""
 
+    __slots__ = ("items",)
+
+    symbol = '*'
+    name = "Items"
+    description = "A pile of items on the ground."
+    sprite = "item_pile"
+    render_on_floor = True
+
     def __init__(self, x, y, items=None):
-        super().__init__(x, y, '*', "Items", "A pile of items on the ground.", sprite="item_pile")
+        super().__init__(x, y)
         self.items = items if items is not None else []
         self.blocks_movement = False
-        self.render_on_floor = True
 
     def interact(self, party):
         """Interact with the item pile."""
@@ -0,0 +1,49 @@
+"""
+Observable properties for publishing attribute changes to listeners.
+"""
+
+class ObservableProperty:
+    """A data attribute that notifies the owner's listeners when its value changes."""
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.storage_name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.storage_name)
+
+    def __set__(self, obj, value):
+        old = getattr(obj, self.storage_name, None)
+        setattr(obj, self.storage_name, value)
+        if old != value:
+            obj.notify(self.name, old, value)
+
+
+class Observable:
+    """Mixin for objects with ObservableProperty attributes.
+
+    Listeners are called as listener(source, name, old_value, new_value).
+    Slotted subclasses need a "_listeners" slot and an "_<name>" slot for
+    each observable property.
+    """
+
+    __slots__ = ()
+
+    def subscribe(self, listener):
+        """Register a listener for property changes."""
+        if getattr(self, "_listeners", None) is None:
+            self._listeners = []
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener):
+        """Remove a previously registered listener."""
+        listeners = getattr(self, "_listeners", None)
+        if listeners and listener in listeners:
+            listeners.remove(listener)
+
+    def notify(self, name, old, value):
+        """Tell every listener that a property changed."""
+        for listener in getattr(self, "_listeners", None) or ():
+            listener(self, name, old, value)
@@ -7,9 +7,17 @@ import math
 
 class Player(Entity):
     """Player character entity."""
+
+    __slots__ = ("hp", "max_hp", "mp", "max_mp", "level", "xp", "xp_to_next_level", "attack", "defense",
+                 "inventory", "equipped_weapon", "facing", "angle")
+
+    symbol = '@'
+    name = "Player"
+    description = "The adventurer exploring the dungeon"
+    light_source = {'radius': 8, 'strength': 1.0}
     
     def __init__(self, x, y):
-        super().__init__(x, y, '@', "Player", "The adventurer exploring the dungeon", light_source={'radius': 8, 'strength': 1.0})
+        super().__init__(x, y)
         self.hp = 100
         self.max_hp = 100
         self.mp = 50
@@ -6,6 +6,8 @@ from entities.item import Item
 
 class Potion(Item):
     """Potion item that can heal the player."""
+
+    __slots__ = ("heal_amount",)
     
     def __init__(self, name, description, heal_amount):
         super().__init__(name, description, "potion")
@@ -4,6 +4,8 @@ Spell class for representing magical spells.
 
 class Spell:
     """A magical spell that can be cast by a character."""
+
+    __slots__ = ("name", "description", "mp_cost", "effect", "target_type")
     
     def __init__(self, name, description, mp_cost, effect, target_type="enemy"):
         self.name = name
@@ -0,0 +1,54 @@
+"""
+Shared, immutable definitions for enemies and items loaded from data files.
+"""
+
+from collections import namedtuple
+
+from entities.item import Item
+from entities.potion import Potion
+from entities.weapon import Weapon
+
+# Everything about an enemy that is the same for every instance of it
+EnemyTemplate = namedtuple("EnemyTemplate", "name description max_hp attack defense sprite morale")
+
+def create_item(item_data):
+    """Create an item from its level or party file description."""
+    if item_data["type"] == "potion":
+        return Potion(item_data["name"], item_data["description"], item_data["heal_amount"])
+    elif item_data["type"] == "weapon":
+        return Weapon(item_data["name"], item_data["description"], item_data["attack_bonus"])
+    else:
+        return Item(item_data["name"], item_data["description"], item_data.get("type", "misc"))
+
+class TemplateRegistry:
+    """Interns enemy templates and items so identical definitions are stored once."""
+
+    def __init__(self):
+        self.enemy_templates = {}
+        self.items = {}
+
+    def get_enemy_template(self, name, hp, attack, defense, sprite=None, morale=100):
+        """Get the shared template for an enemy definition."""
+        key = (name, hp, attack, defense, sprite, morale)
+        template = self.enemy_templates.get(key)
+        if template is None:
+            template = EnemyTemplate(name, f"A {name} lurking in the dungeon", hp, attack, defense, sprite, morale)
+            self.enemy_templates[key] = template
+        return template
+
+    def get_item(self, item_data):
+        """Get the shared item for an item description."""
+        key = tuple(sorted(item_data.items()))
+        item = self.items.get(key)
+        if item is None:
+            item = create_item(item_data)
+            self.items[key] = item
+        return item
+
+    def clear(self):
+        """Forget every template."""
+        self.enemy_templates.clear()
+        self.items.clear()
+
+
+templates = TemplateRegistry()
@@ -6,6 +6,8 @@ from entities.item import Item
 
 class Weapon(Item):
     """Weapon item that can be equipped by the player."""
+
+    __slots__ = ("attack_bonus",)
     
     def __init__(self, name, description, attack_bonus):
         super().__init__(name, description, "weapon")
@@ -0,0 +1,134 @@
+"""
+Column-oriented storage of the entities on a map.
+"""
+
+import numpy as np
+
+class EntityStore:
+    """Keeps the hot fields of every entity on a map in parallel NumPy columns.
+
+    Rows are packed at the front; removing an entity moves the last row into
+    its place. objects[row] is the entity itself, so queries run on the
+    columns and only the matching rows are turned back into objects.
+    Entities write position and blocking changes through to their row.
+    """
+
+    COLUMNS = ("cell_x", "cell_y", "kind", "sprite", "light_radius", "light_strength", "blocks")
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.objects = []  # row -> entity
+        self.cell_x = np.zeros(capacity, dtype=np.int32)
+        self.cell_y = np.zeros(capacity, dtype=np.int32)
+        self.kind = np.zeros(capacity, dtype=np.int16)  # Index into kinds
+        self.sprite = np.full(capacity, -1, dtype=np.int16)  # Index into sprite_names, -1 for none
+        self.light_radius = np.zeros(capacity, dtype=np.float64)
+        self.light_strength = np.zeros(capacity, dtype=np.float64)
+        self.blocks = np.zeros(capacity, dtype=bool)
+
+        self.kinds = []  # kind id -> entity class
+        self.kind_ids = {}
+        self.sprite_names = []  # sprite id -> sprite name
+        self.sprite_ids = {}
+
+    def add(self, entity):
+        """Append a row for an entity."""
+        if self.count == len(self.kind):
+            self.grow()
+        row = self.count
+        self.count += 1
+        self.objects.append(entity)
+        entity._store = self
+        entity._row = row
+
+        self.cell_x[row] = int(entity.x)
+        self.cell_y[row] = int(entity.y)
+        self.kind[row] = self.get_kind_id(type(entity))
+        self.sprite[row] = self.get_sprite_id(entity.sprite)
+        light = entity.light_source
+        self.light_radius[row] = light['radius'] if light else 0
+        self.light_strength[row] = light['strength'] if light else 0
+        self.blocks[row] = entity.blocks_movement
+
+    def remove(self, entity):
+        """Remove an entity's row, filling the gap with the last row."""
+        row = entity._row
+        last = self.count - 1
+        if row != last:
+            moved = self.objects[last]
+            self.objects[row] = moved
+            moved._row = row
+            for name in self.COLUMNS:
+                column = getattr(self, name)
+                column[row] = column[last]
+        self.objects.pop()
+        self.count -= 1
+        entity._store = None
+        entity._row = -1
+
+    def grow(self):
+        """Double the capacity of every column."""
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            grown = np.full(len(column) * 2, -1 if name == "sprite" else 0, dtype=column.dtype)
+            grown[:len(column)] = column
+            setattr(self, name, grown)
+
+    def get_kind_id(self, cls):
+        """Id of an entity class, registering it on first use."""
+        kind_id = self.kind_ids.get(cls)
+        if kind_id is None:
+            kind_id = len(self.kinds)
+            self.kinds.append(cls)
+            self.kind_ids[cls] = kind_id
+        return kind_id
+
+    def get_sprite_id(self, sprite):
+        """Id of a sprite name, or -1 for entities without one."""
+        if not sprite:
+            return -1
+        sprite_id = self.sprite_ids.get(sprite)
+        if sprite_id is None:
+            sprite_id = len(self.sprite_names)
+            self.sprite_names.append(sprite)
+            self.sprite_ids[sprite] = sprite_id
+        return sprite_id
+
+    def kind_mask(self, classes):
+        """Boolean mask of the rows whose entity is an instance of any of classes."""
+        ids = [kind_id for kind_id, cls in enumerate(self.kinds) if issubclass(cls, classes)]
+        return np.isin(self.kind[:self.count], ids)
+
+    def objects_at(self, rows):
+        """Entities for an array of rows."""
+        return [self.objects[row] for row in rows.tolist()]
+
+    def rows_at(self, x, y):
+        """Rows of the entities standing in cell (x, y)."""
+        n = self.count
+        return np.flatnonzero((self.cell_x[:n] == x) & (self.cell_y[:n] == y))
+
+    def rows_in_rect(self, x, y, width, height, exclude=()):
+        """Rows of the entities inside a rectangle of cells, leaving out the given classes."""
+        n = self.count
+        mask = ((self.cell_x[:n] >= x) & (self.cell_x[:n] < x + width) &
+                (self.cell_y[:n] >= y) & (self.cell_y[:n] < y + height))
+        if exclude:
+            mask &= ~self.kind_mask(exclude)
+        return np.flatnonzero(mask)
+
+    def lit_rows(self):
+        """Rows of every entity that is a light source."""
+        return np.flatnonzero(self.light_radius[:self.count] > 0)
+
+    def sprite_rows_within(self, x, y, distance, exclude=()):
+        """Rows and squared distances of entities with a sprite whose cell centre is within distance of (x, y)."""
+        n = self.count
+        dx = self.cell_x[:n] + 0.5 - x
+        dy = self.cell_y[:n] + 0.5 - y
+        dist2 = dx * dx + dy * dy
+        mask = (self.sprite[:n] >= 0) & (dist2 <= distance * distance)
+        if exclude:
+            mask &= ~self.kind_mask(exclude)
+        rows = np.flatnonzero(mask)
+        return rows, dist2[rows]
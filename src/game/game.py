@@ -1,9 +1,13 @@
 import pygame
+import random
 import sys
 from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from game.states.playing_state import PlayingState
 from ui.game_gui import GameGUI
 from engine.texture_manager import TextureManager
+from game.replay import InputRecorder, InputPlayer, new_seed
+from game.startup_report import StartupReport
+from game.save_game import SaveManager
 
 class Game:
     """
@@ -11,27 +15,57 @@ class Game:
 
     This class initializes the game, runs the main game loop, and manages game states.
     """
-    def __init__(self, show_fps=False):
+    def __init__(self, show_fps=False, record_path=None, replay_path=None, replay_fast=False, seed=None,
+                 startup_report=None, load_path=None, level_path=None):
         """
         Initializes the game, including pygame, the screen, and the clock.
+
+        When record_path is given the seed and input stream are recorded to it;
+        when replay_path is given a previous recording is played back instead.
+        load_path resumes a save game instead of starting a new one, and
+        level_path starts the new game on another level file.
+        Only what the first frame needs is built here; combat and interaction
+        UI are created on first use. Startup phases are timed into startup_report.
         """
-        pygame.init()
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption("Crawler - First-Person Dungeon Crawler")
+        self.startup = startup_report if startup_report is not None else StartupReport()
+        with self.startup.phase("pygame and display"):
+            pygame.init()
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption("Crawler - First-Person Dungeon Crawler")
         self.clock = pygame.time.Clock()
         self.running = True
         self.states = []
         self.show_fps = show_fps
 
-        self.texture_manager = TextureManager()
-        self.game_gui = GameGUI(self.texture_manager, self.show_fps)
+        self.recorder = None
+        self.player = None
+        if replay_path:
+            self.player = InputPlayer(replay_path, fast=replay_fast)
+            seed = self.player.seed
+        elif record_path:
+            seed = seed if seed is not None else new_seed()
+            self.recorder = InputRecorder(record_path, seed)
+        if seed is not None:
+            random.seed(seed)
 
-        self.load_states()
+        self.save_manager = SaveManager()
+        with self.startup.phase("texture manager"):
+            self.texture_manager = TextureManager()
+        with self.startup.phase("GUI manager and HUD"):
+            self.game_gui = GameGUI(self.texture_manager, self.show_fps)
+        with self.startup.phase("playing state"):
+            self.load_states(load_path, level_path)
 
-    def load_states(self):
-        self.playing_state = PlayingState(self)
+    def load_states(self, save_path=None, level_path=None):
+        self.playing_state = PlayingState(self, save_path, level_path)
         self.states.append(self.playing_state)
 
+    def load_game(self, save_path):
+        """Replace the running game with a saved one."""
+        self.save_manager.wait()
+        self.states = []
+        self.load_states(save_path)
+
     def push_state(self, state):
         self.states.append(state)
 
@@ -43,10 +77,17 @@ class Game:
         The main game loop.
         """
         while self.running:
-            time_delta = self.clock.tick(60) / 1000.0
+            if self.player:
+                time_delta = self.player.tick(self.clock, 60)
+            else:
+                time_delta = self.clock.tick(60) / 1000.0
             self.handle_events()
             self.update(time_delta)
             self.draw()
+            if self.startup.mark_first_frame() and self.startup.enabled:
+                self.startup.print_report()
+            if self.player and self.player.finished:
+                self.running = False
 
         self.cleanup()
 
@@ -54,7 +95,7 @@ class Game:
         """
         Handles global events and passes events to the current state.
         """
-        for event in pygame.event.get():
+        for event in self.get_events():
             if event.type == pygame.QUIT:
                 self.running = False
             
@@ -68,10 +109,21 @@ class Game:
                     # This part might need more logic later
                     pass
 
+    def get_events(self):
+        """
+        Returns this frame's events, going through the recorder or replay player if active.
+        """
+        if self.player:
+            return self.player.get_events()
+        if self.recorder:
+            return self.recorder.get_events()
+        return pygame.event.get()
+
     def update(self, time_delta):
         """
         Updates the current game state.
         """
+        self.texture_manager.poll_assets()
         if self.states:
             self.states[-1].update(time_delta)
             if self.states[-1].quit:
@@ -91,12 +143,17 @@ class Game:
             self.states[-1].draw(self.screen, self.clock)
         
         self.game_gui.draw(self.screen)
-        self.game_gui.combat_ui.draw(self.screen)
         pygame.display.flip()
 
     def cleanup(self):
         """
         Cleans up resources before exiting the game.
         """
+        if self.recorder:
+            self.recorder.save()
+        if self.player:
+            self.player.report(self.playing_state.turn_manager.turn_times)
+        self.texture_manager.shutdown()
+        self.save_manager.shutdown()
         pygame.quit()
         sys.exit()
@@ -2,6 +2,10 @@
 Game map class for managing dungeon layout and entities.
 """
 
+import numpy as np
+
+from game.entity_store import EntityStore
+
 class GameMap:
     """Represents the game world map."""
     
@@ -9,10 +13,42 @@ class GameMap:
         self.width = width
         self.height = height
         self.tiles = [[0 for _ in range(width)] for _ in range(height)]
-        self.entities = []
+        self.entities = []  # In the order they were added
+        self.entity_store = EntityStore()  # Columns used for position, light and sprite queries
+        self.entity_version = 0  # Increases whenever an entity is added or removed
         self.ambient_light = ambient_light
         self.light_map = [[ambient_light for _ in range(width)] for _ in range(height)]
+        self.tile_changes = []  # (x, y) of every tile edited after loading, in order
+        self.explored = np.zeros((height, width), dtype=bool)  # Cells the party has seen
+        self.explored_version = 0  # Increases whenever new cells are explored
+        self.visibility = None  # PotentiallyVisibleSets of the first-person view, if one was made
+
+    @property
+    def tile_version(self):
+        """A counter that increases every time a tile changes."""
+        return len(self.tile_changes)
+
+    def set_tile(self, x, y, tile):
+        """Change a tile and record the change for caches built from the tile grid."""
+        if self.tiles[y][x] != tile:
+            self.tiles[y][x] = tile
+            self.tile_changes.append((x, y))
+
+    def get_tile_changes_since(self, version):
+        """Return the (x, y) cells changed since the given tile_version."""
+        return self.tile_changes[version:]
         
+    def explore(self, x, y, radius=2):
+        """Mark the cells within radius of (x, y) as explored. Returns True if any were new."""
+        x0, x1 = max(0, int(x) - radius), min(self.width, int(x) + radius + 1)
+        y0, y1 = max(0, int(y) - radius), min(self.height, int(y) + radius + 1)
+        area = self.explored[y0:y1, x0:x1]
+        if area.all():
+            return False
+        area[:] = True
+        self.explored_version += 1
+        return True
+
     def is_walkable(self, x, y):
         """Check if a tile is walkable (within bounds, not a wall, no blocking entity)."""
         # Check bounds
@@ -25,29 +61,40 @@ class GameMap:
             return False
             
         # Check for blocking entities
-        for entity in self.entities:
-            if int(entity.x) == x and int(entity.y) == y and entity.blocks_movement:
-                return False
-                
-        return True
+        store = self.entity_store
+        return not store.blocks[store.rows_at(x, y)].any()
         
     def add_entity(self, entity):
         """Add an entity to the map."""
         self.entities.append(entity)
+        self.entity_store.add(entity)
+        self.entity_version += 1
         
     def remove_entity(self, entity):
         """Remove an entity from the map."""
-        if entity in self.entities:
+        if entity._store is self.entity_store:
             self.entities.remove(entity)
+            self.entity_store.remove(entity)
+            self.entity_version += 1
             
-    def get_entities_at(self, x, y):
-        """Get all entities at a specific position."""
-        return [entity for entity in self.entities if int(entity.x) == x and int(entity.y) == y]
+    def get_entities_at(self, x, y, kinds=None):
+        """Get all entities at a specific position, optionally only instances of kinds."""
+        store = self.entity_store
+        rows = store.rows_at(x, y)
+        if kinds is not None:
+            rows = rows[store.kind_mask(kinds)[rows]]
+        return store.objects_at(np.sort(rows))
         
     def get_blocking_entities_at(self, x, y):
         """Get all blocking entities at a specific position."""
-        return [entity for entity in self.entities 
-                if int(entity.x) == x and int(entity.y) == y and entity.blocks_movement]
+        store = self.entity_store
+        rows = store.rows_at(x, y)
+        return store.objects_at(np.sort(rows[store.blocks[rows]]))
+
+    def get_entities_of_kind(self, kinds):
+        """Get every entity that is an instance of kinds (a class or tuple of classes)."""
+        store = self.entity_store
+        return store.objects_at(np.flatnonzero(store.kind_mask(kinds)))
                 
     def move_entity(self, entity, dx, dy):
         """Move an entity by dx, dy in grid coordinates."""
@@ -69,13 +116,13 @@ class GameMap:
         # Reset light map to ambient light
         self.light_map = [[self.ambient_light for _ in range(self.width)] for _ in range(self.height)]
 
-        # Get all light sources
-        light_sources = [entity for entity in self.entities if hasattr(entity, 'light_source') and entity.light_source]
+        # Get all light sources from the entity columns
+        store = self.entity_store
+        rows = store.lit_rows()
+        sources = zip(store.cell_x[rows].tolist(), store.cell_y[rows].tolist(),
+                      store.light_radius[rows].tolist(), store.light_strength[rows].tolist())
 
-        for source in light_sources:
-            radius = source.light_source['radius']
-            strength = source.light_source['strength']
-            center_x, center_y = int(source.x), int(source.y)
+        for center_x, center_y, radius, strength in sources:
 
             # Use BFS for light propagation
             queue = deque([(center_x, center_y, strength)])
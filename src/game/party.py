@@ -4,12 +4,22 @@ Party class for managing the player's characters.
 
 import math
 from entities.entity import Entity
+from entities.observable import Observable, ObservableProperty
 
-class Party(Entity):
+class Party(Observable, Entity):
     """Represents the player's party."""
 
+    __slots__ = ("_listeners", "_facing", "characters", "inventory", "angle")
+
+    symbol = '@'
+    name = "Party"
+    description = "A group of adventurers."
+    light_source = {'radius': 8, 'strength': 1.0}
+
+    facing = ObservableProperty()
+
     def __init__(self, x, y):
-        super().__init__(x, y, '@', "Party", "A group of adventurers.", light_source={'radius': 8, 'strength': 1.0})
+        super().__init__(x, y)
         self.characters = []
         self.inventory = []
         self.facing = 0  # 0=north, 1=east, 2=south, 3=west
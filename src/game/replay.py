@@ -0,0 +1,146 @@
+"""
+Input recording and replay for reproducible benchmark sessions.
+"""
+
+import gzip
+import json
+import random
+import time
+
+import pygame
+
+REPLAY_VERSION = 1
+
+# Raw device events worth recording. GUI events (button presses etc.) are
+# derived from these by pygame_gui, so they are regenerated during replay.
+RECORDED_EVENT_TYPES = {
+    pygame.QUIT,
+    pygame.KEYDOWN,
+    pygame.KEYUP,
+    pygame.TEXTINPUT,
+    pygame.MOUSEBUTTONDOWN,
+    pygame.MOUSEBUTTONUP,
+    pygame.MOUSEMOTION,
+    pygame.MOUSEWHEEL,
+}
+
+
+def _serialize_attrs(event):
+    """Keep only the plain-data attributes of an event."""
+    attrs = {}
+    for name, value in event.dict.items():
+        if isinstance(value, (bool, int, float, str)):
+            attrs[name] = value
+        elif isinstance(value, tuple) and all(isinstance(v, (int, float)) for v in value):
+            attrs[name] = list(value)
+    return attrs
+
+
+def _deserialize_attrs(attrs):
+    """Turn stored lists back into the tuples pygame uses."""
+    return {name: tuple(value) if isinstance(value, list) else value for name, value in attrs.items()}
+
+
+class InputRecorder:
+    """Records the seed and the input event stream of a session."""
+
+    def __init__(self, file_path, seed):
+        self.file_path = file_path
+        self.seed = seed
+        self.events = []
+        self.frame = 0
+        self.start_time = time.perf_counter()
+
+    def get_events(self):
+        """Fetch this frame's events from pygame and record the input ones."""
+        events = pygame.event.get()
+        timestamp = int((time.perf_counter() - self.start_time) * 1000)
+        for event in events:
+            if event.type in RECORDED_EVENT_TYPES:
+                self.events.append([self.frame, timestamp, event.type, _serialize_attrs(event)])
+        self.frame += 1
+        return events
+
+    def save(self):
+        """Write the recording to disk as compressed JSON."""
+        data = {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "frames": self.frame,
+            "events": self.events,
+        }
+        with gzip.open(self.file_path, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        print(f"Recorded {len(self.events)} events over {self.frame} frames to {self.file_path}")
+
+
+class InputPlayer:
+    """Feeds a recorded input stream back into the game frame by frame."""
+
+    def __init__(self, file_path, fast=False):
+        with gzip.open(file_path, 'rt', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"Unsupported replay version: {data.get('version')}")
+
+        self.file_path = file_path
+        self.seed = data["seed"]
+        self.total_frames = data["frames"]
+        self.events = data["events"]
+        self.fast = fast
+        self.frame = 0
+        self.next_event = 0
+        self.frame_times = []
+        self._last_frame_start = None
+
+    @property
+    def finished(self):
+        """True once every recorded frame has been played back."""
+        return self.frame >= self.total_frames
+
+    def get_events(self):
+        """Return the recorded events for this frame plus any non-input events."""
+        now = time.perf_counter()
+        if self._last_frame_start is not None:
+            self.frame_times.append(now - self._last_frame_start)
+        self._last_frame_start = now
+
+        # Live input is ignored, but internal events (e.g. from pygame_gui) pass through
+        events = [e for e in pygame.event.get() if e.type not in RECORDED_EVENT_TYPES]
+        while self.next_event < len(self.events) and self.events[self.next_event][0] <= self.frame:
+            _, _, event_type, attrs = self.events[self.next_event]
+            events.append(pygame.event.Event(event_type, _deserialize_attrs(attrs)))
+            self.next_event += 1
+        self.frame += 1
+        return events
+
+    def tick(self, clock, framerate):
+        """Advance the clock, skipping frame limiting in fast mode."""
+        if self.fast:
+            # Keep gameplay timing identical to a 60 FPS session
+            clock.tick()
+            return 1.0 / framerate
+        return clock.tick(framerate) / 1000.0
+
+    def report(self, turn_times=None):
+        """Print frame and turn timing statistics for the session."""
+        print(f"Replay {self.file_path}: {self.frame} frames, seed {self.seed}")
+        _print_timings("frame", self.frame_times)
+        if turn_times:
+            _print_timings("turn", turn_times)
+
+
+def _print_timings(label, samples):
+    """Print mean, p95 and max of a list of durations in seconds."""
+    if not samples:
+        return
+    ordered = sorted(samples)
+    mean = sum(ordered) / len(ordered)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    print(f"  {label} time: mean {mean * 1000:.2f} ms, p95 {p95 * 1000:.2f} ms, "
+          f"max {ordered[-1] * 1000:.2f} ms over {len(ordered)} samples")
+
+
+def new_seed():
+    """Pick a fresh seed for a recording session."""
+    return random.SystemRandom().randrange(2 ** 32)
@@ -0,0 +1,217 @@
+"""
+Save games stored as differences from the pristine level file.
+"""
+
+import os
+import json
+import math
+import zlib
+import struct
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from entities.door import Door
+from entities.chest import Chest
+from entities.weapon import Weapon
+from entities.potion import Potion
+from entities.templates import templates
+
+SAVE_MAGIC = b"CRWL"
+SAVE_VERSION = 1
+
+def item_to_data(item):
+    """Describe an item the way level and party files do."""
+    data = {"type": item.item_type, "name": item.name, "description": item.description}
+    if isinstance(item, Weapon):
+        data["attack_bonus"] = item.attack_bonus
+    elif isinstance(item, Potion):
+        data["heal_amount"] = item.heal_amount
+    return data
+
+def take_snapshot(playing_state):
+    """Collect everything that differs from the level file into plain data.
+
+    Only reads game objects and copies small values, so it is cheap enough
+    to run on the main thread between frames; the result shares nothing
+    mutable with the game and can be written from another thread.
+    """
+    game_map = playing_state.game_map
+    level_data = playing_state.level_data
+    party = playing_state.party
+    on_map = {id(entity) for entity in game_map.entities}
+
+    tiles = [[x, y, game_map.tiles[y][x]] for x, y in dict.fromkeys(game_map.tile_changes)]
+
+    groups = []
+    for index, group in enumerate(playing_state.level_groups):
+        group_data = level_data["enemy_groups"][index]
+        if id(group) not in on_map:
+            groups.append([index])  # Defeated, fled from or otherwise gone
+            continue
+        hp = [enemy.hp for enemy in group.enemies]
+        if (group.x, group.y) != (group_data["x"], group_data["y"]) or hp != [e["hp"] for e in group_data["enemies"]]:
+            groups.append([index, group.x, group.y, hp])
+
+    containers = []
+    for index, container in enumerate(playing_state.level_containers):
+        if container is None:
+            continue  # Level entity that is not a container
+        if id(container) not in on_map:
+            containers.append([index])  # Emptied and removed
+            continue
+        original = playing_state.level_container_items[index]
+        items = []
+        for item in container.items:
+            position = next((i for i, level_item in enumerate(original) if level_item is item), None)
+            items.append(position if position is not None else item_to_data(item))
+        flags = [getattr(container, "opened", False), getattr(container, "trapped", False),
+                 getattr(container, "locked", False)]
+        entity_data = level_data["entities"][index]
+        pristine_flags = [False, entity_data.get("trapped", False), entity_data.get("locked", False)]
+        if items != list(range(len(original))) or flags != pristine_flags:
+            containers.append([index, items] + flags)
+
+    inventory = list(party.inventory)
+    characters = []
+    for character in party.characters:
+        weapon = character.equipped_weapon
+        characters.append({
+            "hp": character.hp, "max_hp": character.max_hp, "mp": character.mp, "max_mp": character.max_mp,
+            "level": character.level, "xp": character.xp, "xp_to_next_level": character.xp_to_next_level,
+            "attack": character.attack, "defense": character.defense,
+            "weapon": next((i for i, item in enumerate(inventory) if item is weapon), None) if weapon else None,
+        })
+
+    return {
+        "version": SAVE_VERSION,
+        "level": playing_state.level_path,
+        "turn": playing_state.turn_manager.turn_number,
+        "tiles": tiles,
+        "groups": groups,
+        "containers": containers,
+        "party": {
+            "x": party.x, "y": party.y, "facing": party.facing,
+            "inventory": [item_to_data(item) for item in inventory],
+            "characters": characters,
+        },
+        "explored": np.packbits(game_map.explored).tobytes(),
+    }
+
+def encode_snapshot(snapshot):
+    """Pack a snapshot as magic, version and a zlib stream of JSON plus the explored bitset."""
+    fields = {key: value for key, value in snapshot.items() if key != "explored"}
+    payload = json.dumps(fields, separators=(",", ":")).encode("utf-8")
+    body = struct.pack("<I", len(payload)) + payload + snapshot["explored"]
+    return SAVE_MAGIC + struct.pack("<H", SAVE_VERSION) + zlib.compress(body, 6)
+
+def decode_snapshot(data):
+    """Inverse of encode_snapshot. Raises ValueError for files that are not save games."""
+    if data[:4] != SAVE_MAGIC:
+        raise ValueError("not a save game")
+    version, = struct.unpack_from("<H", data, 4)
+    if version != SAVE_VERSION:
+        raise ValueError(f"unsupported save version {version}")
+    try:
+        body = zlib.decompress(data[6:])
+    except zlib.error as e:
+        raise ValueError(f"corrupt save game: {e}")
+    length, = struct.unpack_from("<I", body)
+    snapshot = json.loads(body[4:4 + length].decode("utf-8"))
+    snapshot["explored"] = body[4 + length:]
+    return snapshot
+
+def write_save(snapshot, file_path):
+    """Serialize a snapshot and atomically replace file_path with it."""
+    directory = os.path.dirname(file_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    data = encode_snapshot(snapshot)
+    with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as f:
+        f.write(data)
+    os.replace(f.name, file_path)
+    return len(data)
+
+def read_save(file_path):
+    """Read a save game written by write_save."""
+    with open(file_path, "rb") as f:
+        return decode_snapshot(f.read())
+
+def apply_snapshot(playing_state, snapshot):
+    """Replay a snapshot's differences onto a freshly loaded level."""
+    game_map = playing_state.game_map
+    party = playing_state.party
+
+    for x, y, tile in snapshot["tiles"]:
+        game_map.set_tile(x, y, tile)
+        for door in game_map.get_entities_at(x, y, Door):
+            door.is_open = tile == 3
+            door.blocks_movement = not door.is_open
+
+    for entry in snapshot["groups"]:
+        group = playing_state.level_groups[entry[0]]
+        if len(entry) == 1:
+            game_map.remove_entity(group)
+            continue
+        group.x, group.y = entry[1], entry[2]
+        for enemy, hp in zip(group.enemies, entry[3]):
+            enemy.hp = hp
+
+    for entry in snapshot["containers"]:
+        container = playing_state.level_containers[entry[0]]
+        if len(entry) == 1:
+            game_map.remove_entity(container)
+            continue
+        original = playing_state.level_container_items[entry[0]]
+        container.items = [original[item] if isinstance(item, int) else templates.get_item(item)
+                           for item in entry[1]]
+        if isinstance(container, Chest):
+            container.opened, container.trapped, container.locked = entry[2], entry[3], entry[4]
+            container.blocks_movement = not container.opened
+
+    party_data = snapshot["party"]
+    party.x, party.y = party_data["x"], party_data["y"]
+    party.facing = party_data["facing"]
+    party.angle = party.facing * (math.pi / 2)
+    party.inventory = [templates.get_item(item_data) for item_data in party_data["inventory"]]
+    for character, data in zip(party.characters, party_data["characters"]):
+        for name in ("max_hp", "hp", "max_mp", "mp", "level", "xp", "xp_to_next_level", "attack", "defense"):
+            setattr(character, name, data[name])
+        weapon = data["weapon"]
+        character.equipped_weapon = party.inventory[weapon] if weapon is not None else None
+
+    explored = np.unpackbits(np.frombuffer(snapshot["explored"], dtype=np.uint8), count=game_map.explored.size)
+    game_map.explored[:] = explored.reshape(game_map.explored.shape).astype(bool)
+    game_map.explored_version += 1
+    playing_state.turn_manager.turn_number = snapshot["turn"]
+
+class SaveManager:
+    """Writes save games on a background thread so saving never stalls a frame.
+
+    Saves are written one at a time in the order they were requested.
+    """
+
+    def __init__(self):
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save_game")
+        self.pending = None
+
+    def save_async(self, snapshot, file_path):
+        """Queue a snapshot taken with take_snapshot to be written to file_path."""
+        self.pending = self.executor.submit(write_save, snapshot, file_path)
+        self.pending.add_done_callback(lambda future: self._report(future, file_path))
+        return self.pending
+
+    def _report(self, future, file_path):
+        """Print a failed save; runs on the worker thread."""
+        error = future.exception()
+        if error is not None:
+            print(f"Failed to save game: {file_path} - {error}")
+
+    def wait(self):
+        """Block until the last queued save has been written."""
+        if self.pending is not None:
+            self.pending.exception()
+
+    def shutdown(self):
+        """Finish queued saves and stop the worker thread."""
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,44 @@
+"""
+Timing of the startup phases, printed with --startup-report.
+"""
+
+import time
+from contextlib import contextmanager
+
+class StartupReport:
+    """Records how long each startup phase takes, from creation to the first frame."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.phases = []  # (name, depth, milliseconds)
+        self.depth = 0
+        self.first_frame = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time the enclosed block as a named phase; phases may be nested."""
+        index = len(self.phases)
+        self.phases.append((name, self.depth, 0.0))
+        self.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            self.phases[index] = (name, self.depth, (time.perf_counter() - start) * 1000)
+
+    def mark_first_frame(self):
+        """Record that the first frame has been presented. Returns True the first time only."""
+        if self.first_frame is not None:
+            return False
+        self.first_frame = (time.perf_counter() - self.start) * 1000
+        return True
+
+    def print_report(self):
+        """Print the timed phases and the time to the first frame."""
+        print("Startup report:")
+        for name, depth, ms in self.phases:
+            print(f"  {'  ' * depth}{name:<{36 - 2 * depth}} {ms:8.1f} ms")
+        if self.first_frame is not None:
+            print(f"  {'first frame presented':<36} {self.first_frame:8.1f} ms")
@@ -36,7 +36,7 @@ class CombatState(BaseState):
                     self.combat_ui.show_damage(target_index, damage)
 
                 if target_dead:
-                    self.combat_ui.build_enemy_display()
+                    self.combat_ui.refresh_enemy_display()
 
                 self.next_turn()
             elif action == "spell":
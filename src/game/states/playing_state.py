@@ -1,5 +1,6 @@
 import math
 import json
+import os
 
 from .base_state import BaseState
 from engine.raycaster import Raycaster
@@ -8,52 +9,78 @@ from game.party import Party
 from entities.enemy import Enemy
 from entities.enemy_group import EnemyGroup
 from entities.door import Door
-from entities.potion import Potion
 from entities.spell import Spell
 from entities.weapon import Weapon
-from entities.item import Item
+from entities.templates import templates
 from entities.chest import Chest
 from entities.item_pile import ItemPile
 from game.game_map import GameMap
+from game.visibility import PotentiallyVisibleSets
 from game.turn_manager import TurnManager
 from game.combat_manager import CombatManager
 from ui.minimap_ui import MinimapUI
 
-from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT, DEFAULT_LEVEL, PVS_BAKE_LIMIT, SAVE_DIR, AUTOSAVE_FILE, QUICKSAVE_FILE, AUTOSAVE_INTERVAL
+from game.save_game import take_snapshot, read_save, apply_snapshot
 from .inventory_state import InventoryState
 from .combat_state import CombatState
 from .loot_state import LootState
-from pygame import KEYDOWN, K_w, K_a, K_s, K_d, K_q, K_e, K_i, K_SPACE, K_TAB, K_UP, K_DOWN, K_LEFT, K_RIGHT
+from pygame import KEYDOWN, K_F5, K_F9, K_w, K_a, K_s, K_d, K_q, K_e, K_i, K_SPACE, K_TAB, K_UP, K_DOWN, K_LEFT, K_RIGHT
 
 class PlayingState(BaseState):
-    def __init__(self, game):
+    def __init__(self, game, save_path=None, level_path=None):
         super().__init__()
         self.game = game
         self.texture_manager = self.game.texture_manager
         self.game_gui = self.game.game_gui
-        self.texture_manager.create_default_textures()
-        self.load_level("data/maps/level_1.json")
+        startup = self.game.startup
+        with startup.phase("queue texture loads"):
+            self.texture_manager.create_default_textures(background=True)
+        with startup.phase("load level"):
+            snapshot = self.read_snapshot(save_path) if save_path else None
+            self.load_level(snapshot["level"] if snapshot else level_path or DEFAULT_LEVEL)
+            self.turn_manager = TurnManager(self.game_map, self.party)
+            if snapshot:
+                apply_snapshot(self, snapshot)
+
+        with startup.phase("raycaster"):
+            self.raycaster = Raycaster(SCREEN_WIDTH, SCREEN_HEIGHT, self.game_map, self.texture_manager)
+            self.raycaster.set_party_position(self.party.x, self.party.y)
+            self.raycaster.set_party_angle(self.party.angle)
 
-        self.raycaster = Raycaster(SCREEN_WIDTH, SCREEN_HEIGHT, self.game_map, self.texture_manager)
-        self.raycaster.set_party_position(self.party.x, self.party.y)
-        self.raycaster.set_party_angle(self.party.angle)
+        with startup.phase("visible sets"):
+            visibility = PotentiallyVisibleSets(self.game_map, self.raycaster.fov, self.raycaster.max_distance,
+                                                self.raycaster.transparent_tiles)
+            cells = visibility.get_standing_cells()
+            if len(cells) <= PVS_BAKE_LIMIT:
+                visibility.bake(cells)
+            self.game_map.visibility = visibility
 
-        self.turn_manager = TurnManager(self.game_map)
         self.combat_manager = CombatManager(self.game_gui)
 
-        self.minimap_ui = MinimapUI(SCREEN_WIDTH, SCREEN_HEIGHT, self.game_map.width, self.game_map.height)
+        with startup.phase("party frames"):
+            self.minimap_ui = MinimapUI(SCREEN_WIDTH, SCREEN_HEIGHT, self.game_map.width, self.game_map.height)
+            self.game_gui.bind_party(self.party)
 
         self.game_gui.add_message("Welcome to Crawler!")
         self.game_gui.add_message("WASD: Move/Strafe, QE/Arrow Keys: Turn")
         self.game_gui.add_message("Press 'I' to open inventory")
         self.game_gui.add_message("Press 'TAB' to show minimap")
         self.game_map.update_light_map()
+        self.game_map.explore(self.party.x, self.party.y)
         self.waiting_for_input = True
 
     def load_level(self, file_path):
         with open(file_path, 'r') as f:
             level_data = json.load(f)
 
+        # Kept so save games only need to store what changed since loading
+        self.level_path = file_path
+        self.level_data = level_data
+        self.level_groups = []  # Enemy groups, by index in the level file
+        self.level_containers = []  # Chests and item piles by entity index (None for other entities)
+        self.level_container_items = []  # Each container's items as loaded
+
         map_data = level_data["map"]
         self.game_map = GameMap(len(map_data[0]), len(map_data))
         self.game_map.tiles = map_data
@@ -98,15 +125,16 @@ class PlayingState(BaseState):
         for group_data in level_data.get("enemy_groups", []):
             enemies = []
             for enemy_data in group_data["enemies"]:
-                enemy = Enemy(
-                    group_data["x"], group_data["y"], enemy_data["name"],
-                    enemy_data["hp"], enemy_data["attack"], enemy_data["defense"],
-                    enemy_data["sprite"],
-                    enemy_data.get("morale", 100)
+                template = templates.get_enemy_template(
+                    enemy_data["name"], enemy_data["hp"], enemy_data["attack"], enemy_data["defense"],
+                    enemy_data["sprite"], enemy_data.get("morale", 100)
                 )
+                enemy = Enemy(group_data["x"], group_data["y"], template)
                 enemies.append(enemy)
+                self.preload_sprite(enemy.sprite)
             enemy_group = EnemyGroup(group_data["x"], group_data["y"], enemies)
             self.game_map.add_entity(enemy_group)
+            self.level_groups.append(enemy_group)
 
         for entity_data in level_data.get("entities", []):
             entity_type = entity_data.get("type")
@@ -115,23 +143,39 @@ class PlayingState(BaseState):
             
             items = [self._create_item(item_data) for item_data in entity_data.get("items", [])]
 
+            container = None
             if entity_type == "chest":
-                chest = Chest(x, y,
+                container = Chest(x, y,
                                items=items,
                                trapped=entity_data.get("trapped", False),
                                locked=entity_data.get("locked", False))
-                self.game_map.add_entity(chest)
+                self.game_map.add_entity(container)
             elif entity_type == "item_pile":
-                item_pile = ItemPile(x, y, items=items)
-                self.game_map.add_entity(item_pile)
+                container = ItemPile(x, y, items=items)
+                self.game_map.add_entity(container)
+            self.level_containers.append(container)
+            self.level_container_items.append(list(items))
+
+    def read_snapshot(self, save_path):
+        """Read a save game, or return None (starting a new game) if it cannot be read."""
+        try:
+            return read_save(save_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Failed to load save game: {save_path} - {e}")
+            return None
+
+    def save_game(self, file_name):
+        """Snapshot the game now and write it to the save directory in the background."""
+        self.game.save_manager.save_async(take_snapshot(self), os.path.join(SAVE_DIR, file_name))
+
+    def preload_sprite(self, sprite):
+        """Start decoding a sprite in the background so it is ready when first shown."""
+        if sprite:
+            self.texture_manager.load_sprite_async(os.path.splitext(sprite)[0],
+                                                   self.texture_manager.get_sprite_path(sprite))
 
     def _create_item(self, item_data):
-        if item_data["type"] == "potion":
-            return Potion(item_data["name"], item_data["description"], item_data["heal_amount"])
-        elif item_data["type"] == "weapon":
-            return Weapon(item_data["name"], item_data["description"], item_data["attack_bonus"])
-        else:
-            return Item(item_data["name"], item_data["description"], item_data.get("type", "misc"))
+        return templates.get_item(item_data)
 
     def get_event(self, event):
         if self.game_gui.last_action and "interaction" in self.game_gui.last_action:
@@ -143,7 +187,15 @@ class PlayingState(BaseState):
             if self.minimap_ui.handle_input(event):
                 return
 
-            if event.key == K_i and not self.combat_manager.in_combat:
+            if event.key == K_F5 and not self.combat_manager.in_combat:
+                self.save_game(QUICKSAVE_FILE)
+                self.game_gui.add_message("Game saved.")
+            elif event.key == K_F9 and not self.combat_manager.in_combat:
+                save_path = os.path.join(SAVE_DIR, QUICKSAVE_FILE)
+                if os.path.exists(save_path):
+                    self.game.load_game(save_path)
+                    self.game_gui.add_message("Game loaded.")
+            elif event.key == K_i and not self.combat_manager.in_combat:
                 new_state = InventoryState(self.party)
                 self.game.push_state(new_state)
             elif event.key == K_TAB and not self.combat_manager.in_combat:
@@ -183,16 +235,14 @@ class PlayingState(BaseState):
 
             # Check for door interaction before other checks
             if self.game_map.tiles[target_y][target_x] == 2:
-                door = next((e for e in self.game_map.get_entities_at(target_x, target_y) if isinstance(e, Door)), None)
+                door = next(iter(self.game_map.get_entities_at(target_x, target_y, Door)), None)
                 if door:
                     door.interact(self.game_map)
                     self.game_gui.add_message("You open the door.")
                     moved = True
             else:
-                entities_at_position = self.game_map.get_entities_at(target_x, target_y)
-                enemy_group = next((e for e in entities_at_position if isinstance(e, EnemyGroup) and e.is_alive()), None)
-                chest = next((e for e in entities_at_position if isinstance(e, Chest)), None)
-                item_pile = next((e for e in entities_at_position if isinstance(e, ItemPile)), None)
+                groups = self.game_map.get_entities_at(target_x, target_y, EnemyGroup)
+                enemy_group = next((e for e in groups if e.is_alive()), None)
 
                 if enemy_group:
                     moved = True
@@ -204,6 +254,7 @@ class PlayingState(BaseState):
                     self.party.y = target_y
                     moved = True
                     self.game_map.update_light_map()
+                    self.game_map.explore(self.party.x, self.party.y)
                 else:
                     moved = True
                     self.game_gui.add_message("That way is blocked.")
@@ -213,51 +264,18 @@ class PlayingState(BaseState):
             self.raycaster.set_party_angle(self.party.angle)
             self.turn_manager.end_player_turn()
             self.waiting_for_input = True
+            if self.turn_manager.turn_number % AUTOSAVE_INTERVAL == 0:
+                self.save_game(AUTOSAVE_FILE)
 
     def update(self, time_delta):
-        # Check for entities in front of the player
-        target_x = int(self.party.x + math.cos(self.party.angle))
-        target_y = int(self.party.y + math.sin(self.party.angle))
-        entities_in_front = self.game_map.get_entities_at(target_x, target_y)
-        
-        # Check for entities at the player's feet
-        entities_at_feet = self.game_map.get_entities_at(int(self.party.x), int(self.party.y))
-
-        interaction_entity = None
-        for entity in entities_in_front:
-            if isinstance(entity, (Chest, ItemPile)):
-                interaction_entity = entity
-                break
-        
-        if not interaction_entity:
-            for entity in entities_at_feet:
-                if isinstance(entity, (Chest, ItemPile)):
-                    interaction_entity = entity
-                    break
-
+        interaction_entity = self.turn_manager.get_context().interaction_target
         if interaction_entity:
             self.game_gui.show_interaction_buttons(interaction_entity)
         else:
             self.game_gui.hide_interaction_buttons()
 
     def handle_interaction(self, action):
-        target_x = int(self.party.x + math.cos(self.party.angle))
-        target_y = int(self.party.y + math.sin(self.party.angle))
-        entities_in_front = self.game_map.get_entities_at(target_x, target_y)
-        entities_at_feet = self.game_map.get_entities_at(int(self.party.x), int(self.party.y))
-
-        entity_to_interact = None
-        for entity in entities_in_front:
-            if isinstance(entity, (Chest, ItemPile)):
-                entity_to_interact = entity
-                break
-        
-        if not entity_to_interact:
-            for entity in entities_at_feet:
-                if isinstance(entity, (Chest, ItemPile)):
-                    entity_to_interact = entity
-                    break
-        
+        entity_to_interact = self.turn_manager.get_context().interaction_target
         if entity_to_interact:
             if isinstance(entity_to_interact, Chest):
                 if action == "Open":
@@ -288,7 +306,4 @@ class PlayingState(BaseState):
         
         self.minimap_ui.draw(surface, self.game_map, self.party)
         self.game_gui.update_message_log()
-        self.game_gui.update_compass(self.party.facing)
-        self.game_gui.draw_minimap(surface, self.game_map, self.party)
-        self.game_gui.update_party_stats(self.party)
-        pass
\ No newline at end of file
+        self.game_gui.draw_minimap(surface, self.game_map, self.party)
\ No newline at end of file
@@ -2,27 +2,88 @@
 Turn manager for handling turn-based gameplay.
 """
 
+import math
+import time
+
+import numpy as np
+
+from entities.enemy import Enemy
+from entities.enemy_group import EnemyGroup
+from entities.chest import Chest
+from entities.item_pile import ItemPile
+
+class TurnContext:
+    """What the party faces between turns, queried from the map once.
+
+    The party only moves or turns when a turn ends, so per-frame code reads
+    this instead of searching the map every frame. It stays valid until the
+    party moves, a tile changes or an entity is added to or removed from
+    the map.
+    """
+
+    def __init__(self, game_map, party, view_distance=20):
+        self.entity_version = game_map.entity_version
+        self.tile_version = game_map.tile_version
+        self.party_pose = (party.x, party.y, party.angle)
+        self.party_cell = (int(party.x), int(party.y))
+        self.front_cell = (int(party.x + math.cos(party.angle)), int(party.y + math.sin(party.angle)))
+        self.entities_in_front = game_map.get_entities_at(*self.front_cell)
+        self.entities_underfoot = game_map.get_entities_at(*self.party_cell)
+
+        # Chest or item pile in front of the party, else the one at its feet
+        self.interaction_target = next((e for e in self.entities_in_front + self.entities_underfoot
+                                        if isinstance(e, (Chest, ItemPile))), None)
+
+        # Living enemy groups ahead of the party within view_distance and not hidden by walls, nearest first
+        store = game_map.entity_store
+        rows = np.flatnonzero(store.kind_mask(EnemyGroup))
+        if game_map.visibility is not None and len(rows):
+            rows = rows[game_map.visibility.contains(self.party_cell[0], self.party_cell[1], party.facing,
+                                                     store.cell_x[rows], store.cell_y[rows])]
+        dx = store.cell_x[rows] - self.party_cell[0]
+        dy = store.cell_y[rows] - self.party_cell[1]
+        dist2 = dx * dx + dy * dy
+        ahead = (math.cos(party.angle) * dx + math.sin(party.angle) * dy > 0) & (dist2 <= view_distance ** 2)
+        rows = rows[ahead][np.argsort(dist2[ahead], kind="stable")]
+        self.visible_enemies = [group for group in store.objects_at(rows) if group.is_alive()]
+
+    def is_current(self, game_map, party):
+        """Whether nothing this context was built from has changed."""
+        return (self.entity_version == game_map.entity_version and self.tile_version == game_map.tile_version and
+                self.party_pose == (party.x, party.y, party.angle))
+
 class TurnManager:
     """Manages the turn-based gameplay flow."""
     
-    def __init__(self, game_map):
+    def __init__(self, game_map, party=None):
         self.game_map = game_map
+        self.party = party
         self.player_turn = True
         self.turn_number = 1
+        self.turn_times = []  # Seconds spent processing each enemy turn
+        self.context = None  # TurnContext for the current player turn
         
     def end_player_turn(self):
         """End the player's turn and start enemy turns."""
         self.player_turn = False
+        start = time.perf_counter()
         self.process_enemy_turns()
+        self.turn_times.append(time.perf_counter() - start)
         self.player_turn = True
         self.turn_number += 1
+        if self.party is not None:
+            self.context = TurnContext(self.game_map, self.party)
+
+    def get_context(self):
+        """Get the TurnContext for the current turn, rebuilding it if the map or party changed."""
+        if self.context is None or not self.context.is_current(self.game_map, self.party):
+            self.context = TurnContext(self.game_map, self.party)
+        return self.context
         
     def process_enemy_turns(self):
         """Process all enemy actions for the current turn."""
-        # Create a copy of the entities list to avoid modification during iteration
-        entities_copy = list(self.game_map.entities)
-        
-        for entity in entities_copy:
-            # Process turns for enemies (entities with AI)
-            if hasattr(entity, 'ai') and entity.ai and entity.is_alive():
-                entity.ai.take_turn(self.game_map)
\ No newline at end of file
+        # Enemies are the entities with AI; the query returns a new list, so
+        # turns may add or remove entities
+        for entity in self.game_map.get_entities_of_kind(Enemy):
+            if entity.is_alive():
+                entity.ai.take_turn(self.game_map)
@@ -0,0 +1,168 @@
+"""
+Potentially visible sets: the cells the first-person view can show from each cell and facing.
+"""
+
+import math
+from collections import OrderedDict
+
+import numpy as np
+
+PVS_RAYS = 128  # Rays cast across the field of view for each cell and facing
+PVS_BAKE_BATCH = 256  # Cells computed together by bake()
+
+class PotentiallyVisibleSets:
+    """Per cell and facing, a bitset of the cells that can appear in the view.
+
+    The sets are found by casting rays the way the raycaster does, from the
+    same camera position, across the same field of view and a cell beyond
+    its draw distance, stopping at solid tiles. The cells the rays pass
+    through are grown by one cell in every direction so sprites, which are
+    a cell wide, are kept when only their edge is in view. Each set covers
+    a square window around its cell and is stored as packed bits.
+
+    Sets are computed by bake() or on first use and kept in a cache of up to
+    capacity cells. When a tile changes, e.g. a door opens or closes, the
+    sets of every cell whose window holds it are dropped.
+    """
+
+    def __init__(self, game_map, fov, max_distance, transparent_tiles=(3,), capacity=16384, rays=PVS_RAYS):
+        self.game_map = game_map
+        self.fov = fov
+        self.max_distance = max_distance
+        self.transparent_tiles = tuple(transparent_tiles)
+        self.capacity = capacity
+        self.rays = rays
+        self.radius = int(math.ceil(max_distance)) + 2  # Window cells on each side of the viewing cell
+        self.size = 2 * self.radius + 1
+        self.sets = OrderedDict()  # (x, y) -> uint8 array (4, bytes per set), least recently used first
+        self.tiles = np.array(game_map.tiles, dtype=np.uint8)
+        self.tile_version = game_map.tile_version
+
+    def sync(self):
+        """Take in tile changes made since the last call and drop the sets they affect."""
+        changes = self.game_map.get_tile_changes_since(self.tile_version)
+        if not changes:
+            return
+        self.tile_version = self.game_map.tile_version
+        r = self.radius
+        for x, y in dict.fromkeys(changes):
+            self.tiles[y, x] = self.game_map.tiles[y][x]
+            if len(self.sets) < self.size * self.size:
+                stale = [cell for cell in self.sets if abs(cell[0] - x) <= r and abs(cell[1] - y) <= r]
+            else:
+                stale = [(cx, cy) for cy in range(y - r, y + r + 1) for cx in range(x - r, x + r + 1)]
+            for cell in stale:
+                self.sets.pop(cell, None)
+
+    def get_standing_cells(self):
+        """(n, 2) array of the (x, y) cells the view can be seen from: floor and see-through tiles."""
+        self.sync()
+        ys, xs = np.nonzero(np.isin(self.tiles, (0,) + self.transparent_tiles))
+        return np.column_stack((xs, ys))
+
+    def bake(self, cells=None):
+        """Compute the sets of the given (x, y) cells, or of every cell the party can stand on."""
+        self.sync()
+        if cells is None:
+            cells = self.get_standing_cells()
+        cells = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        for start in range(0, len(cells), PVS_BAKE_BATCH):
+            batch = cells[start:start + PVS_BAKE_BATCH]
+            for (x, y), packed in zip(batch.tolist(), self.compute(batch)):
+                self.store(x, y, packed)
+
+    def store(self, x, y, packed):
+        """Cache the sets of a cell, forgetting the least recently used cell when full."""
+        self.sets[(x, y)] = packed
+        self.sets.move_to_end((x, y))
+        while len(self.sets) > self.capacity:
+            self.sets.popitem(last=False)
+
+    def get(self, x, y):
+        """The packed sets of cell (x, y) for all four facings, computed if needed."""
+        self.sync()
+        packed = self.sets.get((x, y))
+        if packed is None:
+            packed = self.compute(np.array([[x, y]]))[0]
+            self.store(x, y, packed)
+        else:
+            self.sets.move_to_end((x, y))
+        return packed
+
+    def contains(self, x, y, facing, xs, ys):
+        """Boolean mask of which cells (xs, ys) are potentially visible from cell (x, y) facing facing."""
+        packed = self.get(x, y)[facing]
+        rx = np.asarray(xs, dtype=np.int64) - x + self.radius
+        ry = np.asarray(ys, dtype=np.int64) - y + self.radius
+        inside = (rx >= 0) & (rx < self.size) & (ry >= 0) & (ry < self.size)
+        bits = np.where(inside, ry * self.size + rx, 0)
+        return inside & ((packed[bits >> 3] >> (7 - (bits & 7))) & 1).astype(bool)
+
+    def compute(self, cells):
+        """Packed sets for an (n, 2) array of cells: uint8 array (n, 4, bytes per set).
+
+        Every ray of every cell and facing is stepped through the grid
+        together, one cell boundary per iteration, dropping rays as they
+        stop.
+        """
+        n, rays, r, size = len(cells), self.rays, self.radius, self.size
+        height, width = self.tiles.shape
+        facing_angles = np.arange(4) * (math.pi / 2)
+        angles = facing_angles[:, None] - self.fov / 2 + np.linspace(0.0, 1.0, rays)[None, :] * self.fov
+
+        # One lane per (cell, facing, ray); views are numbered cell * 4 + facing
+        shape = (n, 4, rays)
+        cell_x = np.broadcast_to(cells[:, 0, None, None], shape).ravel()
+        cell_y = np.broadcast_to(cells[:, 1, None, None], shape).ravel()
+        # Camera half a cell behind the centre of the cell, as in Raycaster.cast_rays
+        cam_x = (cell_x + 0.5 - 0.5 * np.broadcast_to(np.cos(facing_angles)[None, :, None], shape).ravel())
+        cam_y = (cell_y + 0.5 - 0.5 * np.broadcast_to(np.sin(facing_angles)[None, :, None], shape).ravel())
+        dir_x = np.broadcast_to(np.cos(angles)[None], shape).ravel()
+        dir_y = np.broadcast_to(np.sin(angles)[None], shape).ravel()
+        view = np.repeat(np.arange(n * 4), rays)
+
+        map_x = np.floor(cam_x).astype(np.int64)
+        map_y = np.floor(cam_y).astype(np.int64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            delta_x = np.where(dir_x != 0, np.abs(1 / dir_x), np.inf)
+            delta_y = np.where(dir_y != 0, np.abs(1 / dir_y), np.inf)
+            side_x = np.where(dir_x < 0, cam_x - map_x, map_x + 1.0 - cam_x) * delta_x
+            side_y = np.where(dir_y < 0, cam_y - map_y, map_y + 1.0 - cam_y) * delta_y
+        side_x[np.isnan(side_x)] = np.inf
+        side_y[np.isnan(side_y)] = np.inf
+        step_x = np.where(dir_x >= 0, 1, -1)
+        step_y = np.where(dir_y >= 0, 1, -1)
+        origin_x = cell_x - r
+        origin_y = cell_y - r
+
+        seen = np.zeros((n * 4, size, size), dtype=bool)
+        seen[:, r, r] = True  # The viewing cell
+        seen[view, map_y - origin_y, map_x - origin_x] = True  # The camera's cell
+        max_dist = self.max_distance + 1  # Sprites are culled from the party, half a cell ahead of the camera
+        see_through = np.zeros(256, dtype=bool)
+        see_through[[0, *self.transparent_tiles]] = True
+
+        while len(view):
+            x_side = side_x < side_y
+            dist = np.where(x_side, side_x, side_y)
+            map_x = map_x + np.where(x_side, step_x, 0)
+            map_y = map_y + np.where(x_side, 0, step_y)
+            side_x = np.where(x_side, side_x + delta_x, side_x)
+            side_y = np.where(x_side, side_y, side_y + delta_y)
+
+            going = (dist <= max_dist) & (map_x >= 0) & (map_x < width) & (map_y >= 0) & (map_y < height)
+            going[going] = see_through[self.tiles[map_y[going], map_x[going]]]
+            seen[view[going], (map_y - origin_y)[going], (map_x - origin_x)[going]] = True
+
+            view, map_x, map_y, side_x, side_y = view[going], map_x[going], map_y[going], side_x[going], side_y[going]
+            delta_x, delta_y, step_x, step_y = delta_x[going], delta_y[going], step_x[going], step_y[going]
+            origin_x, origin_y = origin_x[going], origin_y[going]
+
+        # Grow by one cell in every direction
+        grown = seen.copy()
+        grown[:, :, 1:] |= seen[:, :, :-1]
+        grown[:, :, :-1] |= seen[:, :, 1:]
+        rows = grown.copy()
+        grown[:, 1:] |= rows[:, :-1]
+        grown[:, :-1] |= rows[:, 1:]
+        return np.packbits(grown.reshape(n * 4, -1), axis=1).reshape(n, 4, -1)
@@ -4,7 +4,7 @@ Main entry point for the Crawler game.
 """
 
 import argparse
-from game.game import Game
+from game.startup_report import StartupReport
 
 def main():
     """
@@ -12,10 +12,25 @@ def main():
     """
     parser = argparse.ArgumentParser(description="Crawler - First-Person Dungeon Crawler")
     parser.add_argument("--fps", action="store_true", help="Show FPS counter")
+    parser.add_argument("--record", metavar="FILE", help="Record the seed and input events to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="Replay a recorded session from FILE")
+    parser.add_argument("--fast", action="store_true", help="Replay as fast as possible without frame limiting")
+    parser.add_argument("--seed", type=int, help="Random seed to use when recording")
+    parser.add_argument("--load", metavar="FILE", help="Resume a save game from FILE")
+    parser.add_argument("--level", metavar="FILE", help="Start a new game on the level in FILE")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print how long imports and each startup phase took")
     args = parser.parse_args()
 
-    game = Game(show_fps=args.fps)
+    startup_report = StartupReport(enabled=args.startup_report)
+    # Imported here so the report can time pygame, pygame_gui and the game modules
+    with startup_report.phase("imports"):
+        from game.game import Game
+
+    game = Game(show_fps=args.fps, record_path=args.record, replay_path=args.replay,
+                replay_fast=args.fast, seed=args.seed, startup_report=startup_report,
+                load_path=args.load, level_path=args.level)
     game.run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
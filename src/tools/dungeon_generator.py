@@ -0,0 +1,248 @@
+"""
+Seeded procedural levels (BSP rooms, cellular caves and mazes) for scale testing.
+
+Run from the project root: python src/tools/dungeon_generator.py --kind bsp --size 2048 --output-dir fixtures
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+
+# Add src to path to import game modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tools.grid_ops import label_regions, neighbour_counts
+
+FLOOR, WALL, DOOR = 0, 1, 2
+KINDS = ("bsp", "caves", "maze")
+
+# Enemies and items placed on generated levels, based on those in level_1.json
+ENEMY_TYPES = [
+    {"name": "Goblin", "hp": 30, "attack": 8, "defense": 2, "sprite": "goblin", "morale": 80},
+    {"name": "Slime", "hp": 25, "attack": 3, "defense": 1, "sprite": "slime", "morale": 50},
+]
+ITEM_TYPES = [
+    {"type": "potion", "name": "Health Potion", "description": "Heals 20 HP.", "heal_amount": 20},
+    {"type": "potion", "name": "Minor Health Potion", "description": "Heals 10 HP.", "heal_amount": 10},
+    {"type": "weapon", "name": "Rusty Sword", "description": "A basic sword.", "attack_bonus": 2},
+]
+MAX_GROUP_SIZE = 3
+MAX_CONTAINER_ITEMS = 3
+CHEST_CHANCE = 0.5  # The rest of the containers are item piles
+TRAPPED_CHANCE = 0.1
+LOCKED_CHANCE = 0.1
+
+def generate_bsp(rng, width, height, min_leaf=8, max_leaf=24, min_room=4, door_chance=0.5):
+    """Rooms in the leaves of a binary space partition, joined by corridors along the tree.
+
+    The tree is walked in Python but every room and corridor is carved as
+    a slice; doors are then found for the whole map at once where a
+    corridor enters a room between two walls.
+    """
+    max_leaf = max(max_leaf, 2 * min_leaf)
+    min_leaf = max(min_leaf, min_room + 2)
+    rooms = np.zeros((height, width), dtype=bool)
+    corridors = np.zeros((height, width), dtype=bool)
+
+    def split(x, y, w, h):
+        """Carve the rooms of a partition and return a cell inside one of them."""
+        if w > max_leaf or h > max_leaf:
+            vertical = w > h if max(w, h) >= 1.25 * min(w, h) else rng.random() < 0.5
+            if (w if vertical else h) < 2 * min_leaf:
+                vertical = not vertical
+            size = w if vertical else h
+            if size >= 2 * min_leaf:
+                at = min_leaf + int(rng.random() * (size - 2 * min_leaf + 1))
+                if vertical:
+                    a, b = split(x, y, at, h), split(x + at, y, w - at, h)
+                else:
+                    a, b = split(x, y, w, at), split(x, y + at, w, h - at)
+                # An L-shaped corridor turning either way
+                if rng.random() < 0.5:
+                    a, b = b, a
+                corridors[a[1], min(a[0], b[0]):max(a[0], b[0]) + 1] = True
+                corridors[min(a[1], b[1]):max(a[1], b[1]) + 1, b[0]] = True
+                return a if rng.random() < 0.5 else b
+
+        # A leaf: one room, leaving at least one wall to the leaf's edges
+        room_w = min(w - 2, min_room + int(rng.random() * (w - 2 - min_room + 1)))
+        room_h = min(h - 2, min_room + int(rng.random() * (h - 2 - min_room + 1)))
+        room_x = x + 1 + int(rng.random() * (w - 2 - room_w + 1))
+        room_y = y + 1 + int(rng.random() * (h - 2 - room_h + 1))
+        rooms[room_y:room_y + room_h, room_x:room_x + room_w] = True
+        return room_x + room_w // 2, room_y + room_h // 2
+
+    split(0, 0, width, height)
+    tiles = np.full((height, width), WALL, dtype=np.uint8)
+    tiles[rooms | corridors] = FLOOR
+
+    # Door candidates: corridor cells next to a room with floor on two opposite sides and walls on the others
+    floor = np.pad(tiles == FLOOR, 1, constant_values=False)
+    up, down, left, right = floor[:-2, 1:-1], floor[2:, 1:-1], floor[1:-1, :-2], floor[1:-1, 2:]
+    across = (left & right & ~up & ~down) | (up & down & ~left & ~right)
+    candidates = np.flatnonzero(corridors & ~rooms & across & (neighbour_counts(rooms) > 0))
+    doors = np.zeros((height, width), dtype=bool)
+    doors.flat[candidates[rng.random(len(candidates)) < door_chance]] = True
+    # A corridor one or two cells long can have a candidate at both ends; keep only one of a touching pair
+    doors[1:] &= ~doors[:-1]
+    doors[:, 1:] &= ~doors[:, :-1]
+    tiles[doors] = DOOR
+    return tiles
+
+def generate_caves(rng, width, height, fill=0.45, steps=5):
+    """Cellular automaton caves, reduced to their largest connected region.
+
+    Random walls are smoothed so that a cell becomes wall when at least 5
+    of the 9 cells around and including it are; cells beyond the edge count
+    as wall.
+    """
+    walls = rng.random((height, width)) < fill
+    for _ in range(steps):
+        walls = neighbour_counts(walls, diagonal=True, outside=True) + walls >= 5
+    walls[[0, -1], :] = True
+    walls[:, [0, -1]] = True
+
+    tiles = walls.astype(np.uint8)
+    labels = label_regions(tiles, FLOOR)
+    floor_labels = labels[~walls]
+    if len(floor_labels):
+        values, counts = np.unique(floor_labels, return_counts=True)
+        tiles[labels != values[np.argmax(counts)]] = WALL
+    return tiles
+
+def generate_maze(rng, width, height, loops=0.05):
+    """A sidewinder maze on odd cells with a fraction of extra openings for loops.
+
+    Each row is cut into runs of cells joined eastward, and every run below
+    the top row opens north from one random cell; all rows are decided at
+    once. loops is the chance of removing each remaining inner wall between
+    two cells.
+    """
+    tiles = np.full((height, width), WALL, dtype=np.uint8)
+    cells_w, cells_h = (width - 1) // 2, (height - 1) // 2
+    if cells_w < 1 or cells_h < 1:
+        return tiles
+    tiles[1:2 * cells_h:2, 1:2 * cells_w:2] = FLOOR
+
+    # Open east unless the run closes here; the top row is one long run
+    east = rng.random((cells_h, cells_w)) < 0.5
+    east[0] = True
+    east[:, -1] = False
+    tiles[1:2 * cells_h:2, 2:2 * cells_w:2] = np.where(east[:, :-1], FLOOR, WALL)
+
+    # Runs end where a cell does not open east; pick one random cell of every run to open north
+    ends = ~east[1:].ravel()
+    run_ids = np.cumsum(ends) - ends
+    order = np.lexsort((rng.random(len(run_ids)), run_ids))
+    last_of_run = np.flatnonzero(np.diff(run_ids[order], append=-1) != 0)
+    chosen = order[last_of_run]
+    rows, cols = chosen // cells_w + 1, chosen % cells_w
+    tiles[2 * rows, 2 * cols + 1] = FLOOR
+
+    if loops > 0:
+        # Inner walls between two cells sit at exactly one odd coordinate
+        ys, xs = np.arange(height)[:, None], np.arange(width)[None, :]
+        between = (((ys % 2 == 1) & (xs % 2 == 0)) | ((ys % 2 == 0) & (xs % 2 == 1)))
+        between &= (ys > 0) & (xs > 0) & (ys < 2 * cells_h) & (xs < 2 * cells_w)
+        walls = np.flatnonzero(between & (tiles == WALL))
+        tiles.flat[walls[rng.random(len(walls)) < loops]] = FLOOR
+    return tiles
+
+def populate(rng, tiles, enemy_density=2.0, item_density=1.0):
+    """Place the player start, enemy groups and containers on distinct floor cells.
+
+    Densities are per 1000 floor cells. Returns the player start, enemy
+    group data and entity data.
+    """
+    width = tiles.shape[1]
+    floor = np.flatnonzero(tiles.ravel() == FLOOR)
+    if not len(floor):
+        raise ValueError("level has no floor")
+    group_count = int(len(floor) * enemy_density / 1000)
+    container_count = int(len(floor) * item_density / 1000)
+    total = min(len(floor), 1 + group_count + container_count)
+    cells = rng.choice(floor, size=total, replace=False)
+    xs, ys = (cells % width).tolist(), (cells // width).tolist()
+
+    player = {"x": xs[0], "y": ys[0]}
+
+    group_cells = range(1, min(total, 1 + group_count))
+    sizes = rng.integers(1, MAX_GROUP_SIZE + 1, size=len(group_cells)).tolist()
+    kinds = rng.integers(0, len(ENEMY_TYPES), size=len(group_cells)).tolist()
+    enemy_groups = [{"x": xs[i], "y": ys[i], "enemies": [dict(ENEMY_TYPES[kind]) for _ in range(size)]}
+                    for i, size, kind in zip(group_cells, sizes, kinds)]
+
+    container_cells = range(1 + len(group_cells), total)
+    n = len(container_cells)
+    is_chest = (rng.random(n) < CHEST_CHANCE).tolist()
+    trapped = (rng.random(n) < TRAPPED_CHANCE).tolist()
+    locked = (rng.random(n) < LOCKED_CHANCE).tolist()
+    item_counts = rng.integers(1, MAX_CONTAINER_ITEMS + 1, size=n)
+    item_kinds = rng.integers(0, len(ITEM_TYPES), size=int(item_counts.sum())).tolist()
+    item_starts = np.concatenate(([0], np.cumsum(item_counts))).tolist()
+    entities = []
+    for j, i in enumerate(container_cells):
+        entity = {"type": "chest" if is_chest[j] else "item_pile", "x": xs[i], "y": ys[i],
+                  "items": [dict(ITEM_TYPES[kind]) for kind in item_kinds[item_starts[j]:item_starts[j + 1]]]}
+        if is_chest[j]:
+            entity["trapped"] = trapped[j]
+            entity["locked"] = locked[j]
+        entities.append(entity)
+    return player, enemy_groups, entities
+
+def generate_level(kind, width, height, seed, enemy_density=2.0, item_density=1.0):
+    """Generate a level of the given kind as data in the level file format."""
+    rng = np.random.default_rng(seed)
+    if kind == "bsp":
+        tiles = generate_bsp(rng, width, height)
+    elif kind == "caves":
+        tiles = generate_caves(rng, width, height)
+    elif kind == "maze":
+        tiles = generate_maze(rng, width, height)
+    else:
+        raise ValueError(f"unknown level kind: {kind}")
+    player, enemy_groups, entities = populate(rng, tiles, enemy_density, item_density)
+    return {"map": tiles.tolist(), "player": player, "enemy_groups": enemy_groups, "entities": entities}
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded levels for scale testing")
+    parser.add_argument("--kind", choices=KINDS + ("all",), default="all", help="Kind of level to generate")
+    parser.add_argument("--size", type=int, default=256, help="Width and height of the map in cells")
+    parser.add_argument("--width", type=int, help="Map width, overriding --size")
+    parser.add_argument("--height", type=int, help="Map height, overriding --size")
+    parser.add_argument("--seed", type=int, default=1, help="Seed of the first level")
+    parser.add_argument("--count", type=int, default=1, help="Levels of each kind, seeded seed, seed + 1, ...")
+    parser.add_argument("--enemy-density", type=float, default=2.0, help="Enemy groups per 1000 floor cells")
+    parser.add_argument("--item-density", type=float, default=1.0, help="Chests and item piles per 1000 floor cells")
+    parser.add_argument("--output-dir", default="data/maps/generated", help="Directory to write the levels to")
+    args = parser.parse_args()
+
+    width = args.width or args.size
+    height = args.height or args.size
+    if width < 3 or height < 3:
+        parser.error("maps must be at least 3x3")
+    os.makedirs(args.output_dir, exist_ok=True)
+    for kind in (KINDS if args.kind == "all" else (args.kind,)):
+        for seed in range(args.seed, args.seed + args.count):
+            start = time.perf_counter()
+            try:
+                data = generate_level(kind, width, height, seed, args.enemy_density, args.item_density)
+            except ValueError as e:
+                print(f"Failed to generate {kind} level with seed {seed}: {e}")
+                continue
+            generated = time.perf_counter()
+            path = os.path.join(args.output_dir, f"{kind}_{width}x{height}_{seed}.json")
+            # dumps encodes in one pass in C; dump would stream through the pure Python encoder
+            text = json.dumps(data, separators=(",", ":"))
+            with open(path, "w") as f:
+                f.write(text)
+            written = time.perf_counter()
+            print(f"{path}: {len(data['enemy_groups'])} enemy groups, {len(data['entities'])} entities, "
+                  f"generated in {(generated - start) * 1000:.0f} ms, written in {(written - generated) * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Undo and redo for the map editor, stored as compact diffs.
+"""
+
+from collections import deque
+
+import numpy as np
+
+# Rough bytes charged for each entity or enemy group change kept in the history
+MARKER_CHANGE_SIZE = 256
+
+class EditStroke:
+    """The changes made by one mouse stroke or bulk tool.
+
+    While the stroke is open every write records the values it replaces;
+    finish() reduces that to the changed flat tile indices with their old
+    and new values, and the old and new value of each changed marker cell.
+    """
+
+    def __init__(self):
+        self.tile_writes = []  # (flat indices, old values) in the order they were written
+        self.old_markers = {}  # (layer, cell) -> marker before the stroke, None if empty
+        self.old_player = None  # Player start before the stroke, if it was moved
+
+        self.indices = None
+        self.old_tiles = None
+        self.new_tiles = None
+        self.new_markers = {}
+        self.new_player = None
+
+    def record_tiles(self, tiles, indices):
+        """Remember the current values of tiles about to be overwritten."""
+        self.tile_writes.append((indices, tiles.flat[indices]))
+
+    def record_marker(self, layer, cell, marker):
+        """Remember a marker cell's value before its first change in this stroke."""
+        self.old_markers.setdefault((layer, cell), marker)
+
+    def record_player(self, player_pos):
+        """Remember the player start before its first move in this stroke."""
+        if self.old_player is None:
+            self.old_player = dict(player_pos)
+
+    def finish(self, tiles, layers, player_pos):
+        """Reduce the recorded writes to a diff. Returns False if nothing changed."""
+        if self.tile_writes:
+            indices = np.concatenate([write[0] for write in self.tile_writes])
+            old = np.concatenate([write[1] for write in self.tile_writes])
+            # np.unique returns the first occurrence, which holds the value before the stroke
+            indices, first = np.unique(indices, return_index=True)
+            old = old[first]
+            new = tiles.flat[indices]
+            changed = old != new
+            self.indices = indices[changed].astype(np.int32)
+            self.old_tiles = old[changed]
+            self.new_tiles = new[changed]
+        else:
+            self.indices = np.zeros(0, dtype=np.int32)
+            self.old_tiles = self.new_tiles = np.zeros(0, dtype=tiles.dtype)
+        self.tile_writes = []
+
+        for (layer, cell), old in list(self.old_markers.items()):
+            new = layers[layer].get(cell)
+            if new is old:
+                del self.old_markers[(layer, cell)]
+            else:
+                self.new_markers[(layer, cell)] = new
+
+        if self.old_player == player_pos:
+            self.old_player = None
+        elif self.old_player is not None:
+            self.new_player = dict(player_pos)
+
+        return bool(len(self.indices) or self.old_markers or self.old_player)
+
+    def get_size(self):
+        """Approximate bytes held by the finished diff."""
+        return (self.indices.nbytes + self.old_tiles.nbytes + self.new_tiles.nbytes +
+                MARKER_CHANGE_SIZE * (len(self.old_markers) + (self.old_player is not None)))
+
+class EditHistory:
+    """Undo and redo stacks of finished strokes within a byte budget.
+
+    The oldest strokes are forgotten once the undo stack goes over
+    budget_bytes, always keeping the newest one.
+    """
+
+    def __init__(self, budget_bytes):
+        self.budget_bytes = budget_bytes
+        self.undo_stack = deque()  # (stroke, size), oldest first
+        self.redo_stack = []
+        self.total_bytes = 0
+
+    def push(self, stroke):
+        """Add a finished stroke; any undone strokes can no longer be redone."""
+        size = stroke.get_size()
+        self.undo_stack.append((stroke, size))
+        self.total_bytes += size
+        self.redo_stack.clear()
+        while self.total_bytes > self.budget_bytes and len(self.undo_stack) > 1:
+            self.total_bytes -= self.undo_stack.popleft()[1]
+
+    def pop_undo(self):
+        """Take the newest stroke to undo, or None."""
+        if not self.undo_stack:
+            return None
+        stroke, size = self.undo_stack.pop()
+        self.total_bytes -= size
+        self.redo_stack.append((stroke, size))
+        return stroke
+
+    def pop_redo(self):
+        """Take the most recently undone stroke to redo, or None."""
+        if not self.redo_stack:
+            return None
+        stroke, size = self.redo_stack.pop()
+        self.undo_stack.append((stroke, size))
+        self.total_bytes += size
+        return stroke
+
+    def clear(self):
+        """Forget all strokes, e.g. when the map is replaced or resized."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.total_bytes = 0
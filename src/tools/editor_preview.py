@@ -0,0 +1,104 @@
+"""
+First-person preview of the map being edited, drawn with the game's raycaster.
+"""
+
+import math
+import time
+
+import pygame
+
+from game.game_map import GameMap
+from game.party import Party
+from engine.raycaster import Raycaster
+
+PREVIEW_RESOLUTION = (160, 120)  # Pixels the raycaster renders
+PREVIEW_SCALE = 2  # Each rendered pixel is shown as a square this large
+PREVIEW_TIME_SHARE = 0.25  # Largest fraction of the editor's time spent rendering the preview
+
+class RaycastPreview:
+    """Renders the view from a camera on the edited map at reduced resolution.
+
+    The raycaster only draws walls within its max_distance, so each render
+    builds a small GameMap covering that window around the camera. The view
+    is only re-rendered when the camera moves or a tile inside the window
+    changes, and renders are spaced out so they take at most
+    PREVIEW_TIME_SHARE of the time.
+    """
+
+    def __init__(self, texture_manager, resolution=PREVIEW_RESOLUTION, scale=PREVIEW_SCALE):
+        self.texture_manager = texture_manager
+        self.render_surface = pygame.Surface(resolution)
+        self.image = pygame.Surface((resolution[0] * scale, resolution[1] * scale))
+        self.image.fill((0, 0, 0))
+        self.visible = True
+        self.camera_x = 1
+        self.camera_y = 1
+        self.facing = 1  # 0=north, 1=east, 2=south, 3=west, as for the party
+        self.radius = 21  # Cells around the camera the raycaster can see: its max_distance plus one
+        self.dirty = True
+        self.next_render = 0.0
+        self.last_render_ms = 0.0
+
+    def get_window(self, map_width, map_height):
+        """Map cells (x0, y0, x1, y1) the current camera can see."""
+        return (max(0, self.camera_x - self.radius), max(0, self.camera_y - self.radius),
+                min(map_width, self.camera_x + self.radius + 1), min(map_height, self.camera_y + self.radius + 1))
+
+    def set_camera(self, x, y):
+        """Move the camera to a map cell."""
+        if (x, y) != (self.camera_x, self.camera_y):
+            self.camera_x, self.camera_y = x, y
+            self.dirty = True
+
+    def turn(self, direction):
+        """Turn the camera 90 degrees clockwise (1) or counter-clockwise (-1)."""
+        self.facing = (self.facing + direction) % 4
+        self.dirty = True
+
+    def toggle_visibility(self):
+        """Show or hide the preview."""
+        self.visible = not self.visible
+        self.dirty = True
+
+    def tiles_changed(self, indices, map_width, map_height):
+        """Note edited flat tile indices; only edits the camera can see need a new render."""
+        if self.dirty or not len(indices):
+            return
+        x0, y0, x1, y1 = self.get_window(map_width, map_height)
+        xs, ys = indices % map_width, indices // map_width
+        if ((xs >= x0) & (xs < x1) & (ys >= y0) & (ys < y1)).any():
+            self.dirty = True
+
+    def update(self, tiles):
+        """Re-render if something visible changed and the time budget allows. Returns True if it did."""
+        if not self.visible or not self.dirty:
+            return False
+        now = time.perf_counter()
+        if now < self.next_render:
+            return False
+        self.render(tiles)
+        elapsed = time.perf_counter() - now
+        self.last_render_ms = elapsed * 1000
+        self.next_render = now + elapsed / PREVIEW_TIME_SHARE
+        self.dirty = False
+        return True
+
+    def render(self, tiles):
+        """Raycast the window of tiles around the camera into image."""
+        map_height, map_width = tiles.shape
+        self.camera_x = max(0, min(map_width - 1, self.camera_x))
+        self.camera_y = max(0, min(map_height - 1, self.camera_y))
+        x0, y0, x1, y1 = self.get_window(map_width, map_height)
+
+        game_map = GameMap(x1 - x0, y1 - y0)
+        game_map.tiles = tiles[y0:y1, x0:x1].tolist()
+        party = Party(self.camera_x - x0, self.camera_y - y0)  # Carries the party's light
+        game_map.add_entity(party)
+        game_map.update_light_map()
+
+        width, height = self.render_surface.get_size()
+        raycaster = Raycaster(width, height, game_map, self.texture_manager)
+        raycaster.set_party_position(party.x, party.y)
+        raycaster.set_party_angle(self.facing * (math.pi / 2))
+        raycaster.cast_rays(self.render_surface)
+        pygame.transform.scale(self.render_surface, self.image.get_size(), self.image)
@@ -0,0 +1,57 @@
+"""
+Vectorized operations on 2D tile grids shared by the level tools.
+"""
+
+import numpy as np
+
+def label_regions(tiles, value=None):
+    """Label every cell so that cells share a label exactly when they are in the same 4-connected region of equal tiles.
+
+    Horizontal runs of equal tiles are numbered and runs that touch
+    vertically are joined with a vectorized union-find. When value is given
+    only regions of that tile are joined; other cells are labelled by their
+    horizontal run alone.
+    """
+    starts = np.ones(tiles.shape, dtype=bool)
+    starts[:, 1:] = tiles[:, 1:] != tiles[:, :-1]
+    run_ids = np.cumsum(starts.ravel()).reshape(tiles.shape) - 1
+
+    # One edge per pair of touching runs is enough: their overlap starts where one of them starts
+    touching = (tiles[1:] == tiles[:-1]) & (starts[1:] | starts[:-1])
+    if value is not None:
+        touching &= tiles[1:] == value
+    upper = run_ids[:-1][touching]
+    lower = run_ids[1:][touching]
+
+    parent = np.arange(run_ids[-1, -1] + 1)
+    while True:
+        root_upper, root_lower = parent[upper], parent[lower]
+        apart = root_upper != root_lower
+        if not apart.any():
+            break
+        # Hook the larger root of every unjoined edge under the smaller one
+        np.minimum.at(parent, np.maximum(root_upper, root_lower)[apart], np.minimum(root_upper, root_lower)[apart])
+        # Then point every run straight at its root
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
+    return parent[run_ids]
+
+def flood_fill_indices(tiles, x, y):
+    """Flat indices of the 4-connected region of cells equal to tiles[y, x]."""
+    labels = label_regions(tiles, tiles[y, x])
+    return np.flatnonzero(labels == labels[y, x])
+
+def neighbour_counts(mask, diagonal=False, outside=False):
+    """Number of neighbours of every cell that are set in a boolean mask.
+
+    Counts the 4 orthogonal neighbours, or all 8 with diagonal. Cells
+    beyond the edge count as outside.
+    """
+    padded = np.pad(mask, 1, constant_values=outside).astype(np.uint8)
+    counts = padded[:-2, 1:-1] + padded[2:, 1:-1] + padded[1:-1, :-2] + padded[1:-1, 2:]
+    if diagonal:
+        counts += padded[:-2, :-2] + padded[:-2, 2:] + padded[2:, :-2] + padded[2:, 2:]
+    return counts
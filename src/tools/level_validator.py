@@ -0,0 +1,204 @@
+"""
+Validates level files without starting the game and reports the results as JSON.
+
+Run from the project root: python src/tools/level_validator.py data/maps
+"""
+
+import os
+import sys
+import json
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Add src to path to import game modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from game.game_map import GameMap
+from game.party import Party
+from tools.grid_ops import flood_fill_indices, neighbour_counts
+
+WALKABLE_TILES = (0, 3)  # Floor and open door, as in GameMap.is_walkable
+PASSABLE_TILES = (0, 2, 3)  # Closed doors can be opened, so they do not cut off a region
+DOOR_TILES = (2, 3)
+
+def find_level_files(paths):
+    """Expand files and directories (searched recursively for .json files) into sorted level paths."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in names if name.endswith(".json"))
+        else:
+            files.append(path)
+    return sorted(files)
+
+def is_coordinate(value):
+    """Whether value can be used as a map coordinate: an int, but not a bool."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+def check_placements(kind, placements, tiles, walkable, reachable, errors):
+    """Report placements without integer coordinates, out of bounds, on tiles that cannot be walked on, or out of reach.
+
+    Placements are named by their "type" if they have one, else by kind.
+    Reachability is not checked when reachable is None.
+    """
+    height, width = tiles.shape
+    placed = []
+    for placement in placements:
+        x, y = placement.get("x"), placement.get("y")
+        if is_coordinate(x) and is_coordinate(y):
+            placed.append(placement)
+        else:
+            name = str(placement.get("type", kind)).replace("_", " ")
+            errors.append(f"{name} at ({x!r}, {y!r}) does not have integer coordinates")
+    placements = placed
+    xs = np.array([p["x"] for p in placements], dtype=np.int64)
+    ys = np.array([p["y"] for p in placements], dtype=np.int64)
+    inside = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+    cx, cy = np.where(inside, xs, 0), np.where(inside, ys, 0)
+    on_walkable = inside & walkable[cy, cx]
+    is_reachable = inside & (reachable[cy, cx] if reachable is not None else True)
+    for placement, x, y, ok_inside, ok_walkable, ok_reachable in zip(placements, xs.tolist(), ys.tolist(), inside.tolist(),
+                                                                     on_walkable.tolist(), is_reachable.tolist()):
+        name = str(placement.get("type", kind)).replace("_", " ")
+        if not ok_inside:
+            errors.append(f"{name} at ({x}, {y}) is outside the map")
+        elif not ok_walkable:
+            errors.append(f"{name} at ({x}, {y}) is on tile {int(tiles[y, x])}, which cannot be walked on")
+        elif not ok_reachable:
+            errors.append(f"{name} at ({x}, {y}) cannot be reached from the player start")
+
+def get_light_stats(tiles, player_x, player_y, reachable):
+    """Light the level the way the game does at the player start and summarize it over the cells in reachable."""
+    height, width = tiles.shape
+    game_map = GameMap(width, height)
+    game_map.tiles = tiles.tolist()
+    game_map.add_entity(Party(player_x, player_y))
+    game_map.update_light_map()
+    light = np.array(game_map.light_map, dtype=np.float32)[reachable]
+    lit = light > game_map.ambient_light
+    return {
+        "ambient": game_map.ambient_light,
+        "lit_cells_at_start": int(np.count_nonzero(lit)),
+        "lit_fraction_at_start": round(float(np.count_nonzero(lit)) / max(1, light.size), 4),
+        "mean_light_at_start": round(float(light.mean()), 4) if light.size else 0.0,
+    }
+
+def validate_level(path):
+    """Load one level file and check it. Returns a JSON-ready report.
+
+    Anything check_level did not expect is recorded as an error of this
+    level, so one broken file cannot stop a whole run.
+    """
+    report = {"path": path, "errors": [], "warnings": [], "stats": {}}
+    try:
+        check_level(path, report)
+    except Exception as e:
+        report["errors"].append(f"cannot validate level: {e}")
+    return report
+
+def check_level(path, report):
+    """Load one level file and add its errors, warnings and stats to report."""
+    errors, warnings = report["errors"], report["warnings"]
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        rows = data["map"]
+        if not rows or any(len(row) != len(rows[0]) for row in rows):
+            raise ValueError("map rows are empty or of different lengths")
+        tiles = np.array(rows, dtype=np.int64)
+        player_x, player_y = data["player"]["x"], data["player"]["y"]
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        errors.append(f"cannot load level: {e}")
+        return
+
+    height, width = tiles.shape
+    walkable = np.isin(tiles, WALKABLE_TILES)
+    passable = np.isin(tiles, PASSABLE_TILES)
+
+    # Reachability: the region of passable cells connected to the player start. It includes the
+    # closed doors on the way, so stats count only its walkable cells.
+    reachable = None
+    if not (is_coordinate(player_x) and is_coordinate(player_y)):
+        errors.append(f"player start ({player_x!r}, {player_y!r}) does not have integer coordinates")
+    elif not (0 <= player_x < width and 0 <= player_y < height):
+        errors.append(f"player start ({player_x}, {player_y}) is outside the map")
+    elif not walkable[player_y, player_x]:
+        errors.append(f"player start ({player_x}, {player_y}) is on tile {int(tiles[player_y, player_x])}, which cannot be walked on")
+    else:
+        reachable = np.zeros(tiles.shape, dtype=bool)
+        reachable.flat[flood_fill_indices(passable.view(np.uint8), player_x, player_y)] = True
+
+    enemy_groups = data.get("enemy_groups", [])
+    entities = data.get("entities", [])
+    check_placements("enemy group", enemy_groups, tiles, walkable, reachable, errors)
+    check_placements("entity", entities, tiles, walkable, reachable, errors)
+    for group in enemy_groups:
+        if not group.get("enemies"):
+            warnings.append(f"enemy group at ({group.get('x')}, {group.get('y')}) has no enemies")
+    placed = Counter((p.get("x"), p.get("y")) for p in enemy_groups + entities)
+    for (x, y), count in placed.items():
+        if count > 1:
+            warnings.append(f"{count} enemy groups or entities share ({x}, {y}); only one can be interacted with")
+
+    # Doors must join passable cells on two opposite sides
+    padded = np.pad(passable, 1, constant_values=False)
+    across = ((padded[1:-1, :-2] & padded[1:-1, 2:]) | (padded[:-2, 1:-1] & padded[2:, 1:-1]))
+    for y, x in np.argwhere(np.isin(tiles, DOOR_TILES) & ~across).tolist():
+        warnings.append(f"door at ({x}, {y}) does not lead anywhere")
+
+    if reachable is not None and (walkable & ~reachable).any():
+        warnings.append(f"{int(np.count_nonzero(walkable & ~reachable))} walkable cells cannot be reached from the player start")
+
+    # Dead ends: walkable cells with a single passable neighbour
+    dead_ends = walkable & (neighbour_counts(passable) == 1)
+    report["stats"] = {
+        "width": width,
+        "height": height,
+        "walkable_cells": int(np.count_nonzero(walkable)),
+        "reachable_cells": int(np.count_nonzero(reachable & walkable)) if reachable is not None else 0,
+        "doors": int(np.count_nonzero(np.isin(tiles, DOOR_TILES))),
+        "dead_ends": int(np.count_nonzero(dead_ends)),
+        "enemy_groups": len(enemy_groups),
+        "entities": len(entities),
+    }
+    if reachable is not None:
+        report["stats"]["light"] = get_light_stats(tiles, player_x, player_y, reachable & walkable)
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate level files and report the results as JSON")
+    parser.add_argument("paths", nargs="+", help="Level files or directories to search for .json levels")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--output", help="Write the report to this file instead of stdout")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation")
+    args = parser.parse_args()
+
+    files = find_level_files(args.paths)
+    if args.workers == 1 or len(files) < 2:
+        levels = [validate_level(path) for path in files]
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            levels = list(executor.map(validate_level, files))
+
+    report = {
+        "levels": levels,
+        "summary": {
+            "levels": len(levels),
+            "failed": sum(1 for level in levels if level["errors"]),
+            "errors": sum(len(level["errors"]) for level in levels),
+            "warnings": sum(len(level["warnings"]) for level in levels),
+        },
+    }
+    text = json.dumps(report, indent=args.indent)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(1 if report["summary"]["failed"] else 0)
+
+if __name__ == "__main__":
+    main()
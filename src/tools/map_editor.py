@@ -3,6 +3,7 @@ import sys
 import json
 import pygame
 import pygame_gui
+import numpy as np
 from pygame import Rect
 
 # Add src to path to import game modules
@@ -10,12 +11,35 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from engine.texture_manager import TextureManager
+from tools.editor_history import EditStroke, EditHistory
+from tools.editor_preview import RaycastPreview
+from tools.grid_ops import flood_fill_indices
 
 # Editor Constants
 EDITOR_WIDTH = 1000
 EDITOR_HEIGHT = 800
 SIDEBAR_WIDTH = 200
-GRID_SIZE = 40  # Visual size of a tile in the editor
+GRID_SIZE = 40  # Visual size of a tile in the editor at the default zoom
+ZOOM_LEVELS = (4, 8, 12, 20, 28, 40, 56, 80)  # Tile sizes the editor can zoom between
+GRID_MIN_SIZE = 8  # Grid lines are only drawn when tiles are at least this large
+BACKGROUND_COLOR = (50, 50, 50)
+TILE_TOOLS = {"wall": 1, "floor": 0, "door": 2}  # Tools that paint a single tile id
+SHAPE_TOOLS = ("rect", "line")  # Tools applied from the press to the release cell
+HISTORY_BUDGET = 16 * 1024 * 1024  # Bytes of undo history to keep
+DIRTY_CELL_LIMIT = 4096  # Edits touching more visible cells than this redraw the whole view
+
+def rect_indices(x0, y0, x1, y1, width):
+    """Flat indices of the filled rectangle with corners (x0, y0) and (x1, y1)."""
+    xs = np.arange(min(x0, x1), max(x0, x1) + 1)
+    ys = np.arange(min(y0, y1), max(y0, y1) + 1)
+    return (ys[:, None] * width + xs[None, :]).ravel()
+
+def line_indices(x0, y0, x1, y1, width):
+    """Flat indices of the cells on a straight line from (x0, y0) to (x1, y1)."""
+    steps = max(abs(x1 - x0), abs(y1 - y0)) + 1
+    xs = np.rint(np.linspace(x0, x1, steps)).astype(np.int64)
+    ys = np.rint(np.linspace(y0, y1, steps)).astype(np.int64)
+    return ys * width + xs
 
 class MapEditor:
     def __init__(self):
@@ -30,13 +54,37 @@ class MapEditor:
         
         self.map_width = 12
         self.map_height = 12
-        self.map_data = [[0 for _ in range(self.map_width)] for _ in range(self.map_height)]
+        self.tiles = np.zeros((self.map_height, self.map_width), dtype=np.uint8)
         self.player_pos = {"x": 1, "y": 1}
-        self.enemy_groups = []
-        self.entities = []
+        self.enemy_groups = {}  # (x, y) -> enemy group data
+        self.entities = {}  # (x, y) -> entity data
         
         self.selected_tool = "wall"
+        self.paint_tile = 1  # Tile id used by the bulk tools, set by the last tile tool picked
         self.is_running = True
+
+        # Undo history; a stroke is open from mouse press to release
+        self.history = EditHistory(HISTORY_BUDGET)
+        self.stroke = None
+        self.drag_start = None  # Cells where a shape tool was pressed and is now
+        self.drag_end = None
+        self.overlay_rects = []  # Screen areas drawn over the canvas last frame
+
+        # Scrollable, zoomable viewport onto the map. The visible cells are
+        # rendered into map_canvas once and only dirty cells are redrawn.
+        self.view_rect = Rect(0, 0, EDITOR_WIDTH - SIDEBAR_WIDTH, EDITOR_HEIGHT)
+        self.map_canvas = pygame.Surface(self.view_rect.size)
+        self.grid_size = GRID_SIZE
+        self.view_x = 0  # Map cell shown in the top-left corner
+        self.view_y = 0
+        self.full_redraw = True
+        self.scrolled = False  # The canvas moved, so all of it must be copied to the screen
+        self.dirty_cells = set()
+        self.font = pygame.font.SysFont(None, 24)
+
+        # First-person preview from a camera placed with the Camera tool
+        self.preview = RaycastPreview(self.texture_manager)
+        self.preview_rect = self.preview.image.get_rect(topright=(self.view_rect.right - 10, 10))
         
         self.setup_ui()
         
@@ -72,6 +120,13 @@ class MapEditor:
         y_offset += 40
         self.select_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 10, y_offset, 180, 30),
                                                       text='Select', manager=self.gui_manager)
+        y_offset += 40
+        self.rect_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 10, y_offset, 56, 30),
+                                                    text='Rect', manager=self.gui_manager)
+        self.flood_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 72, y_offset, 56, 30),
+                                                     text='Fill', manager=self.gui_manager)
+        self.line_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 134, y_offset, 56, 30),
+                                                    text='Line', manager=self.gui_manager)
         
         y_offset += 60
         self.save_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 10, y_offset, 180, 30),
@@ -93,32 +148,46 @@ class MapEditor:
                                                      text='H +', manager=self.gui_manager)
         self.height_down = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 105, y_offset, 85, 30),
                                                        text='H -', manager=self.gui_manager)
+        y_offset += 40
+        self.undo_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 10, y_offset, 85, 30),
+                                                    text='Undo', manager=self.gui_manager)
+        self.redo_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 105, y_offset, 85, 30),
+                                                    text='Redo', manager=self.gui_manager)
+        y_offset += 40
+        self.camera_btn = pygame_gui.elements.UIButton(relative_rect=Rect(EDITOR_WIDTH - SIDEBAR_WIDTH + 10, y_offset, 180, 30),
+                                                      text='Preview Camera', manager=self.gui_manager)
 
     def resize_map(self, new_w, new_h):
         new_w = max(1, new_w)
         new_h = max(1, new_h)
-        new_data = [[0 for _ in range(new_w)] for _ in range(new_h)]
-        for y in range(min(self.map_height, new_h)):
-            for x in range(min(self.map_width, new_w)):
-                new_data[y][x] = self.map_data[y][x]
-        self.map_data = new_data
+        new_tiles = np.zeros((new_h, new_w), dtype=np.uint8)
+        keep_h, keep_w = min(self.map_height, new_h), min(self.map_width, new_w)
+        new_tiles[:keep_h, :keep_w] = self.tiles[:keep_h, :keep_w]
+        self.tiles = new_tiles
         self.map_width = new_w
         self.map_height = new_h
+        self.history.clear()  # Diffs hold flat indices into the old size
+        self.preview.dirty = True
+        self.set_view(self.view_x, self.view_y)
+        self.full_redraw = True
         print(f"Resized map to {new_w}x{new_h}")
 
     def new_map(self):
-        self.map_data = [[0 for _ in range(self.map_width)] for _ in range(self.map_height)]
+        self.tiles = np.zeros((self.map_height, self.map_width), dtype=np.uint8)
         self.player_pos = {"x": 1, "y": 1}
-        self.enemy_groups = []
-        self.entities = []
+        self.enemy_groups = {}
+        self.entities = {}
+        self.history.clear()
+        self.preview.dirty = True
+        self.full_redraw = True
         print("Created new map")
 
     def save_map(self):
         data = {
-            "map": self.map_data,
+            "map": self.tiles.tolist(),
             "player": self.player_pos,
-            "enemy_groups": self.enemy_groups,
-            "entities": self.entities
+            "enemy_groups": list(self.enemy_groups.values()),
+            "entities": list(self.entities.values())
         }
         os.makedirs("data/maps", exist_ok=True)
         with open("data/maps/editor_test.json", 'w') as f:
@@ -130,12 +199,17 @@ class MapEditor:
             return
         with open(filename, 'r') as f:
             data = json.load(f)
-            self.map_data = data["map"]
-            self.map_height = len(self.map_data)
-            self.map_width = len(self.map_data[0])
+            self.tiles = np.array(data["map"], dtype=np.uint8)
+            self.map_height, self.map_width = self.tiles.shape
             self.player_pos = data["player"]
-            self.enemy_groups = data.get("enemy_groups", [])
-            self.entities = data.get("entities", [])
+            # The editor keeps one group and one entity per cell
+            self.enemy_groups = {(g["x"], g["y"]): g for g in data.get("enemy_groups", [])}
+            self.entities = {(e["x"], e["y"]): e for e in data.get("entities", [])}
+        self.history.clear()
+        self.preview.set_camera(self.player_pos["x"], self.player_pos["y"])
+        self.preview.dirty = True
+        self.set_view(0, 0)
+        self.full_redraw = True
         print(f"Loaded {filename}")
 
     def handle_events(self):
@@ -164,6 +238,18 @@ class MapEditor:
                     self.selected_tool = "eraser"
                 elif event.ui_element == self.select_btn:
                     self.selected_tool = "select"
+                elif event.ui_element == self.rect_btn:
+                    self.selected_tool = "rect"
+                elif event.ui_element == self.flood_btn:
+                    self.selected_tool = "flood"
+                elif event.ui_element == self.line_btn:
+                    self.selected_tool = "line"
+                elif event.ui_element == self.undo_btn:
+                    self.undo()
+                elif event.ui_element == self.redo_btn:
+                    self.redo()
+                elif event.ui_element == self.camera_btn:
+                    self.selected_tool = "camera"
                 elif event.ui_element == self.save_btn:
                     self.save_map()
                 elif event.ui_element == self.load_btn:
@@ -178,29 +264,227 @@ class MapEditor:
                     self.resize_map(self.map_width, self.map_height + 1)
                 elif event.ui_element == self.height_down:
                     self.resize_map(self.map_width, self.map_height - 1)
+                if self.selected_tool in TILE_TOOLS:
+                    self.paint_tile = TILE_TOOLS[self.selected_tool]
+
+            if event.type == pygame.KEYDOWN:
+                if event.mod & pygame.KMOD_CTRL and event.key == pygame.K_z:
+                    self.redo() if event.mod & pygame.KMOD_SHIFT else self.undo()
+                elif event.mod & pygame.KMOD_CTRL and event.key == pygame.K_y:
+                    self.redo()
+                elif event.key == pygame.K_p:
+                    self.toggle_preview()
+                elif event.key in (pygame.K_q, pygame.K_e):
+                    self.preview.turn(1 if event.key == pygame.K_e else -1)
+                else:
+                    self.handle_view_key(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                if self.view_rect.collidepoint(pygame.mouse.get_pos()):
+                    self.zoom(1 if event.y > 0 else -1, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                on_preview = self.preview.visible and self.preview_rect.collidepoint(event.pos)
+                if self.view_rect.collidepoint(event.pos) and not on_preview:
+                    cell = self.screen_to_cell(event.pos)
+                    if 0 <= cell[0] < self.map_width and 0 <= cell[1] < self.map_height:
+                        self.press(cell)
+            elif event.type == pygame.MOUSEMOTION and self.stroke is not None:
+                self.drag(self.clamp_cell(self.screen_to_cell(event.pos)))
+            elif event.type == pygame.MOUSEBUTTONUP and event.button == 1 and self.stroke is not None:
+                self.release(self.clamp_cell(self.screen_to_cell(event.pos)))
+
+    def press(self, cell):
+        """Start a stroke with the selected tool at a map cell."""
+        self.begin_stroke()
+        self.drag_start = self.drag_end = cell
+        if self.selected_tool == "flood":
+            self.write_tiles(flood_fill_indices(self.tiles, *cell), self.paint_tile)
+            self.end_stroke()
+        elif self.selected_tool not in SHAPE_TOOLS:
+            self.apply_tool(*cell)
+
+    def drag(self, cell):
+        """Continue a stroke to a map cell."""
+        if cell == self.drag_end:
+            return
+        if self.selected_tool in TILE_TOOLS:
+            # Fill the cells skipped between mouse events
+            self.write_tiles(line_indices(*self.drag_end, *cell, self.map_width), TILE_TOOLS[self.selected_tool])
+        elif self.selected_tool not in SHAPE_TOOLS:
+            self.apply_tool(*cell)
+        self.drag_end = cell
+
+    def release(self, cell):
+        """Finish a stroke, applying a shape tool from the press to this cell."""
+        if self.selected_tool == "rect":
+            self.write_tiles(rect_indices(*self.drag_start, *cell, self.map_width), self.paint_tile)
+        elif self.selected_tool == "line":
+            self.write_tiles(line_indices(*self.drag_start, *cell, self.map_width), self.paint_tile)
+        self.end_stroke()
+
+    def clamp_cell(self, cell):
+        """Nearest map cell to a possibly out of bounds one."""
+        return (max(0, min(self.map_width - 1, cell[0])), max(0, min(self.map_height - 1, cell[1])))
+
+    def begin_stroke(self):
+        """Open a stroke that records every change until end_stroke."""
+        self.end_stroke()
+        self.stroke = EditStroke()
+
+    def end_stroke(self):
+        """Close the open stroke and add it to the undo history if it changed anything."""
+        if self.stroke is not None:
+            layers = {"entities": self.entities, "enemy_groups": self.enemy_groups}
+            if self.stroke.finish(self.tiles, layers, self.player_pos):
+                self.history.push(self.stroke)
+            self.stroke = None
+        self.drag_start = self.drag_end = None
+
+    def undo(self):
+        """Revert the newest stroke in the history."""
+        self.end_stroke()
+        stroke = self.history.pop_undo()
+        if stroke is not None:
+            self.apply_diff(stroke.indices, stroke.old_tiles, stroke.old_markers, stroke.old_player)
+
+    def redo(self):
+        """Reapply the most recently undone stroke."""
+        self.end_stroke()
+        stroke = self.history.pop_redo()
+        if stroke is not None:
+            self.apply_diff(stroke.indices, stroke.new_tiles, stroke.new_markers, stroke.new_player)
+
+    def apply_diff(self, indices, tiles, markers, player_pos):
+        """Write one side of a stroke's diff back into the map."""
+        self.tiles.flat[indices] = tiles
+        self.mark_tiles_dirty(indices)
+        self.preview.tiles_changed(indices, self.map_width, self.map_height)
+        for (layer, cell), marker in markers.items():
+            self.set_marker(layer, cell, marker)
+        if player_pos is not None:
+            self.set_player(player_pos["x"], player_pos["y"])
+
+    def write_tiles(self, indices, tile):
+        """Set the tiles at flat indices to one tile id, recording them in the open stroke."""
+        if self.stroke is not None:
+            self.stroke.record_tiles(self.tiles, indices)
+        self.tiles.flat[indices] = tile
+        self.mark_tiles_dirty(indices)
+        self.preview.tiles_changed(indices, self.map_width, self.map_height)
+
+    def set_marker(self, layer, cell, marker):
+        """Put an entity or enemy group (or None to clear) in a cell of a marker layer."""
+        markers = getattr(self, layer)
+        if self.stroke is not None:
+            self.stroke.record_marker(layer, cell, markers.get(cell))
+        if marker is None:
+            markers.pop(cell, None)
+        else:
+            markers[cell] = marker
+        self.mark_dirty(*cell)
+
+    def set_player(self, x, y):
+        """Move the player start, recording it in the open stroke."""
+        if self.stroke is not None:
+            self.stroke.record_player(self.player_pos)
+        self.mark_dirty(self.player_pos["x"], self.player_pos["y"])
+        self.player_pos = {"x": x, "y": y}
+        self.mark_dirty(x, y)
+
+    def handle_view_key(self, key):
+        """Arrows pan the view, +/- zoom around its centre and Home returns to the top-left corner."""
+        step = max(1, 160 // self.grid_size)
+        if key == pygame.K_LEFT:
+            self.pan(-step, 0)
+        elif key == pygame.K_RIGHT:
+            self.pan(step, 0)
+        elif key == pygame.K_UP:
+            self.pan(0, -step)
+        elif key == pygame.K_DOWN:
+            self.pan(0, step)
+        elif key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.zoom(1, self.view_rect.center)
+        elif key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom(-1, self.view_rect.center)
+        elif key == pygame.K_HOME:
+            self.pan(-self.view_x, -self.view_y)
+
+    def screen_to_cell(self, pos):
+        """Map cell under a screen position in the map view."""
+        return self.view_x + pos[0] // self.grid_size, self.view_y + pos[1] // self.grid_size
+
+    def get_view_cells(self):
+        """Number of (partly) visible columns and rows at the current zoom."""
+        return -(-self.view_rect.width // self.grid_size), -(-self.view_rect.height // self.grid_size)
 
-            if event.type == pygame.MOUSEBUTTONDOWN or (event.type == pygame.MOUSEMOTION and pygame.mouse.get_pressed()[0]):
-                mouse_pos = pygame.mouse.get_pos()
-                if mouse_pos[0] < EDITOR_WIDTH - SIDEBAR_WIDTH:
-                    grid_x = mouse_pos[0] // GRID_SIZE
-                    grid_y = mouse_pos[1] // GRID_SIZE
-                    
-                    if 0 <= grid_x < self.map_width and 0 <= grid_y < self.map_height:
-                        self.apply_tool(grid_x, grid_y)
+    def set_view(self, view_x, view_y):
+        """Move the top-left cell of the view, keeping as much of the map on screen as possible."""
+        cols, rows = self.get_view_cells()
+        self.view_x = max(0, min(self.map_width - cols + 1, view_x))
+        self.view_y = max(0, min(self.map_height - rows + 1, view_y))
+
+    def pan(self, dx, dy):
+        """Scroll the view by a number of cells, redrawing only the newly exposed cells."""
+        old_x, old_y = self.view_x, self.view_y
+        self.set_view(old_x + dx, old_y + dy)
+        dx, dy = self.view_x - old_x, self.view_y - old_y
+        if not dx and not dy:
+            return
+        cols, rows = self.get_view_cells()
+        if abs(dx) >= cols or abs(dy) >= rows or self.full_redraw:
+            self.full_redraw = True
+            return
+        self.map_canvas.scroll(-dx * self.grid_size, -dy * self.grid_size)
+        self.scrolled = True
+        # Cells that moved into view along the edges we scrolled towards, plus the
+        # previously partly visible last column or row, which was only drawn in part
+        x_range = range(self.view_x + cols - dx - 1, self.view_x + cols) if dx > 0 else range(self.view_x, self.view_x - dx)
+        y_range = range(self.view_y + rows - dy - 1, self.view_y + rows) if dy > 0 else range(self.view_y, self.view_y - dy)
+        for x in x_range:
+            self.dirty_cells.update((x, y) for y in range(self.view_y, self.view_y + rows))
+        for y in y_range:
+            self.dirty_cells.update((x, y) for x in range(self.view_x, self.view_x + cols))
+
+    def zoom(self, direction, anchor):
+        """Step through ZOOM_LEVELS, keeping the cell under the anchor screen position in place."""
+        index = max(0, min(len(ZOOM_LEVELS) - 1, ZOOM_LEVELS.index(self.grid_size) + direction))
+        if ZOOM_LEVELS[index] == self.grid_size:
+            return
+        cell_x, cell_y = self.screen_to_cell(anchor)
+        self.grid_size = ZOOM_LEVELS[index]
+        self.set_view(cell_x - anchor[0] // self.grid_size, cell_y - anchor[1] // self.grid_size)
+        self.full_redraw = True
+
+    def toggle_preview(self):
+        """Show or hide the preview pane."""
+        self.preview.toggle_visibility()
+        self.overlay_rects.append(self.preview_rect)  # Uncovers the map when hidden
+
+    def mark_dirty(self, x, y):
+        """Queue a map cell to be redrawn on the next frame."""
+        self.dirty_cells.add((x, y))
+
+    def mark_tiles_dirty(self, indices):
+        """Queue the visible cells among flat tile indices, or the whole view if there are many."""
+        if self.full_redraw or not len(indices):
+            return
+        cols, rows = self.get_view_cells()
+        xs, ys = indices % self.map_width, indices // self.map_width
+        visible = (xs >= self.view_x) & (xs < self.view_x + cols) & (ys >= self.view_y) & (ys < self.view_y + rows)
+        if np.count_nonzero(visible) > DIRTY_CELL_LIMIT:
+            self.full_redraw = True
+        else:
+            self.dirty_cells.update(zip(xs[visible].tolist(), ys[visible].tolist()))
 
     def apply_tool(self, x, y):
-        if self.selected_tool == "wall":
-            self.map_data[y][x] = 1
-        elif self.selected_tool == "floor":
-            self.map_data[y][x] = 0
-        elif self.selected_tool == "door":
-            self.map_data[y][x] = 2
+        if self.selected_tool in TILE_TOOLS:
+            self.write_tiles(np.array([y * self.map_width + x]), TILE_TOOLS[self.selected_tool])
         elif self.selected_tool == "player":
-            self.player_pos = {"x": x, "y": y}
+            self.set_player(x, y)
+        elif self.selected_tool == "camera":
+            self.preview.set_camera(x, y)
         elif self.selected_tool == "chest":
-            # Remove existing entity at this position
-            self.entities = [e for e in self.entities if not (e["x"] == x and e["y"] == y)]
-            self.entities.append({
+            # Replaces any existing entity at this position
+            self.set_marker("entities", (x, y), {
                 "type": "chest",
                 "x": x,
                 "y": y,
@@ -209,9 +493,8 @@ class MapEditor:
                 ]
             })
         elif self.selected_tool == "enemy":
-            # Remove existing enemy group at this position
-            self.enemy_groups = [g for g in self.enemy_groups if not (g["x"] == x and g["y"] == y)]
-            self.enemy_groups.append({
+            # Replaces any existing enemy group at this position
+            self.set_marker("enemy_groups", (x, y), {
                 "x": x,
                 "y": y,
                 "enemies": [
@@ -226,9 +509,8 @@ class MapEditor:
                 ]
             })
         elif self.selected_tool == "item_pile":
-            # Remove existing entity at this position
-            self.entities = [e for e in self.entities if not (e["x"] == x and e["y"] == y)]
-            self.entities.append({
+            # Replaces any existing entity at this position
+            self.set_marker("entities", (x, y), {
                 "type": "item_pile",
                 "x": x,
                 "y": y,
@@ -237,85 +519,187 @@ class MapEditor:
                 ]
             })
         elif self.selected_tool == "eraser":
-            self.map_data[y][x] = 0
-            self.entities = [e for e in self.entities if not (e["x"] == x and e["y"] == y)]
-            self.enemy_groups = [g for g in self.enemy_groups if not (g["x"] == x and g["y"] == y)]
+            self.write_tiles(np.array([y * self.map_width + x]), 0)
+            if (x, y) in self.entities:
+                self.set_marker("entities", (x, y), None)
+            if (x, y) in self.enemy_groups:
+                self.set_marker("enemy_groups", (x, y), None)
         elif self.selected_tool == "select":
              # Just find what's there and print to console for now
-            found = False
-            for e in self.entities:
-                if e["x"] == x and e["y"] == y:
-                    print(f"Selected Entity: {e['type']} at ({x}, {y}) with {len(e.get('items', []))} items")
-                    found = True
-            for g in self.enemy_groups:
-                if g["x"] == x and g["y"] == y:
-                    print(f"Selected Enemy Group at ({x}, {y}) with {len(g.get('enemies', []))} enemies")
-                    found = True
-            if not found:
-                print(f"Tile at ({x}, {y}): {self.map_data[y][x]}")
+            e = self.entities.get((x, y))
+            g = self.enemy_groups.get((x, y))
+            if e:
+                print(f"Selected Entity: {e['type']} at ({x}, {y}) with {len(e.get('items', []))} items")
+            if g:
+                print(f"Selected Enemy Group at ({x}, {y}) with {len(g.get('enemies', []))} enemies")
+            if not e and not g:
+                print(f"Tile at ({x}, {y}): {self.tiles[y, x]}")
 
-    def draw(self):
-        self.screen.fill((50, 50, 50))
+    def get_scaled_image(self, key, image, size):
+        """A copy of image scaled to size x size, cached per zoom level in the texture manager."""
+        cache_key = ("editor", key, size)
+        scaled = self.texture_manager.derived.get(cache_key)
+        if scaled is None:
+            scaled = self.texture_manager.derived.put(cache_key, pygame.transform.scale(image, (size, size)), "editor_images")
+        return scaled
+
+    def draw_tile(self, x, y):
+        """Draw one map cell (or background outside the map) onto the canvas."""
+        g = self.grid_size
+        rect = Rect((x - self.view_x) * g, (y - self.view_y) * g, g, g)
+        if not (0 <= x < self.map_width and 0 <= y < self.map_height):
+            self.map_canvas.fill(BACKGROUND_COLOR, rect)
+            return
+        tile_type = int(self.tiles[y, x])
         
-        # Draw grid
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                rect = Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                tile_type = self.map_data[y][x]
-                
-                if tile_type == 1: # Wall
-                    tex = self.texture_manager.get_texture("dungeon_wall")
-                elif tile_type == 2: # Door
-                    tex = self.texture_manager.get_texture("dungeon_door_closed")
-                else: # Floor
-                    tex = self.texture_manager.get_texture("dungeon_floor")
-                
-                if tex:
-                    scaled_tex = pygame.transform.scale(tex, (GRID_SIZE, GRID_SIZE))
-                    self.screen.blit(scaled_tex, rect)
-                else:
-                    pygame.draw.rect(self.screen, (100, 100, 100) if tile_type == 1 else (30, 30, 30), rect)
-                
-                pygame.draw.rect(self.screen, (0, 0, 0), rect, 1)
+        tex = self.texture_manager.get_tile_texture(tile_type) or self.texture_manager.get_texture("dungeon_floor")
         
+        if tex:
+            self.map_canvas.blit(self.get_scaled_image(("tile", tile_type), tex, g), rect)
+        else:
+            pygame.draw.rect(self.map_canvas, (100, 100, 100) if tile_type == 1 else (30, 30, 30), rect)
+        
+        if g >= GRID_MIN_SIZE:
+            pygame.draw.rect(self.map_canvas, (0, 0, 0), rect, 1)
+
+    def draw_markers(self, cells=None):
+        """Draw the player start, enemy groups and entities in view, or only those in cells."""
+        g = self.grid_size
+        inset = max(1, g // 8)
+        cols, rows = self.get_view_cells()
+
+        def visible(x, y):
+            if cells is not None:
+                return (x, y) in cells
+            return self.view_x <= x < self.view_x + cols and self.view_y <= y < self.view_y + rows
+
+        def markers_to_draw(markers):
+            if cells is not None and len(cells) < len(markers):
+                return [markers[cell] for cell in cells if cell in markers]
+            return [marker for cell, marker in markers.items() if visible(*cell)]
+
+        def marker_rect(x, y):
+            return Rect((x - self.view_x) * g + inset, (y - self.view_y) * g + inset, g - 2 * inset, g - 2 * inset)
+
         # Draw Player
-        player_rect = Rect(self.player_pos["x"] * GRID_SIZE + 5, self.player_pos["y"] * GRID_SIZE + 5, GRID_SIZE - 10, GRID_SIZE - 10)
-        pygame.draw.circle(self.screen, (0, 255, 0), player_rect.center, GRID_SIZE // 3)
+        if visible(self.player_pos["x"], self.player_pos["y"]):
+            player_rect = marker_rect(self.player_pos["x"], self.player_pos["y"])
+            pygame.draw.circle(self.map_canvas, (0, 255, 0), player_rect.center, g // 3)
         
         # Draw Enemies
-        for group in self.enemy_groups:
-            rect = Rect(group["x"] * GRID_SIZE + 5, group["y"] * GRID_SIZE + 5, GRID_SIZE - 10, GRID_SIZE - 10)
+        for group in markers_to_draw(self.enemy_groups):
+            rect = marker_rect(group["x"], group["y"])
             sprite_name = group["enemies"][0]["sprite"] if group["enemies"] else "goblin"
             sprite = self.texture_manager.get_sprite(sprite_name)
             if sprite:
-                scaled_sprite = pygame.transform.scale(sprite, (GRID_SIZE - 10, GRID_SIZE - 10))
-                self.screen.blit(scaled_sprite, rect)
+                self.map_canvas.blit(self.get_scaled_image(("sprite", sprite_name), sprite, rect.width), rect)
             else:
-                pygame.draw.rect(self.screen, (255, 0, 0), rect)
+                pygame.draw.rect(self.map_canvas, (255, 0, 0), rect)
 
         # Draw Entities (Chests, Item Piles)
-        for entity in self.entities:
-            rect = Rect(entity["x"] * GRID_SIZE + 5, entity["y"] * GRID_SIZE + 5, GRID_SIZE - 10, GRID_SIZE - 10)
+        for entity in markers_to_draw(self.entities):
+            rect = marker_rect(entity["x"], entity["y"])
             sprite_name = "chest" if entity["type"] == "chest" else "item_pile"
             sprite = self.texture_manager.get_sprite(sprite_name)
             if sprite:
-                scaled_sprite = pygame.transform.scale(sprite, (GRID_SIZE - 10, GRID_SIZE - 10))
-                self.screen.blit(scaled_sprite, rect)
+                self.map_canvas.blit(self.get_scaled_image(("sprite", sprite_name), sprite, rect.width), rect)
             else:
                 color = (255, 255, 0) if entity["type"] == "chest" else (0, 255, 255)
-                pygame.draw.rect(self.screen, color, rect)
+                pygame.draw.rect(self.map_canvas, color, rect)
+
+    def draw_camera_marker(self):
+        """Draw the preview camera and its facing on the screen; returns the area drawn over."""
+        g = self.grid_size
+        center = ((self.preview.camera_x - self.view_x) * g + g // 2, (self.preview.camera_y - self.view_y) * g + g // 2)
+        direction = pygame.math.Vector2(1, 0).rotate(self.preview.facing * 90) * max(3, g // 2)
+        self.screen.set_clip(self.view_rect)
+        drawn = pygame.draw.circle(self.screen, (0, 200, 255), center, max(2, g // 4))
+        drawn.union_ip(pygame.draw.line(self.screen, (0, 200, 255), center,
+                                        (center[0] + direction.x, center[1] + direction.y), 2))
+        self.screen.set_clip(None)
+        return drawn.clip(self.view_rect)
+
+    def draw_shape_preview(self):
+        """Outline the rect or line being dragged on the screen; returns the area drawn over."""
+        g = self.grid_size
+        (x0, y0), (x1, y1) = self.drag_start, self.drag_end
+        self.screen.set_clip(self.view_rect)
+        if self.selected_tool == "rect":
+            rect = Rect((min(x0, x1) - self.view_x) * g, (min(y0, y1) - self.view_y) * g,
+                        (abs(x1 - x0) + 1) * g, (abs(y1 - y0) + 1) * g)
+            drawn = pygame.draw.rect(self.screen, (255, 255, 0), rect, 2)
+        else:
+            start = ((x0 - self.view_x) * g + g // 2, (y0 - self.view_y) * g + g // 2)
+            end = ((x1 - self.view_x) * g + g // 2, (y1 - self.view_y) * g + g // 2)
+            drawn = pygame.draw.line(self.screen, (255, 255, 0), start, end, 2)
+        self.screen.set_clip(None)
+        return drawn.clip(self.view_rect)
+
+    def update_canvas(self):
+        """Bring the map canvas up to date; returns the screen rects that changed."""
+        if self.full_redraw:
+            self.map_canvas.fill(BACKGROUND_COLOR)
+            cols, rows = self.get_view_cells()
+            for y in range(self.view_y, min(self.map_height, self.view_y + rows)):
+                for x in range(self.view_x, min(self.map_width, self.view_x + cols)):
+                    self.draw_tile(x, y)
+            self.draw_markers()
+            self.full_redraw = False
+            self.scrolled = False
+            self.dirty_cells.clear()
+            return [self.view_rect]
+
+        if not self.dirty_cells:
+            return []
+        g = self.grid_size
+        for x, y in self.dirty_cells:
+            self.draw_tile(x, y)
+        self.draw_markers(self.dirty_cells)
+        if self.scrolled:
+            dirty_rects = [self.view_rect]
+        else:
+            dirty_rects = [Rect((x - self.view_x) * g, (y - self.view_y) * g, g, g).clip(self.view_rect)
+                           for x, y in self.dirty_cells]
+        self.scrolled = False
+        self.dirty_cells.clear()
+        return dirty_rects
+
+    def draw(self):
+        # Copy only the changed parts of the map canvas to the screen
+        dirty_rects = self.update_canvas()
+        for rect in dirty_rects:
+            self.screen.blit(self.map_canvas, rect, rect)
+
+        # Uncover what last frame's overlays were drawn over, then draw this frame's
+        for rect in self.overlay_rects:
+            self.screen.blit(self.map_canvas, rect, rect)
+            dirty_rects.append(rect)
+        self.overlay_rects = []
+        if self.selected_tool in SHAPE_TOOLS and self.drag_start is not None:
+            self.overlay_rects.append(self.draw_shape_preview())
+        if self.preview.visible:
+            self.overlay_rects.append(self.draw_camera_marker())
+            dirty_rects.extend(self.overlay_rects)
+            # The pane is redrawn when re-rendered or when anything under it was
+            if self.preview.update(self.tiles) or self.preview_rect.collidelist(dirty_rects) != -1:
+                self.screen.blit(self.preview.image, self.preview_rect)
+                pygame.draw.rect(self.screen, (200, 200, 200), self.preview_rect, 1)
+                dirty_rects.append(self.preview_rect)
+        else:
+            dirty_rects.extend(self.overlay_rects)
 
         # Draw sidebar
         pygame.draw.rect(self.screen, (40, 40, 40), self.sidebar_rect)
         
-        # Show selected tool
-        font = pygame.font.SysFont(None, 24)
-        tool_text = font.render(f"Tool: {self.selected_tool}", True, (255, 255, 255))
+        # Show selected tool and view
+        tool_text = self.font.render(f"Tool: {self.selected_tool}", True, (255, 255, 255))
         self.screen.blit(tool_text, (EDITOR_WIDTH - SIDEBAR_WIDTH + 10, EDITOR_HEIGHT - 30))
+        view_text = self.font.render(f"Zoom: {self.grid_size}px at {self.view_x},{self.view_y}", True, (200, 200, 200))
+        self.screen.blit(view_text, (EDITOR_WIDTH - SIDEBAR_WIDTH + 10, EDITOR_HEIGHT - 55))
         
         self.gui_manager.draw_ui(self.screen)
         
-        pygame.display.flip()
+        pygame.display.update(dirty_rects + [self.sidebar_rect])
 
     def run(self):
         while self.is_running:
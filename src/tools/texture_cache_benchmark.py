@@ -0,0 +1,45 @@
+"""
+Measures texture loading with a cold and a warm on-disk texture cache.
+
+Run from the project root: python src/tools/texture_cache_benchmark.py
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import pygame
+
+# Add src to path to import game modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from engine.texture_manager import TextureManager
+
+def time_load(cache_dir):
+    """Time create_default_textures() on a fresh TextureManager, in milliseconds."""
+    texture_manager = TextureManager(assets_path="assets", cache_dir=cache_dir)
+    start = time.perf_counter()
+    texture_manager.create_default_textures()
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare cold and warm texture cache load times")
+    parser.add_argument("--runs", type=int, default=5, help="Warm runs to average")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        uncached = time_load(None)
+        cold = time_load(cache_dir)
+        warm = sum(time_load(cache_dir) for _ in range(args.runs)) / args.runs
+
+    print(f"No cache:   {uncached:8.1f} ms")
+    print(f"Cold cache: {cold:8.1f} ms (decode + write)")
+    print(f"Warm cache: {warm:8.1f} ms (average of {args.runs})")
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
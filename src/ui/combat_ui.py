@@ -5,6 +5,9 @@ import os
 from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
 from .particle_system import ParticleManager
 
+ENEMIES_PER_ROW = 3
+ENEMIES_PER_PAGE = 2 * ENEMIES_PER_ROW  # Larger groups are paged
+
 class CombatUI:
     """UI for displaying and managing combat."""
     
@@ -17,7 +20,10 @@ class CombatUI:
         self.selected_target = 0
         self.actions = ["Attack (A)", "Spell (S)", "Item (I)", "Guard (G)", "Flee (F)"]
         self.action_buttons = []
-        self.enemy_elements = []
+        self.enemy_elements = []  # Pooled enemy widgets, reused across combats
+        self.enemy_images = {}  # (sprite, size, highlighted) -> pre-rendered image
+        self.asset_version = texture_manager.asset_version
+        self.page = 0
 
     def start_combat(self, party, enemies):
         """Start combat display."""
@@ -33,10 +39,7 @@ class CombatUI:
         self.party = None
         self.enemies = []
         self.particle_manager.clear()
-        if hasattr(self, 'action_panel'):
-            self.action_panel.hide()
-            for elem in self.enemy_elements:
-                elem["panel"].hide()
+        self.hide()
 
     def handle_event(self, event):
         """Handle input events for combat."""
@@ -76,11 +79,21 @@ class CombatUI:
         return None
 
     def build(self):
-        """Build the combat UI elements."""
-        if hasattr(self, 'action_panel'):
-            self.action_panel.kill()
+        """Build the combat UI elements.
+
+        Widgets are created on the first combat only and reused afterwards.
+        """
+        if not hasattr(self, 'action_panel'):
+            self.build_action_panel()
+            self.build_enemy_slots()
+        self.page = 0
+        self.build_enemy_display()
+        self.hide()
+
+    def build_action_panel(self):
+        """Create the action button panel."""
         self.action_buttons = []
-        
+
         panel_width = 600
         panel_height = 60
         panel_x = (SCREEN_WIDTH - panel_width) // 2
@@ -106,36 +119,26 @@ class CombatUI:
             )
             self.action_buttons.append(button)
 
-        self.build_enemy_display()
-        self.hide()
-
-    def build_enemy_display(self):
-        """Create UI elements for each enemy."""
-        # Clear existing enemy elements
-        for elem in self.enemy_elements:
-            elem["panel"].kill()
+    def build_enemy_slots(self):
+        """Create the pool of enemy widgets, one per on-screen position."""
         self.enemy_elements = []
 
-        num_enemies = len(self.enemies)
-        
         # Define layout properties
         front_row_y = 200
         back_row_y = 100
-        row_x_start = (SCREEN_WIDTH - 3 * 120) // 2  # Centered layout
+        row_x_start = (SCREEN_WIDTH - ENEMIES_PER_ROW * 120) // 2  # Centered layout
         
         front_row_size = (100, 120)
         back_row_size = (80, 100)
 
-        for i, enemy in enumerate(self.enemies):
-            if i < 3:  # Front row
-                row = 0
+        for i in range(ENEMIES_PER_PAGE):
+            if i < ENEMIES_PER_ROW:  # Front row
                 col = i
                 x_pos = row_x_start + col * 120
                 y_pos = front_row_y
                 size = front_row_size
             else:  # Back row
-                row = 1
-                col = i - 3
+                col = i - ENEMIES_PER_ROW
                 x_pos = row_x_start + col * 120 + 20 # Offset for perspective
                 y_pos = back_row_y
                 size = back_row_size
@@ -143,18 +146,13 @@ class CombatUI:
             panel = pygame_gui.elements.UIPanel(
                 relative_rect=pygame.Rect((x_pos, y_pos), size),
                 manager=self.manager,
-                object_id="#enemy_container"
+                object_id="#enemy_container",
+                visible=False
             )
 
-            sprite_name = os.path.splitext(enemy.sprite)[0]
-            sprite_surface = self.texture_manager.get_sprite(sprite_name)
-            if sprite_surface is None:
-                sprite_path = os.path.join(self.texture_manager.assets_path, "sprites", enemy.sprite)
-                sprite_surface = self.texture_manager.load_sprite(sprite_name, sprite_path)
-
             sprite = pygame_gui.elements.UIImage(
                 relative_rect=pygame.Rect((0, 0), (size[0], size[1] - 20)),
-                image_surface=sprite_surface,
+                image_surface=pygame.Surface((size[0], size[1] - 20), pygame.SRCALPHA),
                 manager=self.manager,
                 container=panel
             )
@@ -164,30 +162,125 @@ class CombatUI:
                 manager=self.manager,
                 container=panel
             )
-            hp_bar.percent_full = (enemy.hp / enemy.max_hp) * 100
 
-            self.enemy_elements.append({"panel": panel, "sprite": sprite, "hp_bar": hp_bar})
-        
-        self.update_target_selection()
+            self.enemy_elements.append({
+                "panel": panel,
+                "sprite": sprite,
+                "hp_bar": hp_bar,
+                "enemy": None,
+                "hp": None,
+                "selected": False
+            })
 
-    def update_target_selection(self):
-        """Highlight the selected enemy."""
-        for i, elem in enumerate(self.enemy_elements):
-            if i == self.selected_target:
-                # Create a temporary highlight by changing the sprite's blend mode
-                elem["sprite"].image.set_colorkey((255,0,255))
-                elem["sprite"].image.set_alpha(200)
+        self.page_label = pygame_gui.elements.UILabel(
+            relative_rect=pygame.Rect((SCREEN_WIDTH // 2 - 60, 325), (120, 25)),
+            text="",
+            manager=self.manager,
+            visible=False
+        )
+
+    def build_enemy_display(self):
+        """Assign the enemies of the current page to the pooled widgets."""
+        for elem in self.enemy_elements:
+            elem["enemy"] = None
+        self.refresh_enemy_display()
+
+    def refresh_enemy_display(self):
+        """Bring the pooled widgets up to date, touching only the ones that changed."""
+        if self.asset_version != self.texture_manager.asset_version:
+            # Sprites finished loading in the background: re-render from the real images
+            self.asset_version = self.texture_manager.asset_version
+            self.enemy_images.clear()
+            for elem in self.enemy_elements:
+                elem["selected"] = None
+        if self.enemies:
+            self.selected_target = min(self.selected_target, len(self.enemies) - 1)
+        else:
+            self.selected_target = 0
+        self.page = self.selected_target // ENEMIES_PER_PAGE
+        first = self.page * ENEMIES_PER_PAGE
+
+        for slot, elem in enumerate(self.enemy_elements):
+            index = first + slot
+            enemy = self.enemies[index] if index < len(self.enemies) else None
+            if enemy is not elem["enemy"]:
+                self.assign_slot(elem, enemy)
+            if enemy is not None:
+                self.update_slot(elem, enemy, index == self.selected_target)
+
+        page_count = self.get_page_count()
+        page_text = f"{self.page + 1}/{page_count}" if page_count > 1 else ""
+        if self.page_label.text != page_text:
+            self.page_label.set_text(page_text)
+        if self.visible and page_count > 1:
+            self.page_label.show()
+        else:
+            self.page_label.hide()
+
+    def assign_slot(self, elem, enemy):
+        """Point a pooled widget at a different enemy (or clear it)."""
+        elem["enemy"] = enemy
+        elem["hp"] = None
+        elem["selected"] = None
+        if enemy is None:
+            elem["panel"].hide()
+        elif self.visible:
+            elem["panel"].show()
+
+    def update_slot(self, elem, enemy, selected):
+        """Update the sprite and HP bar of a widget only if they changed."""
+        if elem["selected"] != selected:
+            elem["selected"] = selected
+            elem["sprite"].set_image(self.get_enemy_image(enemy.sprite, elem["sprite"].rect.size, selected),
+                                     image_is_alpha_premultiplied=True)
+        if elem["hp"] != enemy.hp:
+            elem["hp"] = enemy.hp
+            elem["hp_bar"].percent_full = (enemy.hp / enemy.max_hp) * 100
+
+    def get_enemy_image(self, sprite_file, size, highlighted):
+        """Return a pre-scaled (and optionally highlighted) enemy image, rendering it once."""
+        key = (sprite_file, size, highlighted)
+        image = self.enemy_images.get(key)
+        if image is None:
+            sprite_name = os.path.splitext(sprite_file)[0]
+            sprite_surface = self.texture_manager.get_sprite(sprite_name)
+            if sprite_surface is None:
+                sprite_surface = self.texture_manager.load_sprite_async(
+                    sprite_name, self.texture_manager.get_sprite_path(sprite_file))
+            if sprite_surface is None:
+                image = pygame.Surface(size, pygame.SRCALPHA)
             else:
-                elem["sprite"].image.set_colorkey(None)
-                elem["sprite"].image.set_alpha(255)
-            elem["sprite"].rebuild()
+                image = pygame.transform.smoothscale(sprite_surface.convert_alpha(), size)
+            if highlighted:
+                image.fill((255, 255, 255, 200), special_flags=pygame.BLEND_RGBA_MULT)
+            image = image.premul_alpha()
+            self.enemy_images[key] = image
+        return image
+
+    def get_page_count(self):
+        """Number of pages needed to show every enemy."""
+        return max(1, -(-len(self.enemies) // ENEMIES_PER_PAGE))
+
+    def get_enemy_element(self, enemy_index):
+        """Return the widget showing the given enemy index, if it is on the current page."""
+        slot = enemy_index - self.page * ENEMIES_PER_PAGE
+        if 0 <= slot < len(self.enemy_elements):
+            return self.enemy_elements[slot]
+        return None
+
+    def update_target_selection(self):
+        """Highlight the selected enemy, switching page if needed."""
+        self.refresh_enemy_display()
 
     def show(self):
         """Show the combat UI."""
         self.visible = True
         self.action_panel.show()
         for elem in self.enemy_elements:
-            elem["panel"].show()
+            if elem["enemy"] is not None:
+                elem["panel"].show()
+        if self.get_page_count() > 1:
+            self.page_label.show()
 
     def hide(self):
         """Hide the combat UI."""
@@ -196,12 +289,14 @@ class CombatUI:
             self.action_panel.hide()
             for elem in self.enemy_elements:
                 elem["panel"].hide()
+            self.page_label.hide()
 
     def show_damage(self, target_index, damage, is_enemy=True):
         """Display damage numbers and effects on a target."""
         if is_enemy:
-            if target_index < len(self.enemy_elements):
-                panel_rect = self.enemy_elements[target_index]["panel"].get_abs_rect()
+            elem = self.get_enemy_element(target_index)
+            if elem is not None:
+                panel_rect = elem["panel"].get_abs_rect()
                 x = panel_rect.centerx
                 y = panel_rect.centery
                 self.particle_manager.create_damage_text(x, y, str(damage), self.font)
@@ -222,6 +317,5 @@ class CombatUI:
         
         self.particle_manager.update()
 
-        for i, enemy in enumerate(self.enemies):
-            if i < len(self.enemy_elements):
-                self.enemy_elements[i]["hp_bar"].percent_full = (enemy.hp / enemy.max_hp) * 100
\ No newline at end of file
+        # Enemies can also leave the list outside of player attacks (e.g. fleeing)
+        self.refresh_enemy_display()
\ No newline at end of file
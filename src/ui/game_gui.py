@@ -1,5 +1,6 @@
 import pygame
 import pygame_gui
+import numpy as np
 import os
 
 from config.constants import SCREEN_WIDTH, SCREEN_HEIGHT
@@ -12,6 +13,7 @@ class GameGUI:
 
     CHAR_PANEL_WIDTH = 150
     CHAR_PANEL_HEIGHT = 140
+    MINIMAP_BACKGROUND = (15, 15, 15)
 
     def __init__(self, texture_manager, show_fps=False):
         self.manager = pygame_gui.UIManager((SCREEN_WIDTH, SCREEN_HEIGHT),
@@ -22,12 +24,19 @@ class GameGUI:
                                     "assets/fonts/MorrisRoman-Black.ttf")
 
         self.texture_manager = texture_manager
-        self.combat_ui = CombatUI(self.manager, self.texture_manager)
+        self._combat_ui = None  # Built on first use, see combat_ui
         self.messages = []
         self._last_messages = []  # Track last messages to avoid unnecessary updates
         self._last_event_id = None
         self.last_action = None
 
+        # Tile id -> HUD minimap colour; everything but floor and doors is drawn as wall
+        self.minimap_colors = np.full((256, 3), 100, dtype=np.uint8)
+        self.minimap_colors[[0, 2, 3]] = 50
+        self._minimap_key = None
+        self._fps_text = None
+        self.party = None
+
         if show_fps:
 
 
@@ -79,14 +88,34 @@ class GameGUI:
 
         self.character_elements = []
 
-        # Interaction Panel
-        self.interaction_panel = pygame_gui.elements.UIPanel(
-            relative_rect=pygame.Rect((SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 200), (300, 50)),
-            manager=self.manager,
-            object_id="#interaction_panel",
-            visible=False
-        )
-        self.interaction_buttons = []
+        # Interaction Panel, built the first time there is something to interact with
+        self.interaction_panel = None
+        self.interaction_buttons = []  # Buttons currently shown
+        self._interaction_button_pool = {}  # actions tuple -> buttons
+        self._interaction_entity = None
+        self._interaction_actions = None
+
+    @property
+    def combat_ui(self):
+        """The combat UI, created the first time it is needed."""
+        if self._combat_ui is None:
+            self._combat_ui = CombatUI(self.manager, self.texture_manager)
+        return self._combat_ui
+
+    def is_combat_visible(self):
+        """Whether the combat UI exists and is showing, without building it."""
+        return self._combat_ui is not None and self._combat_ui.visible
+
+    def get_interaction_panel(self):
+        """Get the interaction panel, creating it on first use."""
+        if self.interaction_panel is None:
+            self.interaction_panel = pygame_gui.elements.UIPanel(
+                relative_rect=pygame.Rect((SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT - 200), (300, 50)),
+                manager=self.manager,
+                object_id="#interaction_panel",
+                visible=False
+            )
+        return self.interaction_panel
 
     def process_events(self, event):
         """Process GUI events."""
@@ -106,7 +135,7 @@ class GameGUI:
                     return self.last_action
             
             # Forward events to combat UI if it's visible
-            if self.combat_ui.visible:
+            if self.is_combat_visible():
                 self.last_action = self.combat_ui.handle_event(event)
                 return self.last_action
         return None
@@ -114,13 +143,16 @@ class GameGUI:
 
     def update(self, time_delta):
         """Update the GUI."""
+        self.update_message_log()
         self.manager.update(time_delta)
-        if self.combat_ui.visible:
+        if self.is_combat_visible():
             self.combat_ui.update(time_delta)
 
     def draw(self, screen):
         """Draw the GUI."""
         self.manager.draw_ui(screen)
+        if self._combat_ui is not None:
+            self._combat_ui.draw(screen)
 
     def add_message(self, message):
         """Add a message to the log."""
@@ -128,7 +160,7 @@ class GameGUI:
         # Keep the log from getting too long
         if len(self.messages) > 100:
             self.messages.pop(0)
-        self.update_message_log()
+        # The text box is rebuilt once per frame in update(), however many messages arrive
 
     def update_message_log(self):
         """Update the message log with new messages."""
@@ -147,50 +179,98 @@ class GameGUI:
 
     def update_fps(self, fps):
         """Update the FPS counter."""
-        if self.fps_label:
-            self.fps_label.set_text(f"FPS: {int(fps)}")
+        text = f"FPS: {int(fps)}"
+        if self.fps_label and text != self._fps_text:
+            self._fps_text = text
+            self.fps_label.set_text(text)
 
     def draw_minimap(self, surface, game_map, party):
-        """Draw the minimap on the specified surface."""
+        """Draw the minimap on the specified surface.
+
+        The map is only redrawn when the party cell, facing, explored cells or tiles change.
+        """
         # Don't draw the minimap if panel not ready
         if not self.minimap_panel.image:
             return
 
         map_surface = self.minimap_panel.image
+        key = (int(party.x), int(party.y), party.facing, game_map.explored_version,
+               game_map.tile_version, id(map_surface))
+        if key == self._minimap_key:
+            return
+        self._minimap_key = key
 
-        
         # Don't fill the entire surface - let the panel's themed background and border show
         # Only fill the inner area where we'll draw the map
         border_width = 4  # Account for the panel's border and padding
         inner_rect = pygame.Rect(border_width, border_width,
                                 map_surface.get_width() - (border_width * 2),
                                 map_surface.get_height() - 40 - (border_width * 2))  # leave space for compass
-        pygame.draw.rect(map_surface, (15, 15, 15), inner_rect)  # Dark background for map area
 
         cell_size = 10
-        map_width = inner_rect.width
-        map_height = inner_rect.height
-
-        # Center the map view on the player
-        start_x = max(0, party.x - (map_width // (2 * cell_size)))
-        start_y = max(0, party.y - (map_height // (2 * cell_size)))
-        end_x = start_x + (map_width // cell_size)
-        end_y = start_y + (map_height // cell_size)
-
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                if 0 <= x < game_map.width and 0 <= y < game_map.height:
-                    screen_x = inner_rect.x + (x - start_x) * cell_size
-                    screen_y = inner_rect.y + (y - start_y) * cell_size
-                    if game_map.tiles[y][x] == 1:
-                        pygame.draw.rect(map_surface, (100, 100, 100), (screen_x, screen_y, cell_size, cell_size))
-                    else:
-                        pygame.draw.rect(map_surface, (50, 50, 50), (screen_x, screen_y, cell_size, cell_size))
-
-        # Draw player position
-        player_screen_x = inner_rect.x + (party.x - start_x) * cell_size
-        player_screen_y = inner_rect.y + (party.y - start_y) * cell_size
-        pygame.draw.rect(map_surface, (255, 0, 0), (player_screen_x, player_screen_y, cell_size, cell_size))
+        cols = inner_rect.width // cell_size
+        rows = inner_rect.height // cell_size
+
+        # Center the map view on the party
+        start_x = int(party.x) - cols // 2
+        start_y = int(party.y) - rows // 2
+
+        # Build one pixel per cell: tile colours where explored, background elsewhere
+        cells = np.zeros((rows, cols, 3), dtype=np.uint8)
+        cells[:] = self.MINIMAP_BACKGROUND
+        x0, x1 = max(0, start_x), min(game_map.width, start_x + cols)
+        y0, y1 = max(0, start_y), min(game_map.height, start_y + rows)
+        if x0 < x1 and y0 < y1:
+            tiles = np.array([row[x0:x1] for row in game_map.tiles[y0:y1]], dtype=np.uint8)
+            explored = game_map.explored[y0:y1, x0:x1]
+            window = cells[y0 - start_y:y1 - start_y, x0 - start_x:x1 - start_x]
+            window[explored] = self.minimap_colors[tiles[explored]]
+        cells[int(party.y) - start_y, int(party.x) - start_x] = (255, 0, 0)
+
+        small = pygame.Surface((cols, rows))
+        pygame.surfarray.blit_array(small, cells.transpose(1, 0, 2))
+        pygame.draw.rect(map_surface, self.MINIMAP_BACKGROUND, inner_rect)
+        map_surface.blit(pygame.transform.scale(small, (cols * cell_size, rows * cell_size)), inner_rect.topleft)
+
+        # Draw a facing indicator from the party cell
+        center_x = inner_rect.x + (int(party.x) - start_x) * cell_size + cell_size // 2
+        center_y = inner_rect.y + (int(party.y) - start_y) * cell_size + cell_size // 2
+        direction = pygame.math.Vector2(1, 0).rotate_rad(party.angle) * cell_size
+        pygame.draw.line(map_surface, (255, 255, 255), (center_x, center_y),
+                         (center_x + int(direction.x), center_y + int(direction.y)), 2)
+
+    def bind_party(self, party):
+        """Create the party frames and subscribe to party and character changes."""
+        if self.party is not None:
+            self.party.unsubscribe(self.on_party_changed)
+            for character in self.party.characters:
+                character.unsubscribe(self.on_character_changed)
+        for elements in self.character_elements:
+            elements["panel"].kill()
+
+        self.party = party
+        self.create_party_frames(party)
+        self.update_compass(party.facing)
+        party.subscribe(self.on_party_changed)
+        for character in party.characters:
+            character.subscribe(self.on_character_changed)
+
+    def on_party_changed(self, party, name, old, value):
+        """Push party property changes to the widgets."""
+        if name == "facing":
+            self.update_compass(value)
+
+    def on_character_changed(self, character, name, old, value):
+        """Push character stat changes to that character's bars."""
+        for elements in self.character_elements:
+            if elements["character"] is character:
+                self.update_character_bars(elements, character)
+                break
+
+    def update_character_bars(self, elements, character):
+        """Set the HP and MP bars of one character frame."""
+        elements["hp_bar"].percent_full = (character.hp / character.max_hp) * 100
+        elements["mp_bar"].percent_full = (character.mp / character.max_mp) * 100 if character.max_mp > 0 else 0
 
     def create_party_frames(self, party):
         """Create the UI elements for each character in the party."""
@@ -207,19 +287,19 @@ class GameGUI:
                 object_id="@char_panel"
             )
 
-            portrait_surface = pygame.Surface((64, 64), pygame.SRCALPHA)
-            if character.portrait:
-                portrait_path = os.path.join(self.texture_manager.assets_path, "portraits", character.portrait)
-                portrait_image = self.texture_manager.load_portrait(character.portrait, portrait_path)
-                if portrait_image:
-                    portrait_surface = portrait_image
-
             portrait = pygame_gui.elements.UIImage(
                 relative_rect=pygame.Rect((15, 10), (64, 64)),
-                image_surface=portrait_surface,
+                image_surface=pygame.Surface((64, 64), pygame.SRCALPHA),
                 manager=self.manager,
                 container=char_panel
             )
+            if character.portrait:
+                # Shown blank until the portrait has been decoded in the background
+                portrait_path = os.path.join(self.texture_manager.assets_path, "portraits", character.portrait)
+                portrait_image = self.texture_manager.load_portrait_async(character.portrait, portrait_path,
+                                                                          on_ready=portrait.set_image)
+                if portrait_image:
+                    portrait.set_image(portrait_image)
 
             name = pygame_gui.elements.UILabel(
                 relative_rect=pygame.Rect((15, 80), (120, 20)),
@@ -236,7 +316,6 @@ class GameGUI:
                 manager=self.manager,
                 container=char_panel
             )
-            hp_bar.percent_full = (character.hp / character.max_hp) * 100
 
             mp_bar = pygame_gui.elements.UIStatusBar(
                 relative_rect=pygame.Rect((15, 112), (bar_width, 10)),
@@ -244,26 +323,28 @@ class GameGUI:
                 container=char_panel,
                 object_id="@mp_bar"
             )
-            mp_bar.percent_full = (character.mp / character.max_mp) * 100 if character.max_mp > 0 else 0
 
-            self.character_elements.append({
+            elements = {
+                "character": character,
                 "panel": char_panel,
                 "portrait": portrait,
                 "name": name,
                 "hp_bar": hp_bar,
                 "mp_bar": mp_bar
-            })
+            }
+            self.update_character_bars(elements, character)
+            self.character_elements.append(elements)
 
     def update_party_stats(self, party):
-        """Update the stats for each character in the party."""
+        """Refresh the stats of every character in the party.
+
+        Regular updates arrive through bind_party's subscriptions; this forces a full refresh.
+        """
         if not self.character_elements:
-             self.create_party_frames(party)
+             self.bind_party(party)
 
-        for i, character in enumerate(party.characters):
-            if i < len(self.character_elements):
-                elements = self.character_elements[i]
-                elements["hp_bar"].percent_full = (character.hp / character.max_hp) * 100
-                elements["mp_bar"].percent_full = (character.mp / character.max_mp) * 100 if character.max_mp > 0 else 0
+        for elements in self.character_elements:
+            self.update_character_bars(elements, elements["character"])
 
     def show_damage_on_party_member(self, character_index, damage):
         """Display damage on a party member's portrait."""
@@ -275,17 +356,43 @@ class GameGUI:
             self.combat_ui.particle_manager.create_damage_text(x, y, str(damage), self.combat_ui.font)
             self.combat_ui.particle_manager.create_blood_splatter(x, y)
 
-    def show_interaction_buttons(self, entity):
-        """Show interaction buttons for a given entity."""
-        self.hide_interaction_buttons()
-        self.interaction_panel.show()
-        
-        actions = []
+    def get_interaction_actions(self, entity):
+        """Return the interaction actions available for an entity."""
         if isinstance(entity, Chest):
-            actions = ["Open", "Inspect", "Disarm"]
+            return ("Open", "Inspect", "Disarm")
         elif isinstance(entity, ItemPile):
-            actions = ["Loot"]
+            return ("Loot",)
+        return ()
+
+    def show_interaction_buttons(self, entity):
+        """Show interaction buttons for a given entity.
 
+        Buttons are pooled per action set and only swapped when the target or its actions change.
+        """
+        actions = self.get_interaction_actions(entity)
+        if entity is self._interaction_entity and actions == self._interaction_actions:
+            return
+
+        self.interaction_buttons = self._interaction_button_pool.get(actions)
+        if self.interaction_buttons is None:
+            self.interaction_buttons = self.create_interaction_buttons(actions)
+            self._interaction_button_pool[actions] = self.interaction_buttons
+
+        # Showing the panel shows every pooled button, so hide the other sets afterwards
+        self.get_interaction_panel().show()
+        for pooled_actions, buttons in self._interaction_button_pool.items():
+            for button in buttons:
+                if pooled_actions == actions:
+                    button.show()
+                else:
+                    button.hide()
+
+        self._interaction_entity = entity
+        self._interaction_actions = actions
+
+    def create_interaction_buttons(self, actions):
+        """Create the buttons for one set of interaction actions."""
+        buttons = []
         button_width = 80
         spacing = 10
         start_x = (300 - (len(actions) * (button_width + spacing))) // 2
@@ -295,14 +402,18 @@ class GameGUI:
                 relative_rect=pygame.Rect((start_x + i * (button_width + spacing), 5), (button_width, 30)),
                 text=action,
                 manager=self.manager,
-                container=self.interaction_panel
+                container=self.get_interaction_panel()
             )
-            self.interaction_buttons.append(button)
+            buttons.append(button)
+        return buttons
 
     def hide_interaction_buttons(self):
         """Hide all interaction buttons."""
+        if self._interaction_entity is None:
+            return
         for button in self.interaction_buttons:
-            button.kill()
+            button.hide()
         self.interaction_buttons = []
+        self._interaction_entity = None
+        self._interaction_actions = None
         self.interaction_panel.hide()
-
@@ -4,13 +4,15 @@ Inventory UI for displaying and managing player items.
 
 import pygame
 
+from ui.render_cache import render_cache
+
 class InventoryUI:
     """UI for displaying and managing the player's inventory."""
     
     def __init__(self, screen_width, screen_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.font = pygame.font.Font(None, 24)
+        self.font_size = 24
         self.visible = False
         self.selected_item = 0
         
@@ -46,25 +48,23 @@ class InventoryUI:
             return
             
         # Draw semi-transparent background
-        inventory_surface = pygame.Surface((300, 400))
-        inventory_surface.set_alpha(200)
-        inventory_surface.fill((0, 0, 0))
-        screen.blit(inventory_surface, (self.screen_width // 2 - 150, self.screen_height // 2 - 200))
+        background = render_cache.get_panel((300, 400), (0, 0, 0), 200)
+        screen.blit(background, (self.screen_width // 2 - 150, self.screen_height // 2 - 200))
         
         # Draw title
-        title = self.font.render("Inventory", True, (255, 255, 255))
+        title = render_cache.render_text("Inventory", self.font_size, (255, 255, 255))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, self.screen_height // 2 - 180))
         
         # Draw items
         for i, item in enumerate(player.inventory):
             color = (255, 255, 0) if i == self.selected_item else (255, 255, 255)
-            item_text = self.font.render(f"{item.name}", True, color)
+            item_text = render_cache.render_text(f"{item.name}", self.font_size, color)
             screen.blit(item_text, (self.screen_width // 2 - 140, self.screen_height // 2 - 140 + i * 30))
             
             # Show item type
-            type_text = self.font.render(f"({item.item_type})", True, color)
+            type_text = render_cache.render_text(f"({item.item_type})", self.font_size, color)
             screen.blit(type_text, (self.screen_width // 2 + 50, self.screen_height // 2 - 140 + i * 30))
             
         # Draw instructions
-        instructions = self.font.render("UP/DOWN: Navigate, ENTER: Use, E/ESC: Close", True, (200, 200, 200))
+        instructions = render_cache.render_text("UP/DOWN: Navigate, ENTER: Use, E/ESC: Close", self.font_size, (200, 200, 200))
         screen.blit(instructions, (self.screen_width // 2 - instructions.get_width() // 2, self.screen_height // 2 + 170))
\ No newline at end of file
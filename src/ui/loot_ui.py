@@ -4,6 +4,8 @@ Loot UI for displaying and managing items in a container.
 
 import pygame
 
+from ui.render_cache import render_cache
+
 class LootUI:
     """UI for looting chests and item piles."""
 
@@ -11,7 +13,7 @@ class LootUI:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.container = container
-        self.font = pygame.font.Font(None, 24)
+        self.font_size = 24
         self.visible = False
         self.selected_item = 0
 
@@ -44,21 +46,19 @@ class LootUI:
             return
 
         # Draw semi-transparent background
-        loot_surface = pygame.Surface((300, 400))
-        loot_surface.set_alpha(200)
-        loot_surface.fill((0, 0, 0))
-        screen.blit(loot_surface, (self.screen_width // 2 - 150, self.screen_height // 2 - 200))
+        background = render_cache.get_panel((300, 400), (0, 0, 0), 200)
+        screen.blit(background, (self.screen_width // 2 - 150, self.screen_height // 2 - 200))
 
         # Draw title
-        title = self.font.render(self.container.name, True, (255, 255, 255))
+        title = render_cache.render_text(self.container.name, self.font_size, (255, 255, 255))
         screen.blit(title, (self.screen_width // 2 - title.get_width() // 2, self.screen_height // 2 - 180))
 
         # Draw items
         for i, item in enumerate(self.container.items):
             color = (255, 255, 0) if i == self.selected_item else (255, 255, 255)
-            item_text = self.font.render(f"{item.name}", True, color)
+            item_text = render_cache.render_text(f"{item.name}", self.font_size, color)
             screen.blit(item_text, (self.screen_width // 2 - 140, self.screen_height // 2 - 140 + i * 30))
 
         # Draw instructions
-        instructions = self.font.render("UP/DOWN: Navigate, ENTER: Take, A: Take All", True, (200, 200, 200))
+        instructions = render_cache.render_text("UP/DOWN: Navigate, ENTER: Take, A: Take All", self.font_size, (200, 200, 200))
         screen.blit(instructions, (self.screen_width // 2 - instructions.get_width() // 2, self.screen_height // 2 + 170))
\ No newline at end of file
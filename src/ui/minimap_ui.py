@@ -3,109 +3,236 @@ Minimap UI component for displaying the game map.
 """
 
 import pygame
+import numpy as np
+
+from entities.door import Door
+from entities.enemy_group import EnemyGroup
+from ui.render_cache import render_cache
+
+# Pixels per tile of each pre-rendered level of the tile pyramid, finest first
+LEVEL_TILE_SIZES = (32, 16, 8, 4, 2, 1)
+# Levels larger than this are not built; the finest level that fits is scaled instead
+MAX_LEVEL_PIXELS = 8_000_000
+# Grid lines are only drawn on levels with tiles at least this large
+GRID_MIN_TILE_SIZE = 8
 
 class MinimapUI:
-    """Minimap UI component for the game."""
-    
+    """Minimap UI component for the game.
+
+    The static tile layer is rendered once per zoom level from the tile grid
+    and only patched when tiles change; entities are drawn on top each frame.
+    """
+
     def __init__(self, screen_width, screen_height, map_width, map_height):
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.map_width = map_width
         self.map_height = map_height
         self.visible = False
-        self.tile_size = 20  # Size of each tile in pixels on the minimap
         self.padding = 20    # Padding around the minimap
-        
-        # Calculate the size of the minimap surface
-        self.minimap_width = self.map_width * self.tile_size
-        self.minimap_height = self.map_height * self.tile_size
-        
-        # Create the minimap surface
-        self.minimap_surface = pygame.Surface((self.minimap_width, self.minimap_height))
-        
+
+        # Largest area the map view can take on screen
+        self.max_view_width = self.screen_width - 2 * self.padding - 40
+        self.max_view_height = self.screen_height - 2 * self.padding - 100
+
         # Colors
         self.wall_color = (100, 100, 100)      # Gray for walls
         self.floor_color = (50, 50, 50)        # Dark gray for floors
+        self.door_color = (120, 80, 40)        # Brown for closed doors
+        self.open_door_color = (80, 60, 40)    # Dim brown for open doors
+        self.grid_color = (70, 70, 70)
         self.player_color = (0, 255, 0)        # Green for player
         self.enemy_color = (255, 0, 0)         # Red for enemies
         self.item_color = (255, 255, 0)        # Yellow for items
         self.background_color = (30, 30, 30)   # Dark background
-        
+
+        # Tile id -> colour lookup table; unknown ids are drawn as walls
+        self.tile_colors = np.array([self.wall_color] * 256, dtype=np.uint8)
+        self.tile_colors[0] = self.floor_color
+        self.tile_colors[2] = self.door_color
+        self.tile_colors[3] = self.open_door_color
+
+        self.levels = {}  # tile size -> pre-rendered Surface of the whole map
+        self.tile_version = None
+        self.view_surface = None
+        self.view_key = None
+        self.frame_surface = None
+
+        self.tile_size = self.get_default_zoom()
+        self.center_x = 0
+        self.center_y = 0
+        self.follow_player = True
+
+    def get_default_zoom(self):
+        """Largest tile size (up to 16 px) that fits the whole map in the view."""
+        for tile_size in LEVEL_TILE_SIZES[1:]:
+            if self.map_width * tile_size <= self.max_view_width and self.map_height * tile_size <= self.max_view_height:
+                return tile_size
+        return LEVEL_TILE_SIZES[-1]
+
     def toggle_visibility(self):
         """Toggle the visibility of the minimap."""
         self.visible = not self.visible
-        
+        self.follow_player = True
+
     def handle_input(self, event):
         """Handle input events for the minimap."""
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_TAB:
                 self.toggle_visibility()
                 return True
+            if not self.visible:
+                return False
+            pan_step = max(1, 64 // self.tile_size)
+            if event.key == pygame.K_LEFT:
+                self.pan(-pan_step, 0)
+            elif event.key == pygame.K_RIGHT:
+                self.pan(pan_step, 0)
+            elif event.key == pygame.K_UP:
+                self.pan(0, -pan_step)
+            elif event.key == pygame.K_DOWN:
+                self.pan(0, pan_step)
+            elif event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self.zoom(1)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.zoom(-1)
+            elif event.key == pygame.K_HOME:
+                self.follow_player = True
+            else:
+                return False
+            return True
         return False
-        
+
+    def pan(self, dx, dy):
+        """Scroll the view by a number of tiles."""
+        self.follow_player = False
+        self.center_x = max(0, min(self.map_width - 1, self.center_x + dx))
+        self.center_y = max(0, min(self.map_height - 1, self.center_y + dy))
+
+    def zoom(self, direction):
+        """Step the zoom in (direction > 0) or out through the pyramid levels."""
+        index = LEVEL_TILE_SIZES.index(self.tile_size) - direction
+        index = max(0, min(len(LEVEL_TILE_SIZES) - 1, index))
+        self.tile_size = LEVEL_TILE_SIZES[index]
+
+    def build_level(self, tiles, tile_size):
+        """Render the whole tile grid at the given tile size in one vectorized pass."""
+        pixels = np.repeat(np.repeat(self.tile_colors[tiles], tile_size, axis=0), tile_size, axis=1)
+        if tile_size >= GRID_MIN_TILE_SIZE:
+            pixels[::tile_size, :] = self.grid_color
+            pixels[:, ::tile_size] = self.grid_color
+            pixels[tile_size - 1::tile_size, :] = self.grid_color
+            pixels[:, tile_size - 1::tile_size] = self.grid_color
+        return pygame.surfarray.make_surface(pixels.transpose(1, 0, 2))
+
+    def get_level(self, game_map, tile_size):
+        """Return the finest pre-rendered level no finer than tile_size, building it on first use."""
+        for size in LEVEL_TILE_SIZES:
+            too_large = self.map_width * self.map_height * size * size > MAX_LEVEL_PIXELS
+            if size > tile_size or (too_large and size != LEVEL_TILE_SIZES[-1]):
+                continue
+            if size not in self.levels:
+                self.levels[size] = self.build_level(np.array(game_map.tiles, dtype=np.uint8), size)
+            return size, self.levels[size]
+
+    def sync_tiles(self, game_map):
+        """Patch the pre-rendered levels with tiles changed since the last frame."""
+        if self.tile_version is None:
+            self.tile_version = game_map.tile_version
+            return
+        changes = game_map.get_tile_changes_since(self.tile_version)
+        if not changes:
+            return
+        for size, level in self.levels.items():
+            for x, y in changes:
+                rect = pygame.Rect(x * size, y * size, size, size)
+                color = [int(c) for c in self.tile_colors[game_map.tiles[y][x]]]
+                level.fill(color, rect)
+                if size >= GRID_MIN_TILE_SIZE:
+                    pygame.draw.rect(level, self.grid_color, rect, 1)
+        self.tile_version = game_map.tile_version
+        self.view_key = None
+
+    def get_view(self, game_map):
+        """Return (surface, origin_x, origin_y) of the visible part of the map, cached until it changes."""
+        view_width = min(self.max_view_width, self.map_width * self.tile_size)
+        view_height = min(self.max_view_height, self.map_height * self.tile_size)
+        tiles_w = -(-view_width // self.tile_size)
+        tiles_h = -(-view_height // self.tile_size)
+        origin_x = max(0, min(self.map_width - tiles_w, self.center_x - tiles_w // 2))
+        origin_y = max(0, min(self.map_height - tiles_h, self.center_y - tiles_h // 2))
+
+        key = (self.tile_size, origin_x, origin_y)
+        if key != self.view_key:
+            level_size, level = self.get_level(game_map, self.tile_size)
+            crop = pygame.Rect(origin_x * level_size, origin_y * level_size,
+                               tiles_w * level_size, tiles_h * level_size).clip(level.get_rect())
+            view = level.subsurface(crop)
+            if level_size != self.tile_size:
+                view = pygame.transform.scale(view, (crop.width * self.tile_size // level_size,
+                                                     crop.height * self.tile_size // level_size))
+            self.view_surface = view
+            self.view_key = key
+            self.frame_surface = None
+        return self.view_surface, origin_x, origin_y
+
+    def get_frame(self, view):
+        """Return the bordered background panel for a view, rebuilt only when its size changes."""
+        bg_width = view.get_width() + 2 * self.padding
+        bg_height = view.get_height() + 2 * self.padding
+        if self.frame_surface is None or self.frame_surface.get_size() != (bg_width, bg_height):
+            self.frame_surface = pygame.Surface((bg_width, bg_height))
+            self.frame_surface.fill((0, 0, 0))
+            pygame.draw.rect(self.frame_surface, (100, 100, 100), (0, 0, bg_width, bg_height), 2)
+        return self.frame_surface
+
     def draw(self, screen, game_map, player):
         """Draw the minimap on the screen."""
         if not self.visible:
             return
-            
-        # Clear the minimap surface
-        self.minimap_surface.fill(self.background_color)
-        
-        # Draw the map tiles
-        for y in range(self.map_height):
-            for x in range(self.map_width):
-                rect = pygame.Rect(x * self.tile_size, y * self.tile_size, 
-                                   self.tile_size, self.tile_size)
-                if game_map.tiles[y][x] == 1:  # Wall
-                    pygame.draw.rect(self.minimap_surface, self.wall_color, rect)
-                else:  # Floor
-                    pygame.draw.rect(self.minimap_surface, self.floor_color, rect)
-                    
-                # Draw grid lines
-                pygame.draw.rect(self.minimap_surface, (70, 70, 70), rect, 1)
-        
-        # Draw entities
-        for entity in game_map.entities:
-            if hasattr(entity, 'x') and hasattr(entity, 'y'):
-                # Determine color based on entity type
-                color = self.item_color
-                if hasattr(entity, 'is_alive') and entity.is_alive():
-                    color = self.enemy_color
-                elif entity == player:
-                    color = self.player_color
-                    
-                # Draw the entity
-                center_x = int(entity.x) * self.tile_size + self.tile_size // 2
-                center_y = int(entity.y) * self.tile_size + self.tile_size // 2
-                pygame.draw.circle(self.minimap_surface, color, (center_x, center_y), self.tile_size // 3)
-                
-                # Draw player direction indicator
-                if entity == player:
-                    # Calculate the end point of the direction indicator
-                    dir_length = self.tile_size // 2
-                    end_x = center_x + int(dir_length * pygame.math.Vector2(1, 0).rotate_rad(player.angle).x)
-                    end_y = center_y + int(dir_length * pygame.math.Vector2(1, 0).rotate_rad(player.angle).y)
-                    pygame.draw.line(self.minimap_surface, (255, 255, 255), (center_x, center_y), (end_x, end_y), 2)
-        
-        # Create a background surface for the minimap with padding
-        bg_width = self.minimap_width + 2 * self.padding
-        bg_height = self.minimap_height + 2 * self.padding
-        bg_surface = pygame.Surface((bg_width, bg_height))
-        bg_surface.fill((0, 0, 0))
-        pygame.draw.rect(bg_surface, (100, 100, 100), (0, 0, bg_width, bg_height), 2)
-        
-        # Blit the minimap onto the background surface
-        bg_surface.blit(self.minimap_surface, (self.padding, self.padding))
-        
+
+        if self.follow_player:
+            self.center_x, self.center_y = int(player.x), int(player.y)
+
+        self.sync_tiles(game_map)
+        view, origin_x, origin_y = self.get_view(game_map)
+        frame = self.get_frame(view)
+
         # Position the minimap in the center of the screen
-        x_pos = (self.screen_width - bg_width) // 2
-        y_pos = (self.screen_height - bg_height) // 2
-        
-        # Draw the minimap background surface on the screen
-        screen.blit(bg_surface, (x_pos, y_pos))
-        
+        x_pos = (self.screen_width - frame.get_width()) // 2
+        y_pos = (self.screen_height - frame.get_height()) // 2
+        map_x = x_pos + self.padding
+        map_y = y_pos + self.padding
+        screen.blit(frame, (x_pos, y_pos))
+        screen.blit(view, (map_x, map_y))
+
+        # Draw entities that fall inside the view
+        tile_size = self.tile_size
+        store = game_map.entity_store
+        rows = store.rows_in_rect(origin_x, origin_y, -(-view.get_width() // tile_size),
+                                  -(-view.get_height() // tile_size), exclude=Door)  # Doors are part of the tile layer
+        radius = max(1, tile_size // 3)
+        for entity in store.objects_at(rows):
+            ex, ey = int(entity.x), int(entity.y)
+            # Determine color based on entity type
+            color = self.item_color
+            if entity == player:
+                color = self.player_color
+            elif isinstance(entity, EnemyGroup) and entity.is_alive():
+                color = self.enemy_color
+            center_x = map_x + (ex - origin_x) * tile_size + tile_size // 2
+            center_y = map_y + (ey - origin_y) * tile_size + tile_size // 2
+            pygame.draw.circle(screen, color, (center_x, center_y), radius)
+
+            # Draw player direction indicator
+            if entity == player:
+                direction = pygame.math.Vector2(1, 0).rotate_rad(player.angle) * max(2, tile_size // 2)
+                pygame.draw.line(screen, (255, 255, 255), (center_x, center_y),
+                                 (center_x + int(direction.x), center_y + int(direction.y)), 2)
+
         # Draw a title
-        font = pygame.font.Font(None, 36)
-        title = font.render("Minimap - Press TAB to close", True, (255, 255, 255))
+        title = render_cache.render_text("Minimap - Press TAB to close", 36, (255, 255, 255))
         title_x = (self.screen_width - title.get_width()) // 2
-        screen.blit(title, (title_x, y_pos - 40))
\ No newline at end of file
+        screen.blit(title, (title_x, y_pos - 40))
+        hint = render_cache.render_text("Arrows: pan, +/-: zoom, Home: center", 24, (200, 200, 200))
+        screen.blit(hint, ((self.screen_width - hint.get_width()) // 2, y_pos + frame.get_height() + 8))
@@ -1,75 +1,145 @@
 import pygame
 import random
+import numpy as np
 
-class Particle:
-    """A single particle for visual effects."""
-    def __init__(self, x, y, dx, dy, size, color, lifespan):
-        self.x = x
-        self.y = y
-        self.dx = dx
-        self.dy = dy
-        self.size = size
-        self.color = color
-        self.lifespan = lifespan
+# Colours are rounded to the nearest multiple of 16 (capped at 255) so circle
+# stamps can be shared. Black is the stamps' colour key, so black circles are
+# drawn in (1, 1, 1) instead.
+COLOR_STEP = 16
+COLOR_BUCKETS = 256 // COLOR_STEP + 1  # Buckets per channel: 0, 16, ..., 240, 255
 
-    def update(self):
-        """Update the particle's position and lifespan."""
-        self.x += self.dx
-        self.y += self.dy
-        self.lifespan -= 1
-        self.size -= 0.1
-        if self.size < 0:
-            self.size = 0
-
-    def draw(self, surface):
-        """Draw the particle on the screen."""
-        if self.lifespan > 0 and self.size > 0:
-            pygame.draw.circle(surface, self.color, (int(self.x), int(self.y)), int(self.size))
-
-class TextParticle(Particle):
-    """A particle that displays text."""
-    def __init__(self, x, y, dx, dy, text_surface, lifespan):
-        super().__init__(x, y, dx, dy, 0, (0,0,0), lifespan)
-        self.text_surface = text_surface
+class ParticleManager:
+    """Manages all active particles for visual effects.
 
-    def draw(self, surface):
-        """Draw the text particle on the screen."""
-        if self.lifespan > 0:
-            surface.blit(self.text_surface, (int(self.x), int(self.y)))
+    Particles live in fixed-capacity NumPy arrays (structure of arrays) kept
+    packed at the front, so updates and culling are vectorized. Circles are
+    drawn from pre-rendered stamps per radius and colour bucket; text
+    particles point at a slot holding their rendered text surface.
+    """
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.dx = np.zeros(capacity, dtype=np.float32)
+        self.dy = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.lifespan = np.zeros(capacity, dtype=np.int32)
+        self.text_slot = np.full(capacity, -1, dtype=np.int32)  # -1 for circle particles
 
-class ParticleManager:
-    """Manages all active particles for visual effects."""
-    def __init__(self):
-        self.particles = []
+        self.text_surfaces = []  # Text sprite slots referenced by text_slot
+        self.free_text_slots = []
+        self.stamps = {}  # packed (radius, colour bucket) key -> pre-rendered circle
+        self.rng = np.random.default_rng(random.getrandbits(32))
 
     def clear(self):
         """Remove all particles."""
-        self.particles = []
+        self.count = 0
+        self.text_surfaces = []
+        self.free_text_slots = []
 
     def update(self):
         """Update all active particles."""
-        self.particles = [p for p in self.particles if p.lifespan > 0]
-        for particle in self.particles:
-            particle.update()
+        n = self.count
+        alive = self.lifespan[:n] > 0
+        if not alive.all():
+            for slot in self.text_slot[:n][~alive]:
+                if slot >= 0:
+                    self.text_surfaces[slot] = None
+                    self.free_text_slots.append(int(slot))
+            n = int(alive.sum())
+            for array in (self.x, self.y, self.dx, self.dy, self.size, self.color, self.lifespan, self.text_slot):
+                array[:n] = array[:self.count][alive]
+            self.count = n
+
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.lifespan[:n] -= 1
+        np.maximum(self.size[:n] - 0.1, 0, out=self.size[:n])
 
     def draw(self, surface):
         """Draw all active particles."""
-        for particle in self.particles:
-            particle.draw(surface)
+        n = self.count
+        live = self.lifespan[:n] > 0
+        radius = self.size[:n].astype(np.int32)
+        px = self.x[:n].astype(np.int32)
+        py = self.y[:n].astype(np.int32)
+
+        blits = []
+        circles = np.flatnonzero(live & (self.text_slot[:n] < 0) & (radius > 0))
+        if len(circles):
+            r = radius[circles]
+            # One integer key per (radius, colour bucket) to look up the stamps
+            buckets = (self.color[circles].astype(np.int32) + COLOR_STEP // 2) // COLOR_STEP
+            keys = ((r * COLOR_BUCKETS + buckets[:, 0]) * COLOR_BUCKETS + buckets[:, 1]) * COLOR_BUCKETS + buckets[:, 2]
+            unique_keys, stamp_index = np.unique(keys, return_inverse=True)
+            stamps = [self.get_stamp(key) for key in unique_keys.tolist()]
+            positions = zip((px[circles] - r).tolist(), (py[circles] - r).tolist())
+            blits.extend(zip(map(stamps.__getitem__, stamp_index.tolist()), positions))
+
+        texts = np.flatnonzero(live & (self.text_slot[:n] >= 0))
+        for slot, x, y in zip(self.text_slot[texts].tolist(), px[texts].tolist(), py[texts].tolist()):
+            blits.append((self.text_surfaces[slot], (x, y)))
+
+        if blits:
+            surface.fblits(blits)
+
+    def get_stamp(self, key):
+        """Return the pre-rendered circle for a packed (radius, colour bucket) key."""
+        stamp = self.stamps.get(key)
+        if stamp is None:
+            rest, blue = divmod(key, COLOR_BUCKETS)
+            rest, green = divmod(rest, COLOR_BUCKETS)
+            radius, red = divmod(rest, COLOR_BUCKETS)
+            color = tuple(min(bucket * COLOR_STEP, 255) for bucket in (red, green, blue))
+            if color == (0, 0, 0):
+                color = (1, 1, 1)  # Black would vanish under the colour key
+            stamp = pygame.Surface((radius * 2 + 1, radius * 2 + 1))
+            stamp.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+            pygame.draw.circle(stamp, color, (radius, radius), radius)
+            self.stamps[key] = stamp
+        return stamp
+
+    def spawn(self, x, y, dx, dy, size, color, lifespan, text_slot=-1):
+        """Add particles from scalars or equally sized arrays. Excess particles are dropped."""
+        dx = np.atleast_1d(dx)
+        n = min(len(dx), self.capacity - self.count)
+        if n <= 0:
+            return
+        s = slice(self.count, self.count + n)
+        self.x[s] = x
+        self.y[s] = y
+        self.dx[s] = dx[:n]
+        self.dy[s] = np.broadcast_to(dy, dx.shape)[:n]
+        self.size[s] = np.broadcast_to(size, dx.shape)[:n]
+        self.color[s] = np.broadcast_to(np.asarray(color, dtype=np.uint8), (len(dx), 3))[:n]
+        self.lifespan[s] = np.broadcast_to(lifespan, dx.shape)[:n]
+        self.text_slot[s] = text_slot
+        self.count += n
 
     def create_blood_splatter(self, x, y, num_particles=20):
         """Create a blood splatter effect."""
-        for _ in range(num_particles):
-            dx = random.uniform(-2, 2)
-            dy = random.uniform(-2, 2)
-            size = random.uniform(2, 5)
-            color = (random.randint(150, 255), 0, 0)
-            lifespan = random.randint(20, 40)
-            self.particles.append(Particle(x, y, dx, dy, size, color, lifespan))
+        color = np.zeros((num_particles, 3), dtype=np.uint8)
+        color[:, 0] = self.rng.integers(150, 256, num_particles)
+        self.spawn(x, y,
+                   self.rng.uniform(-2, 2, num_particles),
+                   self.rng.uniform(-2, 2, num_particles),
+                   self.rng.uniform(2, 5, num_particles),
+                   color,
+                   self.rng.integers(20, 41, num_particles))
 
     def create_damage_text(self, x, y, text, font, color=(255, 255, 255), lifespan=60):
         """Create a text-based particle for damage numbers."""
+        if self.count >= self.capacity:
+            return
         text_surface = font.render(str(text), True, color)
-        dx = random.uniform(-0.5, 0.5)
+        if self.free_text_slots:
+            slot = self.free_text_slots.pop()
+            self.text_surfaces[slot] = text_surface
+        else:
+            slot = len(self.text_surfaces)
+            self.text_surfaces.append(text_surface)
+        dx = self.rng.uniform(-0.5, 0.5)
         dy = -1  # Move upwards
-        self.particles.append(TextParticle(x, y, dx, dy, text_surface, lifespan))
\ No newline at end of file
+        self.spawn(x, y, dx, dy, 0, (0, 0, 0), lifespan, text_slot=slot)
@@ -0,0 +1,63 @@
+"""
+Shared cache of fonts, rendered text and panel backgrounds for the UI.
+"""
+
+from collections import OrderedDict
+
+import pygame
+
+class UIRenderCache:
+    """Caches UI surfaces so steady-state frames do not allocate.
+
+    Rendered text is kept in an LRU cache; fonts and panel backgrounds are
+    few and kept for the life of the cache.
+    """
+
+    def __init__(self, max_text_surfaces=512):
+        self.max_text_surfaces = max_text_surfaces
+        self.fonts = {}
+        self.text_surfaces = OrderedDict()
+        self.panels = {}
+
+    def get_font(self, size, name=None):
+        """Get a font by file name (None for the default font) and size."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render_text(self, text, size, color, name=None):
+        """Get an antialiased text surface, rendering it only on a cache miss."""
+        key = (text, name, size, tuple(color))
+        surface = self.text_surfaces.get(key)
+        if surface is None:
+            surface = self.get_font(size, name).render(text, True, color)
+            self.text_surfaces[key] = surface
+            if len(self.text_surfaces) > self.max_text_surfaces:
+                self.text_surfaces.popitem(last=False)
+        else:
+            self.text_surfaces.move_to_end(key)
+        return surface
+
+    def get_panel(self, size, color=(0, 0, 0), alpha=200):
+        """Get a filled, optionally translucent background surface."""
+        key = (tuple(size), tuple(color), alpha)
+        surface = self.panels.get(key)
+        if surface is None:
+            surface = pygame.Surface(size)
+            surface.fill(color)
+            if alpha is not None:
+                surface.set_alpha(alpha)
+            self.panels[key] = surface
+        return surface
+
+    def clear(self):
+        """Drop every cached surface."""
+        self.fonts.clear()
+        self.text_surfaces.clear()
+        self.panels.clear()
+
+
+render_cache = UIRenderCache()
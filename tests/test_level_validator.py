@@ -0,0 +1,52 @@
+"""
+Tests for the level validator's handling of malformed levels.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from tools.level_validator import validate_level
+
+def make_level(**changes):
+    """A small valid level: a 5x5 room with the player in a corner, updated with changes."""
+    rows = [[1] * 5] + [[1, 0, 0, 0, 1] for _ in range(3)] + [[1] * 5]
+    level = {"map": rows, "player": {"x": 1, "y": 1}, "enemy_groups": [], "entities": []}
+    level.update(changes)
+    return level
+
+@pytest.fixture
+def write_level(tmp_path):
+    def write(level):
+        path = tmp_path / "level.json"
+        path.write_text(json.dumps(level))
+        return str(path)
+    return write
+
+def test_valid_level_has_no_errors(write_level):
+    report = validate_level(write_level(make_level(entities=[{"type": "chest", "x": 3, "y": 3}])))
+    assert report["errors"] == []
+    assert report["stats"]["reachable_cells"] == 9
+
+@pytest.mark.parametrize("player", [{"x": 1.0, "y": 1}, {"x": "1", "y": 1}, {"x": 1, "y": True}])
+def test_player_start_needs_integer_coordinates(write_level, player):
+    report = validate_level(write_level(make_level(player=player)))
+    assert len(report["errors"]) == 1
+    assert "player start" in report["errors"][0] and "integer coordinates" in report["errors"][0]
+
+@pytest.mark.parametrize("placement", [{"x": "3", "y": 3}, {"x": 3.5, "y": 3}, {"x": 3}])
+def test_placements_need_integer_coordinates(write_level, placement):
+    level = make_level(enemy_groups=[dict(placement, enemies=["rat"])], entities=[dict(placement, type="chest")])
+    report = validate_level(write_level(level))
+    assert len(report["errors"]) == 2
+    assert all("integer coordinates" in error for error in report["errors"])
+
+def test_unexpected_failures_are_reported_not_raised(write_level):
+    report = validate_level(write_level(make_level(entities=["chest"])))
+    assert len(report["errors"]) == 1
+    assert report["errors"][0].startswith("cannot validate level:")
@@ -0,0 +1,44 @@
+"""
+Tests for the colours particles are drawn in.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from ui.particle_system import ParticleManager
+
+@pytest.fixture(scope="module", autouse=True)
+def display():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    yield
+    pygame.quit()
+
+def drawn_color(color, background=(128, 128, 128)):
+    """The colour at the centre of a single circle particle drawn over background."""
+    particles = ParticleManager()
+    particles.spawn(10, 10, 0, 0, 4, color, 10)
+    surface = pygame.Surface((20, 20))
+    surface.fill(background)
+    particles.draw(surface)
+    return tuple(surface.get_at((10, 10)))[:3]
+
+@pytest.mark.parametrize("color, expected", [
+    ((255, 255, 255), (255, 255, 255)),
+    ((250, 7, 8), (255, 0, 16)),
+    ((200, 100, 50), (208, 96, 48)),
+    ((236, 248, 120), (240, 255, 128)),
+])
+def test_colours_round_to_the_nearest_bucket(color, expected):
+    assert drawn_color(color) == expected
+
+@pytest.mark.parametrize("color", [(0, 0, 0), (5, 7, 3)])
+def test_near_black_particles_are_drawn(color):
+    assert drawn_color(color, background=(200, 200, 200)) == (1, 1, 1)
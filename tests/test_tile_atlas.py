@@ -0,0 +1,60 @@
+"""
+Tests for the wall texture atlas and its tile-id-to-layer table.
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from config.constants import TEXTURE_SIZE
+from engine.texture_manager import TextureManager
+
+ASSETS_PATH = os.path.join(os.path.dirname(__file__), "..", "assets")
+
+@pytest.fixture(scope="module")
+def texture_manager():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    manager = TextureManager(assets_path=ASSETS_PATH, cache_dir=None)
+    manager.create_default_textures()
+    yield manager
+    manager.shutdown()
+    pygame.quit()
+
+def random_texels(rng, tile_ids, count=4096):
+    """Random mixed tile ids and texture coordinates, so the layer table is read for every id at once."""
+    return (rng.choice(tile_ids, size=count), rng.integers(0, TEXTURE_SIZE, size=count),
+            rng.integers(0, TEXTURE_SIZE, size=count))
+
+def test_textured_tiles_match_their_textures(texture_manager):
+    tile_ids = sorted(texture_manager.tile_textures)
+    rng = np.random.default_rng(0)
+    ids, tex_x, tex_y = random_texels(rng, tile_ids)
+    sampled = texture_manager.sample_tile_atlas(ids, tex_x, tex_y)
+    for tile_id in tile_ids:
+        expected = pygame.surfarray.array3d(texture_manager.get_texture(texture_manager.tile_textures[tile_id]))
+        mask = ids == tile_id
+        assert mask.any()
+        np.testing.assert_array_equal(sampled[mask], expected[tex_x[mask], tex_y[mask]])
+
+def test_tiles_without_texture_read_the_blank_layer(texture_manager):
+    assert 0 not in texture_manager.tile_textures  # Floor
+    rng = np.random.default_rng(1)
+    ids, tex_x, tex_y = random_texels(rng, [0, 4, 255])
+    sampled = texture_manager.sample_tile_atlas(ids, tex_x, tex_y)
+    assert not sampled.any()
+    assert texture_manager.get_tile_layer(0) == 0
+    assert texture_manager.get_tile_texture(0) is None
+
+def test_blank_layer_survives_rebuild_with_no_textures():
+    manager = TextureManager(cache_dir=None)
+    manager.build_tile_atlas()
+    assert manager.tile_atlas.shape[0] == 1
+    assert not manager.sample_tile_atlas(np.array([1, 0]), np.array([0, 5]), np.array([0, 5])).any()